@@ -1,14 +1,35 @@
-from .pipeline import ResumePipeline, PortfolioData
-from .extractor import ResumeData, ResumeExtractor
-from .parser import extract_text_from_pdf
-from .github_enricher import GitHubEnricher, GitHubProfile
-
-__all__ = [
-    "ResumePipeline",
-    "PortfolioData",
-    "ResumeData",
-    "ResumeExtractor",
-    "extract_text_from_pdf",
-    "GitHubEnricher",
-    "GitHubProfile",
-]
\ No newline at end of file
+"""
+Public names, imported on first use (PEP 562) — `import backend` alone
+doesn't load PyMuPDF, NumPy or httpx.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "ResumePipeline": "pipeline",
+    "AsyncResumePipeline": "pipeline",
+    "PortfolioData": "pipeline",
+    "ResumeData": "models",
+    "ResumeExtractor": "extractor",
+    "extract_text_from_pdf": "parser",
+    "GitHubEnricher": "github_enricher",
+    "GitHubProfile": "github_enricher",
+    "ExtractionCache": "cache",
+    "MemoryCache": "cache",
+    "SQLiteCache": "cache",
+    "TieredCache": "cache",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value     # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
@@ -11,23 +11,171 @@ Then POST to:
     curl -X POST http://localhost:8000/api/parse-resume \
       -F "file=@resume.pdf" \
       -F "github_username=yourusername"
+
+Or stream sections as server-sent events while the LLM is still generating:
+    curl -N -X POST http://localhost:8000/api/parse-resume/stream -F "file=@resume.pdf"
+
+Or enqueue a job and poll for the result (503 + Retry-After when the queue is full):
+    curl -X POST http://localhost:8000/api/jobs -F "file=@resume.pdf"
+    curl http://localhost:8000/api/jobs/<id>
+
+Parse results carry a strong ETag (hash of the PDF bytes + GitHub username)
+and a Content-Location; re-uploading the same PDF is answered from the
+result store, and the result can be fetched again (If-None-Match → 304):
+    curl http://localhost:8000/api/results/<hash>
+
+Render a result as a self-contained portfolio page (minimal, classic or bold):
+    curl http://localhost:8000/api/render/minimal/<job id> -o portfolio.html
+    curl -X POST http://localhost:8000/api/render/bold -H "Content-Type: application/json" -d @result.json
 """
 
+import asyncio
+import hashlib
+import json
 import os
-import tempfile
-from pathlib import Path
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
 
-from fastapi import FastAPI, File, Form, UploadFile, HTTPException
+from fastapi import FastAPI, Request, Response, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
 from dotenv import load_dotenv
 load_dotenv()
 
-from pipeline import ResumePipeline
+from cache import cache_from_env, make_cache_key
+from codec import dumps
+from http_cache import cached_response, etag_matches, not_modified
+from metrics import MetricsMiddleware, add_timings, collect_timings, render as render_metrics, timing_totals
+from render import TEMPLATES, PortfolioRenderer
+from uploads import read_pdf_upload
+
+if TYPE_CHECKING:
+    from jobs import JobQueue
+    from pipeline import AsyncResumePipeline
+
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+
+# Multipart form envelope (boundaries, other fields) on top of the file itself
+FORM_OVERHEAD = 64 * 1024
+
+# The upload endpoints parse their own multipart body (uploads.py); this keeps
+# the form documented in /docs
+UPLOAD_FORM = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["file"],
+            "properties": {
+                "file": {"type": "string", "format": "binary"},
+                "github_username": {"type": "string", "default": ""},
+                "document_id": {"type": "string", "default": ""},
+            },
+        }}},
+    },
+}
+
+renderer = PortfolioRenderer()      # templates compiled and CSS bundled once, here
+# Finished parse results by upload hash — RESULT_CACHE=memory|sqlite|tiered|none
+results = cache_from_env("RESULT_CACHE", default_ttl=24 * 3600, table="results")
+
+
+# ─── Pipeline (loaded in the background) ─────────────────────────────────────
+#
+# The pipeline pulls in PyMuPDF, NumPy and httpx and builds the LLM and
+# GitHub clients — most of a cold start. The server starts without it, so
+# /health answers right away; endpoints that need it await _ready().
+
+pipeline: "AsyncResumePipeline | None" = None
+jobs: "JobQueue | None" = None
+_loading: asyncio.Task | None = None
+
+
+def _build() -> tuple["AsyncResumePipeline", "JobQueue"]:
+    from jobs import JobQueue
+    from pipeline import AsyncResumePipeline
+
+    built = AsyncResumePipeline(github_token=os.getenv("GITHUB_TOKEN"))
+    return built, JobQueue(built)
+
+
+async def _load() -> None:
+    global pipeline, jobs
+    started = time.monotonic()
+    # Imports run in a thread so the event loop keeps answering meanwhile
+    built, queue = await asyncio.to_thread(_build)
+    await queue.start()
+    await built.start(wait=False)   # PDF engine warm-up carries on in the background
+    pipeline, jobs = built, queue
+    print(f"[API] Pipeline ready in {time.monotonic() - started:.2f}s")
+
+
+async def _ready() -> None:
+    """Wait until the pipeline is loaded; a failed load is retried, and raises again if it fails."""
+    global _loading
+    if jobs is None:
+        if _loading is None or (_loading.done() and not _loading.cancelled() and _loading.exception()):
+            _loading = asyncio.create_task(_load())
+        await asyncio.shield(_loading)
 
-app = FastAPI(title="Resume Parser API", version="1.0.0")
 
-# Allow requests from your Next.js frontend
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _loading
+    _loading = asyncio.create_task(_load())
+    yield
+    if not _loading.done():
+        _loading.cancel()
+    if jobs is not None:
+        await jobs.stop()
+    if pipeline is not None:
+        await pipeline.aclose()
+
+
+app = FastAPI(title="Resume Parser API", version="1.0.0", lifespan=lifespan)
+
+
+class UploadLimitMiddleware:
+    """
+    Enforce the upload limit while the body is still arriving: reject on a
+    too-large Content-Length up front, otherwise count bytes as the
+    body is read and abort as soon as the limit is crossed.
+    """
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            return await self.app(scope, receive, send)
+
+        length = dict(scope["headers"]).get(b"content-length")
+        if length and length.isdigit() and int(length) > self.max_bytes:
+            response = JSONResponse({"detail": "File too large. Max 10MB."}, status_code=400)
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(status_code=400, detail="File too large. Max 10MB.")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+app.add_middleware(UploadLimitMiddleware, max_bytes=MAX_UPLOAD_SIZE + FORM_OVERHEAD)
+
+# Allow requests from your Next.js frontend. Added after the upload limit so it
+# wraps it: the limiter's early 400 needs CORS headers for the browser to read it
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -38,48 +186,239 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-pipeline = ResumePipeline(
-    github_token=os.getenv("GITHUB_TOKEN"),
-)
+# Outermost, so request latency includes the other middleware
+app.add_middleware(MetricsMiddleware)
+
+
+async def _read_upload(request: Request) -> tuple[memoryview, str, str]:
+    """
+    The PDF, github_username and document_id from the form. The file is read
+    into one buffer as the body arrives (uploads.py) and never touches disk.
+    """
+    upload = await read_pdf_upload(request, max_bytes=MAX_UPLOAD_SIZE)
+    return upload.contents, upload.fields.get("github_username", ""), upload.fields.get("document_id", "")
+
+
+def _submit(contents: memoryview, github_username: str, document_id: str):
+    """Enqueue a parse job, turning a full queue into 503 + Retry-After."""
+    from jobs import QueueFull      # loaded by _ready()
 
+    try:
+        return jobs.submit(
+            contents, github_username=github_username or None, document_id=document_id or None
+        )
+    except QueueFull as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)}
+        )
+
+
+def _result_key(contents: memoryview, github_username: str, document_id: str) -> str:
+    """
+    Upload hash: PDF bytes + form fields, plus what the extraction depends on.
+    The document id is part of it so a hit never skips recording a version
+    in the document store under an id it wasn't parsed for.
+    """
+    from extractor import PROMPT_VERSION    # loaded by _ready()
+
+    extractor = pipeline.extractor
+    return make_cache_key(
+        "result",
+        hashlib.sha256(contents).hexdigest(),
+        github_username.strip().lower(),
+        document_id,
+        extractor.provider,
+        extractor.model,
+        PROMPT_VERSION,
+        "prefill" if extractor.prefill else "",
+        "compact" if extractor.compact else "",
+    )
+
+
+def _result_response(request: Request, key: str, result: dict) -> Response:
+    body = dumps(result)
+    return cached_response(
+        request, body, "application/json", f'"{key}"', {"Content-Location": f"/api/results/{key}"}
+    )
+
+
+@app.post("/api/parse-resume", openapi_extra=UPLOAD_FORM)
+async def parse_resume(request: Request):
+    """
+    Synchronous parse: enqueues a job and waits for it. Pass the same
+    `document_id` when re-uploading an edited resume and only the sections
+    that changed go back through the LLM. A PDF parsed before with the same
+    username and document id is answered from the result store without running the pipeline.
+    """
+    contents, github_username, document_id = await _read_upload(request)
+    await _ready()
+    key = _result_key(contents, github_username, document_id)
+    result = results.get(key) if results is not None else None
+    if result is None:
+        job = await jobs.wait(_submit(contents, github_username, document_id))
+        add_timings(job.timings)
 
-@app.post("/api/parse-resume")
-async def parse_resume(
-    file: UploadFile = File(...),
-    github_username: str = Form(default=""),
-):
-    # Validate file type
-    if not file.filename.endswith(".pdf"):
-        raise HTTPException(status_code=400, detail="Only PDF files are supported.")
+        if job.status == "failed":
+            raise HTTPException(status_code=job.error_status, detail=job.error)
+        result = job.result
+        if results is not None:
+            results.set(key, result)
+    return _result_response(request, key, result)
 
-    # Validate file size (max 10MB)
-    MAX_SIZE = 10 * 1024 * 1024
-    contents = await file.read()
-    if len(contents) > MAX_SIZE:
-        raise HTTPException(status_code=400, detail="File too large. Max 10MB.")
 
-    # Write to a temp file (pipeline expects a file path)
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-        tmp.write(contents)
-        tmp_path = tmp.name
+@app.get("/api/results/{key}")
+def get_result(key: str, request: Request):
+    """A stored parse result by the hash in its ETag / Content-Location."""
+    stored = results.get(key) if results is not None and re.fullmatch(r"[0-9a-f]{64}", key) else None
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired result.")
+    return _result_response(request, key, stored)
+
+
+@app.post("/api/jobs", status_code=202, openapi_extra=UPLOAD_FORM)
+async def create_job(request: Request):
+    contents, github_username, document_id = await _read_upload(request)
+    await _ready()
+    job = _submit(contents, github_username, document_id)
+    return JSONResponse(
+        job.to_dict(), status_code=202, headers={"Location": f"/api/jobs/{job.id}"}
+    )
+
+
+@app.get("/api/jobs/{job_id}")
+def get_job(job_id: str):
+    job = jobs.get(job_id) if jobs is not None else None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job id.")
+    return job.to_dict()
+
+
+
+
+@app.post("/api/parse-resume/stream", openapi_extra=UPLOAD_FORM)
+async def parse_resume_stream(request: Request):
+    """
+    Server-sent events: one `section` event per resume section as soon as the
+    LLM finishes it, then `github`, then `portfolio` with the full merged
+    result (same shape as /api/parse-resume). Failures arrive as `error`.
+    The last event is `timing`: milliseconds per stage and in total, what
+    Server-Timing carries on the other endpoints. Not queued, but the LLM step waits for the same per-provider slots as
+    queued jobs, and a full queue answers 503 + Retry-After here too.
+    """
+    start = time.perf_counter()
+    contents, github_username, document_id = await _read_upload(request)
+    await _ready()
+    from jobs import QueueFull      # loaded by _ready()
 
     try:
-        data = pipeline.run(
-            pdf_path=tmp_path,
-            github_username=github_username or None,
+        jobs.check_capacity()
+    except QueueFull as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)}
         )
-        return data.to_dict()
+    llm_limit = jobs.limit(pipeline.extractor.provider)
+
+    async def events():
+        timings = collect_timings()
+        try:
+            async for event, data in pipeline.run_stream(
+                pdf_path=contents,
+                github_username=github_username or None,
+                document_id=document_id or None,
+                llm_limit=llm_limit,
+            ):
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'detail': f'Parsing failed: {e}'})}\n\n"
+        # The headers went out before any stage ran, so the timings come last
+        entries = timings + [("total", time.perf_counter() - start)]
+        yield f"event: timing\ndata: {json.dumps(timing_totals(entries))}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _check_template(template: str) -> None:
+    if template not in TEMPLATES:
+        raise HTTPException(status_code=404, detail=f"Unknown template. Use one of: {', '.join(TEMPLATES)}.")
+
+
+def _render_response(request: Request, data: dict, template: str, etag: str, download: bool) -> Response:
+    headers = {}
+    if download:
+        name = (data["resume"].get("contact") or {}).get("name") or "portfolio"
+        slug = "-".join(name.lower().split()).encode("ascii", "ignore").decode() or "portfolio"
+        headers["Content-Disposition"] = f'attachment; filename="{slug}-portfolio.html"'
+    return cached_response(request, renderer.render(data, template), "text/html; charset=utf-8", etag, headers)
+
+
+@app.post("/api/render/{template}")
+async def render_portfolio(template: str, request: Request, download: bool = False):
+    """
+    Render a /api/parse-resume result (posted as JSON) with one of the
+    portfolio templates. Identical input gives byte-identical HTML, and
+    the ETag says so.
+    """
+    _check_template(template)
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or not isinstance(data.get("resume"), dict):
+        raise HTTPException(status_code=400, detail="Body must be a parse result as JSON.")
+    return _render_response(request, data, template, renderer.etag(data, template), download)
+
+
+@app.get("/api/render/{template}/{job_id}")
+def render_job(template: str, job_id: str, request: Request, download: bool = False):
+    """Render a finished job's result; answers If-None-Match with 304 without rendering."""
+    _check_template(template)
+    job = jobs.get(job_id) if jobs is not None else None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job id.")
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}.")
+
+    etag = renderer.etag(job.result, template)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    return _render_response(request, job.result, template, etag, download)
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    await _ready()
+    cache = pipeline.extractor.cache
+    return cache.stats() if cache is not None else {"backend": None}
+
+
+@app.get("/api/queue/stats")
+async def queue_stats():
+    await _ready()
+    return jobs.stats()
+
+
+@app.get("/api/llm/stats")
+async def llm_stats():
+    await _ready()
+    return {**pipeline.extractor.tokens.stats(), **pipeline.extractor.router.stats()}
+
 
-    except ValueError as e:
-        raise HTTPException(status_code=422, detail=str(e))
+@app.get("/api/http/stats")
+async def http_stats():
+    await _ready()
+    return pipeline.pool_stats()
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Parsing failed: {str(e)}")
 
-    finally:
-        Path(tmp_path).unlink(missing_ok=True)
+@app.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint: stage latency, pages, chars, tokens, provider errors."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {"status": "ok", "pipeline": "ready" if jobs is not None else "loading"}
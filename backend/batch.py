@@ -0,0 +1,249 @@
+"""
+backend/batch.py
+----------------------
+Bulk ingestion: a directory, glob or zip archive of resume PDFs → JSONL.
+
+    python batch.py ./cvs -o results.jsonl
+    python batch.py "exports/**/*.pdf" -o results.jsonl --workers 4 --llm-concurrency 2
+    python batch.py career-fair.zip -o results.jsonl
+
+or from Python:
+    ResumePipeline().run_many("./cvs", "results.jsonl")
+
+PDFs are parsed in parallel on a process pool, identical files (same
+SHA-256) are extracted once, at most `llm_concurrency` documents talk to
+the LLM at a time, and each GitHub username is fetched once per run.
+Every document gets one JSON line as soon as it finishes:
+
+    {"id": "<sha256>", "source": "cvs/jane.pdf", "status": "done", "seconds": 2.1, "result": {...}}
+    {"id": "<sha256>", "source": "cvs/copy.pdf", "status": "duplicate", "duplicate_of": "cvs/jane.pdf"}
+    {"id": "<sha256>", "source": "cvs/scan.pdf", "status": "failed", "error": "..."}
+
+Re-running with the same output file appends, skipping ids already written
+with status "done" — so a crashed run picks up where it stopped and failed
+documents are retried.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import zipfile
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+from codec import dumps
+from github_enricher import GitHubProfile
+from jobs import provider_limit
+from metrics import record_stage
+from parser import extract_text_timed, start_page_pool
+from pipeline import ResumePipeline
+
+
+@dataclass
+class Document:
+    id: str         # SHA-256 of the PDF bytes
+    source: str     # path, or "archive.zip:member.pdf"
+    data: bytes
+
+
+@dataclass
+class BatchSummary:
+    total: int = 0
+    done: int = 0
+    failed: int = 0
+    duplicates: int = 0
+    skipped: int = 0        # already in the output from an earlier run
+    seconds: float = 0.0
+
+
+# ─── Inputs ───────────────────────────────────────────────────────────────────
+
+def iter_documents(source: str | os.PathLike) -> Iterator[Document]:
+    """PDFs from a directory (recursive), a glob pattern, a .zip archive or a single file."""
+    source = str(source)
+    path = Path(source)
+    if path.is_dir():
+        files = sorted(p for p in path.rglob("*") if p.is_file() and p.suffix.lower() == ".pdf")
+    elif path.is_file() and zipfile.is_zipfile(path):
+        yield from _iter_zip(path)
+        return
+    elif path.is_file():
+        files = [path]
+    elif any(c in source for c in "*?["):
+        files = sorted(Path(p) for p in glob.glob(source, recursive=True) if Path(p).is_file())
+    else:
+        raise FileNotFoundError(f"No such file, directory or pattern: {source}")
+
+    for file in files:
+        data = file.read_bytes()
+        yield Document(id=content_id(data), source=str(file), data=data)
+
+
+def _iter_zip(path: Path) -> Iterator[Document]:
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not info.filename.lower().endswith(".pdf"):
+                continue
+            data = archive.read(info)
+            yield Document(id=content_id(data), source=f"{path}:{info.filename}", data=data)
+
+
+def content_id(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def finished_ids(output: str | os.PathLike) -> set[str]:
+    """Ids written with status "done" by earlier runs; a torn last line is ignored."""
+    done: set[str] = set()
+    if not Path(output).exists():
+        return done
+    with open(output, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "done":
+                done.add(record["id"])
+    return done
+
+
+# ─── Runner ───────────────────────────────────────────────────────────────────
+
+class BatchRunner:
+    """
+    Drives a ResumePipeline over many documents.
+
+    Parses run on a warm process pool (`workers` processes); extraction runs
+    on `llm_concurrency` threads, each waiting for its document's text, so
+    parsing keeps running ahead of the LLM. At most `max_in_flight`
+    documents are held in memory at once.
+    """
+
+    def __init__(
+        self,
+        pipeline: ResumePipeline,
+        workers: int | None = None,
+        llm_concurrency: int | None = None,
+    ):
+        self.pipeline = pipeline
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.llm_concurrency = llm_concurrency or provider_limit(pipeline.extractor.provider) or 4
+        self.max_in_flight = 4 * max(self.workers, self.llm_concurrency)
+        self._github: dict[str, Future] = {}
+        self._github_lock = threading.Lock()
+
+    def run(self, source: str | os.PathLike, output: str | os.PathLike) -> BatchSummary:
+        start = time.monotonic()
+        summary = BatchSummary()
+        already_done = finished_ids(output)
+        first_seen: dict[str, str] = {}
+        pending: set[Future] = set()
+
+        parse_pool = start_page_pool(self.workers) if self.workers > 0 else ThreadPoolExecutor(1)
+        llm_pool = ThreadPoolExecutor(max_workers=self.llm_concurrency, thread_name_prefix="batch")
+        parsers = f"{self.workers} parse processes" if self.workers > 0 else "parsing in a thread"
+        print(f"[BATCH] {parsers}, {self.llm_concurrency} concurrent extractions")
+        try:
+            with open(output, "ab") as out:
+                for doc in iter_documents(source):
+                    summary.total += 1
+                    if doc.id in already_done:
+                        summary.skipped += 1
+                        continue
+                    if doc.id in first_seen:
+                        summary.duplicates += 1
+                        self._write(out, {"id": doc.id, "source": doc.source, "status": "duplicate",
+                                          "duplicate_of": first_seen[doc.id]})
+                        continue
+                    first_seen[doc.id] = doc.source
+
+                    text = parse_pool.submit(extract_text_timed, doc.data)
+                    pending.add(llm_pool.submit(self._process, doc, text, time.monotonic()))
+
+                    # Backpressure: don't read further ahead than we can hold
+                    while len(pending) >= self.max_in_flight:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        self._collect(out, finished, summary)
+
+                while pending:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self._collect(out, finished, summary)
+        finally:
+            for future in pending:
+                future.cancel()
+            llm_pool.shutdown(wait=True, cancel_futures=True)
+            parse_pool.shutdown(wait=False, cancel_futures=True)
+
+        summary.seconds = round(time.monotonic() - start, 2)
+        print(f"[BATCH] {summary.total} files: {summary.done} done, {summary.failed} failed, "
+              f"{summary.duplicates} duplicates, {summary.skipped} already done — {summary.seconds}s")
+        return summary
+
+    def _process(self, doc: Document, text: Future, submitted: float) -> dict:
+        """Text → LLM → GitHub for one document; never raises."""
+        record = {"id": doc.id, "source": doc.source}
+        try:
+            raw_text, pdf_seconds = text.result()
+            record_stage("pdf", pdf_seconds)
+            data = self.pipeline.run_text(raw_text, github_fetch=self._fetch_github)
+            record.update(status="done", result=data.to_dict())
+        except Exception as e:
+            record.update(status="failed", error=str(e) or type(e).__name__)
+        record["seconds"] = round(time.monotonic() - submitted, 2)
+        return record
+
+    def _fetch_github(self, username: str) -> "Future[GitHubProfile | None]":
+        """One fetch per username per run, shared by every resume that names it."""
+        key = username.lower()
+        with self._github_lock:
+            if key not in self._github:
+                self._github[key] = self.pipeline.fetch_github(username)
+            return self._github[key]
+
+    def _collect(self, out, finished: set[Future], summary: BatchSummary) -> None:
+        for future in finished:
+            record = future.result()
+            if record["status"] == "done":
+                summary.done += 1
+            else:
+                summary.failed += 1
+                print(f"[BATCH] {record['source']} failed: {record['error'][:200]}")
+            self._write(out, record)
+
+    @staticmethod
+    def _write(out, record: dict) -> None:
+        out.write(dumps(record) + b"\n")
+        out.flush()     # one complete line per document survives a crash
+
+
+# ─── CLI ──────────────────────────────────────────────────────────────────────
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Parse a folder, glob or zip of resume PDFs into JSONL.")
+    parser.add_argument("source", help="directory, glob pattern (quote it) or .zip archive")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file; appended to and resumed from")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="PDF parse processes (default: CPU count; 0 = parse in a thread)")
+    parser.add_argument("--llm-concurrency", type=int, default=None,
+                        help="documents extracted at once (default: LLM_CONCURRENCY_<PROVIDER>)")
+    args = parser.parse_args(argv)
+
+    pipeline = ResumePipeline()
+    try:
+        summary = pipeline.run_many(args.source, args.output, args.workers, args.llm_concurrency)
+    finally:
+        pipeline.close()
+    print(json.dumps(asdict(summary)))
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,153 @@
+"""
+backend/bench_codec.py
+----------------------------
+Time and memory of a bulk export — N LLM-shaped dicts → ResumeData → one
+JSON document — with codec.py against the previous path: plain (unslotted)
+dataclasses, the field-by-field .get() mapping, dataclasses.asdict() and
+json.dumps().
+
+    python bench_codec.py [--docs 2000] [--repeat 5]
+
+Per step: best wall time over --repeat runs, and tracemalloc's peak for
+one run with the step's result still alive. The decode peak is the
+objects themselves (strings and lists are shared with the input on both
+sides), so it shows what dropping the per-instance __dict__ saves; the
+encode peak adds asdict()'s deep copy. The input dicts are clean, so the
+codec's coercion is pure overhead here.
+"""
+
+import dataclasses
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from bench_corpus import resume_dict
+import codec
+from codec import dumps, from_plain
+from models import ContactInfo, Education, Experience, Project, ResumeData
+
+
+# ─── The previous path ────────────────────────────────────────────────────────
+
+def _unslotted(cls: type, **types: type) -> type:
+    """A plain @dataclass copy of `cls` (same fields and defaults, with a __dict__)."""
+    fields = [
+        (f.name, types.get(f.name, f.type), dataclasses.field(default=f.default, default_factory=f.default_factory))
+        for f in dataclasses.fields(cls)
+    ]
+    return dataclasses.make_dataclass(cls.__name__, fields)
+
+
+LegacyContact = _unslotted(ContactInfo)
+LegacyExperience = _unslotted(Experience)
+LegacyProject = _unslotted(Project)
+LegacyEducation = _unslotted(Education)
+LegacyResume = _unslotted(ResumeData)
+
+
+def legacy_decode(data: dict):
+    contact_raw = data.get("contact", {})
+    contact = LegacyContact(
+        name=contact_raw.get("name", ""),
+        email=contact_raw.get("email", ""),
+        phone=contact_raw.get("phone", ""),
+        location=contact_raw.get("location", ""),
+        linkedin=contact_raw.get("linkedin", ""),
+        github=contact_raw.get("github", ""),
+        website=contact_raw.get("website", ""),
+    )
+    experience = [
+        LegacyExperience(company=e.get("company", ""), role=e.get("role", ""), duration=e.get("duration", ""),
+                         location=e.get("location", ""), highlights=e.get("highlights", []))
+        for e in data.get("experience", [])
+    ]
+    projects = [
+        LegacyProject(name=p.get("name", ""), description=p.get("description", ""),
+                      tech_stack=p.get("tech_stack", []), url=p.get("url", ""), github_url=p.get("github_url", ""))
+        for p in data.get("projects", [])
+    ]
+    education = [
+        LegacyEducation(institution=e.get("institution", ""), degree=e.get("degree", ""),
+                        field_of_study=e.get("field_of_study", ""), graduation_year=e.get("graduation_year", ""),
+                        gpa=e.get("gpa", ""))
+        for e in data.get("education", [])
+    ]
+    return LegacyResume(
+        contact=contact, summary=data.get("summary", ""), skills=data.get("skills", []),
+        experience=experience, projects=projects, education=education,
+        certifications=data.get("certifications", []), languages=data.get("languages", []),
+    )
+
+
+def legacy_export(resumes: list) -> bytes:
+    return json.dumps([dataclasses.asdict(r) for r in resumes], ensure_ascii=False).encode("utf-8")
+
+
+def codec_export(resumes: list[ResumeData]) -> bytes:
+    return dumps(resumes)
+
+
+# ─── Measurement ──────────────────────────────────────────────────────────────
+
+def _peak(fn, arg) -> int:
+    """Peak traced bytes during one call, with its result still alive."""
+    tracemalloc.start()
+    result = fn(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def _best(fn, arg, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str]) -> None:
+    def option(flag: str, default: str) -> str:
+        return argv[argv.index(flag) + 1] if flag in argv else default
+
+    docs, repeat = int(option("--docs", "2000")), int(option("--repeat", "5"))
+    rng = random.Random(0)
+    dicts = [resume_dict(rng, n_jobs=1 + i % 10) for i in range(docs)]
+
+    legacy_steps = {
+        "decode": lambda ds: [legacy_decode(d) for d in ds],
+        "encode": legacy_export,
+        "export": lambda ds: legacy_export([legacy_decode(d) for d in ds]),
+    }
+    codec_steps = {
+        "decode": lambda ds: [from_plain(ResumeData, d) for d in ds],
+        "encode": codec_export,
+        "export": lambda ds: codec_export([from_plain(ResumeData, d) for d in ds]),
+    }
+    inputs = {
+        "decode": (dicts, dicts),
+        "encode": (legacy_steps["decode"](dicts), codec_steps["decode"](dicts)),
+        "export": (dicts, dicts),
+    }
+    legacy_out, codec_out = legacy_steps["export"](dicts), codec_steps["export"](dicts)
+    assert json.loads(legacy_out) == json.loads(codec_out), "outputs differ"
+
+    print(f"{docs} resumes → one JSON document ({len(codec_out) / 1e6:.1f} MB), best of {repeat}")
+    print(f"{'step':<8} {'legacy ms':>10} {'codec ms':>9} {'speedup':>8}   {'legacy peak':>11} {'codec peak':>10} {'saved':>6}")
+    for name in ("decode", "encode", "export"):
+        legacy_in, codec_in = inputs[name]
+        legacy_s = _best(legacy_steps[name], legacy_in, repeat)
+        codec_s = _best(codec_steps[name], codec_in, repeat)
+        legacy_peak, codec_peak = _peak(legacy_steps[name], legacy_in), _peak(codec_steps[name], codec_in)
+        print(f"{name:<8} {legacy_s * 1000:>10.1f} {codec_s * 1000:>9.1f} {legacy_s / codec_s:>7.1f}x   "
+              f"{legacy_peak / 1e6:>8.1f} MB {codec_peak / 1e6:>7.1f} MB {1 - codec_peak / legacy_peak:>6.0%}")
+
+    print(f"JSON encoder: {'orjson' if codec.orjson is not None else 'stdlib json (pip install orjson)'}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
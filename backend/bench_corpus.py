@@ -0,0 +1,275 @@
+"""
+backend/bench_corpus.py
+-----------------------------
+Synthetic resume corpus for bench_suite.py — deterministic for a given seed.
+
+    python bench_corpus.py out_dir [--docs 40] [--seed 0]
+
+Documents cycle through the layouts the parser has to handle:
+    1–10 pages, one column or a two-column (sidebar) layout,
+    ligature glyphs (ﬁ, ﬂ, ﬃ) set in an embedded TrueType font,
+    ruled tables (sent to pdfplumber by the table-page check),
+    dates right-aligned on the role and degree lines (must not be read as
+    a second column).
+
+out_dir gets one PDF per document plus manifest.json describing each.
+"""
+
+import json
+import random
+import re
+import sys
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+
+PAGE_WIDTH, PAGE_HEIGHT = 612.0, 792.0
+MARGIN = 54.0
+GUTTER = 24.0
+FONT_SIZE = 10.0
+LINE_HEIGHT = 13.0
+
+HANDLES = ["octocat", "janedoe", "devjohn", "mlopez", "akim", "tnguyen", "rpatel", "schen"]
+NAMES = ["Jane Doe", "John Smith", "Maria Lopez", "Alex Kim", "Tran Nguyen", "Ravi Patel", "Sam Chen"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+ROLES = ["Software Engineer", "Senior Backend Engineer", "Data Scientist", "Staff Engineer", "DevOps Engineer"]
+MONTHS = ["Jan", "Mar", "Jun", "Sep", "Dec"]
+SKILLS = ["Python", "Go", "TypeScript", "React", "PostgreSQL", "Kubernetes", "AWS", "Docker", "Kafka", "Redis"]
+WORDS = (
+    "built designed led migrated scaled shipped reduced improved automated owned latency throughput "
+    "pipeline service platform team customers revenue infrastructure reliability deployment "
+    "efficient first workflow profile office financial classified flexible offline conflict"
+).split()
+
+# Ligature code points the cleaner has to undo (the embedded font has no ﬀ glyph)
+LIGATURES = {"ffi": "ﬃ", "ffl": "ﬄ", "fi": "ﬁ", "fl": "ﬂ"}
+
+
+@dataclass
+class CorpusDoc:
+    name: str
+    pages: int
+    columns: int
+    ligatures: bool
+    table: bool
+    github: str
+    right_dates: bool = False   # "Role - Company ........ 2016 - 2019" on one line
+
+
+# ─── Text ─────────────────────────────────────────────────────────────────────
+
+def _ligate(text: str) -> str:
+    for plain, glyph in LIGATURES.items():
+        text = text.replace(plain, glyph)
+    return text
+
+
+def _sentence(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words)).capitalize() + "."
+
+
+def resume_lines(rng: random.Random, handle: str, n_lines: int, right_dates: bool = False) -> list[str]:
+    """
+    Headings, contact block and bullet text — about n_lines lines of it.
+    With right_dates, dates follow their role or degree after a tab, to be
+    set flush right.
+    """
+    name = rng.choice(NAMES)
+    date_sep = "\t" if right_dates else ", "
+    lines = [
+        name,
+        f"{name.split()[0].lower()}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        f"github.com/{handle} | linkedin.com/in/{handle}",
+        "",
+        "SUMMARY",
+        _sentence(rng, 14),
+        "",
+        "EXPERIENCE",
+    ]
+    while len(lines) < n_lines - 8:
+        start = rng.randint(2010, 2021)
+        entry = [f"{rng.choice(ROLES)} - {rng.choice(COMPANIES)}", f"{start} - {start + rng.randint(1, 3)}"]
+        if right_dates:
+            # "Jun 2016 - Dec 2019", flush right on the role line
+            entry = [entry[0], re.sub(r"(\d{4})", lambda m: f"{rng.choice(MONTHS)} {m[1]}", entry[1])]
+            lines.append("\t".join(entry))
+        else:
+            lines += entry
+        # Few, short bullets leave the dates alone at the right edge: a compact one-pager
+        bullet_words, bullets = ((4, 8), (1, 2)) if right_dates else ((8, 16), (2, 5))
+        lines += [f"- {_sentence(rng, rng.randint(*bullet_words))}" for _ in range(rng.randint(*bullets))]
+        lines.append("")
+    lines += [
+        "EDUCATION",
+        f"BSc Computer Science, State University{date_sep}{rng.randint(2005, 2018)}",
+        "",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, 6)),
+    ]
+    return lines
+
+
+def _wrap(font: fitz.Font, widths: dict[str, float], line: str, width: float) -> list[str]:
+    """Greedy word wrap to a column width; word widths are cached in `widths`."""
+    space = font.text_length(" ", fontsize=FONT_SIZE)
+    out, current, used = [], [], 0.0
+    for word in line.split(" "):
+        if word not in widths:
+            widths[word] = font.text_length(word, fontsize=FONT_SIZE)
+        needed = widths[word] + (space if current else 0.0)
+        if current and used + needed > width:
+            out.append(" ".join(current))
+            current, used = [word], widths[word]
+        else:
+            current.append(word)
+            used += needed
+    out.append(" ".join(current))
+    return out
+
+
+# ─── PDF ──────────────────────────────────────────────────────────────────────
+
+def _draw_table(page: fitz.Page, writer: fitz.TextWriter, font: fitz.Font, top: float, rng: random.Random) -> None:
+    """A ruled 4-column table of skills and years, starting at `top`."""
+    rows, cols, row_h = 6, 4, 18.0
+    col_w = (PAGE_WIDTH - 2 * MARGIN) / cols
+    bottom = top + rows * row_h
+    for r in range(rows + 1):
+        page.draw_line((MARGIN, top + r * row_h), (PAGE_WIDTH - MARGIN, top + r * row_h), width=0.5)
+    for c in range(cols + 1):
+        page.draw_line((MARGIN + c * col_w, top), (MARGIN + c * col_w, bottom), width=0.5)
+    header = ["Skill", "Years", "Level", "Last used"]
+    for r in range(rows):
+        cells = header if r == 0 else [
+            rng.choice(SKILLS), str(rng.randint(1, 12)), rng.choice(["Expert", "Advanced", "Working"]),
+            str(rng.randint(2018, 2024)),
+        ]
+        for c, cell in enumerate(cells):
+            writer.append((MARGIN + c * col_w + 4, top + r * row_h + 13), cell, font=font, fontsize=FONT_SIZE)
+
+
+def make_pdf(rng: random.Random, doc_info: CorpusDoc) -> bytes:
+    """Render one synthetic resume to PDF bytes."""
+    doc = fitz.open()
+    font = fitz.Font("cjk") if doc_info.ligatures else fitz.Font("helv")
+    widths: dict[str, float] = {}
+    lines_per_column = int((PAGE_HEIGHT - 2 * MARGIN) / LINE_HEIGHT)
+
+    if doc_info.columns == 2:
+        main_w = (PAGE_WIDTH - 2 * MARGIN - GUTTER) * 0.66
+        side_w = PAGE_WIDTH - 2 * MARGIN - GUTTER - main_w
+        columns = [(MARGIN, main_w), (MARGIN + main_w + GUTTER, side_w)]
+    else:
+        columns = [(MARGIN, PAGE_WIDTH - 2 * MARGIN)]
+
+    for page_no in range(doc_info.pages):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        # One TextWriter per page — far faster than an insert_text() per line
+        writer = fitz.TextWriter(page.rect)
+
+        top = MARGIN + FONT_SIZE
+        if doc_info.table and page_no == 0:
+            # Table across the bottom of the first page, text above it
+            _draw_table(page, writer, font, PAGE_HEIGHT - MARGIN - 140, rng)
+            usable = lines_per_column - 12
+        else:
+            usable = lines_per_column
+
+        for index, (left, width) in enumerate(columns):
+            # The sidebar gets its own shorter block of text (skills, links, ...)
+            n_lines = usable if index == 0 else usable // 2
+            wrapped: list[str] = []
+            for line in resume_lines(rng, doc_info.github, n_lines, doc_info.right_dates):
+                text = _ligate(line) if doc_info.ligatures else line
+                wrapped += [text] if "\t" in text else _wrap(font, widths, text, width) if text else [""]
+            y = top
+            for text in wrapped[:n_lines]:
+                text, _, flush_right = text.partition("\t")
+                if text:
+                    writer.append((left, y), text, font=font, fontsize=FONT_SIZE)
+                if flush_right:
+                    x = left + width - font.text_length(flush_right, fontsize=FONT_SIZE)
+                    writer.append((x, y), flush_right, font=font, fontsize=FONT_SIZE)
+                y += LINE_HEIGHT
+        writer.write_text(page)
+
+    if doc_info.ligatures:
+        doc.subset_fonts()      # the fallback font is ~4MB whole
+    data = doc.tobytes(garbage=3, deflate=True)
+    doc.close()
+    return data
+
+
+def build_corpus(n_docs: int = 40, seed: int = 0) -> list[tuple[CorpusDoc, bytes]]:
+    """Documents cycling pages 1–10 × columns × ligatures × tables × right-aligned dates."""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(n_docs):
+        info = CorpusDoc(
+            name=f"resume-{i:03d}.pdf",
+            pages=1 + i % 10,
+            columns=1 + (i // 10) % 2,
+            ligatures=i % 3 == 1,
+            table=i % 4 == 2,
+            github=HANDLES[i % len(HANDLES)],
+            right_dates=i % 5 == 4,
+        )
+        corpus.append((info, make_pdf(rng, info)))
+    return corpus
+
+
+def write_corpus(out_dir: str | Path, n_docs: int = 40, seed: int = 0) -> list[CorpusDoc]:
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    manifest = []
+    for info, data in build_corpus(n_docs, seed):
+        (out / info.name).write_bytes(data)
+        manifest.append(info)
+    (out / "manifest.json").write_text(json.dumps({"seed": seed, "docs": [asdict(d) for d in manifest]}, indent=1))
+    return manifest
+
+
+def load_corpus(corpus_dir: str | Path) -> list[tuple[CorpusDoc, bytes]]:
+    corpus_dir = Path(corpus_dir)
+    manifest = json.loads((corpus_dir / "manifest.json").read_text())
+    return [(CorpusDoc(**d), (corpus_dir / d["name"]).read_bytes()) for d in manifest["docs"]]
+
+
+def resume_dict(rng: random.Random, n_jobs: int) -> dict:
+    """An LLM-shaped extraction result with n_jobs experience entries (for coercion benchmarks)."""
+    return {
+        "contact": {"name": rng.choice(NAMES), "email": "jane@example.com", "phone": "+1 555 0100",
+                    "location": "Berlin", "linkedin": "linkedin.com/in/jane", "github": "github.com/janedoe",
+                    "website": ""},
+        "summary": _sentence(rng, 20),
+        "skills": rng.sample(SKILLS, 8),
+        "experience": [
+            {"company": rng.choice(COMPANIES), "role": rng.choice(ROLES), "duration": "2019 - 2022",
+             "location": "Remote", "highlights": [_sentence(rng, 12) for _ in range(4)]}
+            for _ in range(n_jobs)
+        ],
+        "projects": [
+            {"name": f"project-{i}", "description": _sentence(rng, 10), "tech_stack": rng.sample(SKILLS, 3),
+             "url": "", "github_url": f"https://github.com/janedoe/project-{i}"}
+            for i in range(max(1, n_jobs // 2))
+        ],
+        "education": [{"institution": "State University", "degree": "BSc", "field_of_study": "CS",
+                       "graduation_year": "2016", "gpa": ""}],
+        "certifications": ["AWS Solutions Architect"],
+        "languages": ["English", "German"],
+    }
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args:
+        sys.exit(__doc__)
+    docs, seed = 40, 0
+    if "--docs" in args:
+        docs = int(args[args.index("--docs") + 1])
+    if "--seed" in args:
+        seed = int(args[args.index("--seed") + 1])
+    written = write_corpus(args[0], docs, seed)
+    print(f"Wrote {len(written)} PDFs ({sum(d.pages for d in written)} pages) to {args[0]}")
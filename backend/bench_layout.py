@@ -0,0 +1,99 @@
+"""
+backend/bench_layout.py
+-----------------------------
+Time the NumPy layout pass (layout.page_lines) against the original
+dict-based _group_words_into_lines on synthetic pages.
+
+    python bench_layout.py [--words 2000 5000 20000] [--repeat 5]
+
+Both sides start from the same (x0, top, x1, bottom, text) tuples that
+PyMuPDF returns, so conversion costs are included. Also checks that dates
+set flush right on one-column resumes stay on their role/degree lines
+instead of being read as a second column.
+"""
+
+import random
+import re
+import sys
+import time
+
+from bench_corpus import ROLES, CorpusDoc, make_pdf
+from layout import page_lines
+from parser import _group_words_into_lines, extract_text_from_pdf
+
+
+def synthetic_page(n_words: int, columns: int = 2, seed: int = 0) -> list[tuple]:
+    """Word boxes for a page of `columns` text columns, in shuffled content order."""
+    rng = random.Random(seed)
+    width, margin, gutter = 612.0, 36.0, 24.0
+    col_width = (width - 2 * margin - gutter * (columns - 1)) / columns
+    words = []
+    per_column = n_words // columns
+    for col in range(columns):
+        left = margin + col * (col_width + gutter)
+        x, top = left, 40.0
+        for i in range(per_column):
+            w = rng.uniform(12, 48)
+            if x + w > left + col_width:
+                x, top = left, top + 12.0
+            jitter = rng.uniform(-1.5, 1.5)
+            words.append((x, top + jitter, x + w, top + jitter + 10, f"c{col}w{i}"))
+            x += w + 3.0
+    rng.shuffle(words)
+    return words
+
+
+def right_dates_kept(docs: int = 5) -> bool:
+    """Every role and degree line of a right-aligned-dates resume still ends in its year."""
+    rng = random.Random(0)
+    for i in range(docs):
+        info = CorpusDoc(name=f"dates-{i}.pdf", pages=1, columns=1, ligatures=False, table=False,
+                         github="janedoe", right_dates=True)
+        lines = extract_text_from_pdf(make_pdf(rng, info)).splitlines()
+        entries = [line for line in lines if line.startswith(tuple(ROLES)) or line.startswith("BSc ")]
+        if not entries or not all(re.search(r"\b\d{4}$", line) for line in entries):
+            return False
+    return True
+
+
+def _legacy(words: list[tuple]) -> list[str]:
+    dicts = [{"text": w[4], "x0": w[0], "top": w[1]} for w in words]
+    return [" ".join(w["text"] for w in line) for line in _group_words_into_lines(dicts, y_tolerance=5)]
+
+
+def _time(fn, words, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(words)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str]) -> None:
+    sizes, repeat = [2000, 5000, 20000], 5
+    if "--repeat" in argv:
+        i = argv.index("--repeat")
+        repeat = int(argv[i + 1])
+        del argv[i:i + 2]
+    if "--words" in argv:
+        sizes = [int(n) for n in argv[argv.index("--words") + 1:]]
+
+    print(f"{'words':>7} {'cols':>4} {'legacy ms':>10} {'numpy ms':>9} {'speedup':>8}  columns split")
+    for n in sizes:
+        for columns in (1, 2):
+            words = synthetic_page(n, columns)
+            legacy = _time(_legacy, words, repeat)
+            vectorized = _time(page_lines, words, repeat)
+
+            # Column order check: every c0 word must come before every c1 word
+            text = " ".join(page_lines(words))
+            split = "n/a" if columns == 1 else str(text.rfind("c0w") < text.find("c1w"))
+            print(f"{n:>7} {columns:>4} {legacy * 1000:>10.2f} {vectorized * 1000:>9.2f} "
+                  f"{legacy / vectorized:>7.1f}x  {split}")
+
+    print(f"right-aligned dates kept in their entries: {right_dates_kept()}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
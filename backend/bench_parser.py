@@ -0,0 +1,78 @@
+"""
+backend/bench_parser.py
+-----------------------------
+Compare the PDF engines on your own files: per-page time and peak RSS.
+
+    python bench_parser.py resume1.pdf resume2.pdf ... [--repeat 5]
+
+Each engine runs in its own subprocess so peak RSS isn't shared between them.
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ENGINES = ("pymupdf", "pdfplumber")
+
+
+def _run_engine(paths: list[str], repeat: int) -> dict:
+    """Child process: time extract_text_from_pdf with the engine set in PDF_ENGINE."""
+    import fitz
+    from parser import extract_text_from_pdf
+
+    pages = 0
+    elapsed = 0.0
+    for path in paths:
+        with fitz.open(path) as doc:
+            pages += doc.page_count * repeat
+        for _ in range(repeat):
+            start = time.perf_counter()
+            extract_text_from_pdf(path)
+            elapsed += time.perf_counter() - start
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return {
+        "pages": pages,
+        "total_s": round(elapsed, 4),
+        "ms_per_page": round(1000 * elapsed / pages, 3) if pages else 0,
+        "peak_rss_mb": round(peak_mb, 1),
+    }
+
+
+def main(argv: list[str]) -> None:
+    repeat = 3
+    if "--repeat" in argv:
+        i = argv.index("--repeat")
+        repeat = int(argv[i + 1])
+        argv = argv[:i] + argv[i + 2:]
+    paths = [os.path.abspath(p) for p in argv]
+    if not paths:
+        sys.exit(__doc__)
+
+    results = {}
+    for engine in ENGINES:
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", str(repeat), *paths],
+            env={**os.environ, "PDF_ENGINE": engine},
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        )
+        results[engine] = json.loads(out.stdout.strip().splitlines()[-1])
+        r = results[engine]
+        print(f"{engine:>10}: {r['ms_per_page']:8.2f} ms/page  peak RSS {r['peak_rss_mb']:6.1f} MB  ({r['pages']} pages)")
+
+    fast, slow = results["pymupdf"]["ms_per_page"], results["pdfplumber"]["ms_per_page"]
+    if fast:
+        print(f"pymupdf is {slow / fast:.1f}x faster per page")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        print(json.dumps(_run_engine(sys.argv[3:], int(sys.argv[2]))))
+    else:
+        main(sys.argv[1:])
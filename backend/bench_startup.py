@@ -0,0 +1,126 @@
+"""
+backend/bench_startup.py
+------------------------------
+Cold-start budget for the API process — what a spun-down free-tier
+instance pays before its first response:
+
+    import      `import api` in a fresh interpreter (best of --repeat)
+    health      process start → first 200 from GET /health (uvicorn)
+    ready       process start → /health reports the pipeline loaded
+
+    python bench_startup.py [--import-budget-ms 800] [--health-budget-ms 1500]
+                            [--repeat 3] [--top 12]
+
+Also lists the slowest imports (python -X importtime) and checks that
+`import api` leaves the heavy modules — PyMuPDF, pdfplumber, NumPy, httpx
+and the pipeline itself — to the background load. Exits 1 if a budget is
+exceeded or a heavy module is imported eagerly, so it can gate a deploy.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from bench_suite import _free_port
+
+HERE = Path(__file__).resolve().parent
+
+# Loaded after startup (api._load), never by `import api`
+HEAVY = ("fitz", "pymupdf", "pdfplumber", "numpy", "httpx", "pipeline", "extractor", "jobs")
+
+
+def _env() -> dict:
+    # No LLM backend needed to start: the rule-based extractor builds without one
+    return {**os.environ, "LLM_PROVIDER": "none", "PDF_PROCESSES": "0"}
+
+
+def import_ms(repeat: int) -> float:
+    code = "import time; t = time.perf_counter(); import api; print(time.perf_counter() - t)"
+    runs = [
+        float(subprocess.run([sys.executable, "-c", code], cwd=HERE, env=_env(),
+                             capture_output=True, text=True, check=True).stdout.split()[-1])
+        for _ in range(repeat)
+    ]
+    return min(runs) * 1000
+
+
+def import_profile() -> list[tuple[str, float, float]]:
+    """(module, self ms, cumulative ms) for every module `import api` loads, in import order."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import api"],
+                          cwd=HERE, env=_env(), capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return rows
+
+
+def health_ms() -> tuple[float, float]:
+    """(ms to the first /health 200, ms until it reports the pipeline ready) for a fresh server."""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--port", str(port), "--log-level", "warning"],
+        cwd=HERE, env=_env(), stdout=subprocess.DEVNULL,
+    )
+    first = None
+    try:
+        while time.perf_counter() - started < 60:
+            try:
+                body = json.loads(urllib.request.urlopen(url, timeout=1).read())
+            except OSError:
+                time.sleep(0.005)
+                continue
+            now = (time.perf_counter() - started) * 1000
+            first = first or now
+            if body.get("pipeline") == "ready":
+                return first, now
+            time.sleep(0.005)
+        raise RuntimeError("API did not become ready within 60s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main(argv: list[str]) -> int:
+    def option(flag: str, default: str) -> str:
+        return argv[argv.index(flag) + 1] if flag in argv else default
+
+    import_budget = float(option("--import-budget-ms", "800"))
+    health_budget = float(option("--health-budget-ms", "1500"))
+    repeat, top = int(option("--repeat", "3")), int(option("--top", "12"))
+
+    profile = import_profile()
+    print(f"Slowest imports under `import api` (self ms, cumulative ms):")
+    for name, self_ms, cumulative_ms in sorted(profile, key=lambda row: -row[1])[:top]:
+        print(f"  {self_ms:8.1f} {cumulative_ms:8.1f}  {name}")
+
+    loaded = {name.split(".")[0] for name, _, _ in profile}
+    eager = [name for name in HEAVY if name in loaded]
+    imported, (health, ready) = import_ms(repeat), health_ms()
+
+    failures = []
+    if eager:
+        failures.append(f"imported eagerly: {', '.join(eager)}")
+    if imported > import_budget:
+        failures.append(f"import {imported:.0f} ms > {import_budget:.0f} ms budget")
+    if health > health_budget:
+        failures.append(f"/health {health:.0f} ms > {health_budget:.0f} ms budget")
+
+    print(f"import api   {imported:8.0f} ms   (budget {import_budget:.0f})")
+    print(f"/health      {health:8.0f} ms   (budget {health_budget:.0f})")
+    print(f"ready        {ready:8.0f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
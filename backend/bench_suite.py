@@ -0,0 +1,288 @@
+"""
+backend/bench_suite.py
+----------------------------
+Benchmark the parse pipeline on a synthetic corpus (bench_corpus.py) and
+save the numbers as JSON, so two commits can be compared.
+
+    python bench_suite.py [--docs 40] [--seed 0] [--repeat 3] [--llm-latency 0]
+                          [--only extract,clean_text,dict_to_resume_data,pipeline]
+                          [--corpus DIR] [--out results.json] [--compare old.json]
+
+Benchmarks — each in its own subprocess, so peak RSS is per benchmark:
+    extract[pymupdf]      extract_text_from_pdf, PDF_ENGINE=pymupdf
+    extract[pdfplumber]   extract_text_from_pdf, PDF_ENGINE=pdfplumber
+    clean_text            _clean_text on raw PyMuPDF page text
+    dict_to_resume_data   ResumeExtractor._dict_to_resume_data on LLM-shaped dicts
+    pipeline              ResumePipeline.run end to end, against fake_provider.py
+                          as stub LLM (Groq API) and stub GitHub, over local HTTP
+
+For each: throughput (ops/s, plus pages/s where it applies), p50/p99/mean
+latency and peak RSS. The stub LLM answers after --llm-latency seconds, so
+pipeline numbers are this code's overhead, not a real model's.
+"""
+
+import json
+import os
+import platform
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+BENCHMARKS = ("extract[pymupdf]", "extract[pdfplumber]", "clean_text", "dict_to_resume_data", "pipeline")
+
+
+# ─── Measurement ──────────────────────────────────────────────────────────────
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: list[float], pages: int = 0) -> dict:
+    ordered = sorted(latencies)
+    total = sum(ordered)
+    result = {
+        "n": len(ordered),
+        "ops_per_s": round(len(ordered) / total, 2) if total else None,
+        "p50_ms": round(_percentile(ordered, 50) * 1000, 3),
+        "p99_ms": round(_percentile(ordered, 99) * 1000, 3),
+        "mean_ms": round(total / len(ordered) * 1000, 3),
+    }
+    if pages:
+        result["pages_per_s"] = round(pages / total, 2)
+    return result
+
+
+def _timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+# ─── Benchmarks (child processes) ─────────────────────────────────────────────
+
+def bench_extract(corpus: list, repeat: int) -> dict:
+    from parser import extract_text_from_pdf
+
+    extract_text_from_pdf(corpus[0][1])     # warm-up: imports, font caches
+    latencies, pages = [], 0
+    for _ in range(repeat):
+        for info, data in corpus:
+            latencies.append(_timed(extract_text_from_pdf, data))
+            pages += info.pages
+    return summarize(latencies, pages)
+
+
+def bench_clean_text(corpus: list, repeat: int) -> dict:
+    import fitz
+    from parser import _clean_text
+
+    raws = []
+    for _, data in corpus:
+        with fitz.open(stream=data, filetype="pdf") as doc:
+            raws.append("\n\n".join(page.get_text() for page in doc))
+    latencies = [_timed(_clean_text, raw) for _ in range(repeat * 10) for raw in raws]
+    return summarize(latencies)
+
+
+def bench_dict_to_resume_data(corpus: list, repeat: int) -> dict:
+    from bench_corpus import resume_dict
+    from extractor import ResumeExtractor
+
+    rng = random.Random(0)
+    dicts = [resume_dict(rng, n_jobs=1 + i % 10) for i in range(len(corpus))]
+    extractor = ResumeExtractor()       # LLM_PROVIDER=none: no backend needed
+    latencies = [_timed(extractor._dict_to_resume_data, d) for _ in range(repeat * 100) for d in dicts]
+    return summarize(latencies)
+
+
+def bench_pipeline(corpus: list, repeat: int) -> dict:
+    from pipeline import ResumePipeline
+
+    pipeline = ResumePipeline()
+    latencies, pages = [], 0
+    try:
+        pipeline.run(corpus[0][1])      # warm-up: connection pool, first LLM call
+        for _ in range(repeat):
+            for info, data in corpus:
+                latencies.append(_timed(pipeline.run, data))
+                pages += info.pages
+    finally:
+        pipeline.close()
+    return summarize(latencies, pages)
+
+
+def _run_child(name: str, corpus_dir: str, repeat: int) -> dict:
+    from bench_corpus import load_corpus
+
+    corpus = load_corpus(corpus_dir)
+    rss_before = _peak_rss_mb()
+    fn = {
+        "extract": bench_extract,
+        "clean_text": bench_clean_text,
+        "dict_to_resume_data": bench_dict_to_resume_data,
+        "pipeline": bench_pipeline,
+    }[name.split("[")[0]]
+
+    # The pipeline narrates every step; keep stdout for the result line
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        result = fn(corpus, repeat)
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+    return {**result, "rss_before_mb": rss_before, "peak_rss_mb": _peak_rss_mb()}
+
+
+# ─── Stub server ──────────────────────────────────────────────────────────────
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_stub(llm_latency: float) -> tuple[subprocess.Popen, str]:
+    """fake_provider.py on a free local port; returns (process, base URL)."""
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "fake_provider:app", "--port", str(port), "--log-level", "warning"],
+        cwd=HERE, env={**os.environ, "FAKE_LATENCY": str(llm_latency)},
+    )
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f"{base}/users/ping", timeout=1)
+            return proc, base
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("fake_provider did not start")
+
+
+def _child_env(name: str, stub: str | None) -> dict:
+    env = {
+        **os.environ,
+        "LLM_PROVIDER": "none",
+        "EXTRACTION_CACHE": "none",
+        "GITHUB_CACHE": "none",
+        "PDF_ENGINE": "pdfplumber" if name == "extract[pdfplumber]" else "pymupdf",
+    }
+    env.pop("LLM_BACKENDS", None)
+    if name == "pipeline" and stub:
+        env.update(
+            LLM_PROVIDER="groq",
+            GROQ_API_KEY="bench",
+            GROQ_BASE_URL=f"{stub}/openai/v1",
+            GROQ_RPM="0",
+            GROQ_TPM="0",
+            GITHUB_API_URL=stub,
+            GITHUB_TOKEN="",
+        )
+    return env
+
+
+# ─── Driver ───────────────────────────────────────────────────────────────────
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(["git", *args], cwd=HERE, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(old: dict, new: dict) -> None:
+    print(f"\n{'benchmark':<22} {'p50 old':>10} {'p50 new':>10} {'change':>8}   {'ops/s old':>10} {'ops/s new':>10}")
+    for name, result in new["results"].items():
+        before = old.get("results", {}).get(name)
+        if not before:
+            continue
+        change = (result["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100 if before["p50_ms"] else 0.0
+        print(f"{name:<22} {before['p50_ms']:>10.3f} {result['p50_ms']:>10.3f} {change:>+7.1f}%   "
+              f"{before['ops_per_s'] or 0:>10.2f} {result['ops_per_s'] or 0:>10.2f}")
+
+
+def main(argv: list[str]) -> None:
+    def option(flag: str, default: str) -> str:
+        return argv[argv.index(flag) + 1] if flag in argv else default
+
+    docs, seed = int(option("--docs", "40")), int(option("--seed", "0"))
+    repeat = int(option("--repeat", "3"))
+    llm_latency = float(option("--llm-latency", "0"))
+    wanted = option("--only", "")
+    names = [n for n in BENCHMARKS if not wanted or n.split("[")[0] in wanted.split(",") or n in wanted.split(",")]
+    commit = _git("rev-parse", "--short", "HEAD")
+    out = option("--out", f"bench-{commit or 'results'}.json")
+
+    from bench_corpus import write_corpus
+
+    corpus_dir = option("--corpus", "") or tempfile.mkdtemp(prefix="resume-corpus-")
+    if not (Path(corpus_dir) / "manifest.json").exists():
+        write_corpus(corpus_dir, docs, seed)
+    manifest = json.loads((Path(corpus_dir) / "manifest.json").read_text())
+    print(f"Corpus: {len(manifest['docs'])} PDFs, {sum(d['pages'] for d in manifest['docs'])} pages in {corpus_dir}")
+
+    stub, stub_url = start_stub(llm_latency) if "pipeline" in names else (None, None)
+    results = {}
+    try:
+        for name in names:
+            proc = subprocess.run(
+                [sys.executable, __file__, "--child", name, corpus_dir, str(repeat)],
+                env=_child_env(name, stub_url), cwd=HERE, capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                print(f"{name:<22} FAILED\n{proc.stderr[-2000:]}")
+                continue
+            r = results[name] = json.loads(proc.stdout.strip().splitlines()[-1])
+            pages = f"  {r['pages_per_s']:8.1f} pages/s" if "pages_per_s" in r else ""
+            print(f"{name:<22} p50 {r['p50_ms']:9.3f} ms  p99 {r['p99_ms']:9.3f} ms  "
+                  f"{r['ops_per_s']:10.1f} ops/s{pages}  peak RSS {r['peak_rss_mb']:6.1f} MB")
+    finally:
+        if stub is not None:
+            stub.terminate()
+            stub.wait()
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "docs": len(manifest["docs"]),
+            "pages": sum(d["pages"] for d in manifest["docs"]),
+            "seed": manifest["seed"],
+            "repeat": repeat,
+            "llm_latency_s": llm_latency,
+        },
+        "results": results,
+    }
+    Path(out).write_text(json.dumps(report, indent=2))
+    print(f"Saved {out}")
+
+    if "--compare" in argv:
+        compare(json.loads(Path(option("--compare", "")).read_text()), report)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 4 and sys.argv[1] == "--child":
+        print(json.dumps(_run_child(sys.argv[2], sys.argv[3], int(sys.argv[4]))))
+    else:
+        main(sys.argv[1:])
@@ -0,0 +1,257 @@
+"""
+backend/cache.py
+----------------------
+Content-addressed caches for LLM extraction results.
+
+The same resume gets uploaded again and again (retries, template switches,
+re-uploads after a tiny edit). Caching the extracted JSON by a hash of the
+cleaned text + provider + model + prompt version skips the LLM round-trip.
+
+The stores themselves are generic JSON-dict key/value stores — GitHubEnricher
+reuses them for profiles and ETags (GITHUB_CACHE=...).
+
+Three stores ship out of the box:
+  - MemoryCache  (in-process LRU with TTL)
+  - SQLiteCache  (disk-backed, survives restarts)
+  - TieredCache  (a MemoryCache in front of a SQLiteCache)
+
+Switch via .env:
+  EXTRACTION_CACHE=memory   → in-process LRU (default)
+  EXTRACTION_CACHE=sqlite   → SQLite file at EXTRACTION_CACHE_PATH
+  EXTRACTION_CACHE=tiered   → both: hot entries from memory, the rest from disk
+  EXTRACTION_CACHE=none     → disabled
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from codec import dumps, loads
+
+
+def make_cache_key(*parts: str) -> str:
+    """Stable sha256 over the given parts (NUL-separated so they can't run together)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Base class for extraction caches. Values are plain JSON-able dicts
+    (ResumeData.to_dict()), never live objects — callers mutate the
+    dataclasses they get back, so every hit must hand out a fresh copy.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict | None:
+        value = self._get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: dict) -> None:
+        self._set(key, value)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "size": len(self),
+        }
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def _get(self, key: str) -> dict | None:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: dict) -> None:
+        raise NotImplementedError
+
+
+class MemoryCache(ExtractionCache):
+    """In-process LRU with a per-entry TTL. Thread-safe."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 24 * 3600):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def _get(self, key: str) -> dict | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        return loads(payload)
+
+    def _set(self, key: str, value: dict) -> None:
+        payload = dumps(value)
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, payload)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache(ExtractionCache):
+    """
+    Disk-backed cache in a single SQLite file. Survives restarts. With
+    max_entries, the entries closest to expiry are dropped beyond it.
+    """
+
+    def __init__(
+        self,
+        path: str = ".cache/extraction.sqlite3",
+        ttl_seconds: float = 7 * 24 * 3600,
+        table: str = "extraction_cache",
+        max_entries: int | None = None,
+    ):
+        super().__init__()
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table!r}")
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.table = table
+        self.max_entries = max_entries
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " key TEXT PRIMARY KEY, expires_at REAL NOT NULL, payload TEXT NOT NULL)"
+        )
+        if max_entries:
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_expires ON {table} (expires_at)")
+        self._conn.commit()
+
+    def _get(self, key: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT expires_at, payload FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] < time.time():
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return loads(row[1])
+
+    def _set(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, expires_at, payload) VALUES (?, ?, ?)",
+                (key, time.time() + self.ttl_seconds, dumps(value).decode("utf-8")),
+            )
+            if self.max_entries:
+                self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE key NOT IN"
+                    f" (SELECT key FROM {self.table} ORDER BY expires_at DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class TieredCache(ExtractionCache):
+    """
+    A small MemoryCache in front of a SQLiteCache. Writes go to both; a
+    disk hit is copied into memory, so repeat reads skip SQLite.
+    """
+
+    def __init__(self, memory: MemoryCache, disk: SQLiteCache):
+        super().__init__()
+        self.memory = memory
+        self.disk = disk
+
+    def _get(self, key: str) -> dict | None:
+        value = self.memory._get(key)
+        if value is None:
+            value = self.disk._get(key)
+            if value is not None:
+                self.memory._set(key, value)
+        return value
+
+    def _set(self, key: str, value: dict) -> None:
+        self.memory._set(key, value)
+        self.disk._set(key, value)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "memory_size": len(self.memory)}
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.disk.clear()
+
+    def __len__(self) -> int:
+        return len(self.disk)
+
+
+def cache_from_env(
+    prefix: str = "EXTRACTION_CACHE",
+    default_ttl: float = 24 * 3600,
+    table: str = "extraction_cache",
+) -> ExtractionCache | None:
+    """
+    Build the cache selected by <prefix> (memory | sqlite | tiered | none),
+    reading <prefix>_TTL, <prefix>_SIZE (memory entries), <prefix>_DISK_SIZE
+    (disk entries, default unbounded) and <prefix>_PATH for its settings.
+    """
+    backend = os.environ.get(prefix, "memory").lower()
+    ttl = float(os.environ.get(f"{prefix}_TTL", default_ttl))
+
+    if backend in ("none", "off", ""):
+        return None
+    memory = MemoryCache(
+        max_entries=int(os.environ.get(f"{prefix}_SIZE", 256)),
+        ttl_seconds=ttl,
+    )
+    if backend not in ("sqlite", "tiered"):
+        return memory
+    disk = SQLiteCache(
+        path=os.environ.get(f"{prefix}_PATH", ".cache/extraction.sqlite3"),
+        ttl_seconds=ttl,
+        table=table,
+        max_entries=int(os.environ.get(f"{prefix}_DISK_SIZE", 0)) or None,
+    )
+    return TieredCache(memory, disk) if backend == "tiered" else disk
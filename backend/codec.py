@@ -0,0 +1,238 @@
+"""
+backend/codec.py
+----------------------
+One codec for the data model (ResumeData, GitHubProfile and their parts):
+
+    to_plain(resume_data)            → plain dicts and lists, fresh copies
+    from_plain(ResumeData, data)     → typed objects, coerced on the way in
+    dumps(value) / loads(raw)        → JSON bytes; orjson when it's installed
+
+Both directions are compiled once per dataclass, from its annotations, into
+a straight-line Python function (one dict display / one constructor call,
+no recursion through dataclasses.fields() per object like asdict()).
+
+from_plain() is also the schema check for LLM output. In a single pass it
+coerces the usual mistakes instead of failing:
+    "Python, Go, SQL"   where a list is expected     → ["Python", "Go", "SQL"]
+    null, 2019, 3.8     where a string is expected   → "", "2019", "3.8"
+    ["a", "b"]          where a string is expected   → "a, b"
+    "1,204"             where an int is expected     → 1204
+    {...}               where a list of records is expected → [{...}]
+and drops what can't be used (list items that aren't objects, empty
+strings in string lists, unknown keys).
+"""
+
+import dataclasses
+import json
+import re
+import typing
+from collections.abc import Callable
+
+try:
+    import orjson
+except ImportError:     # optional: pip install orjson
+    orjson = None
+
+
+# ─── Coercion ─────────────────────────────────────────────────────────────────
+
+def _str(value: object) -> str:
+    if value.__class__ is str:
+        return value
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (list, tuple)):
+        return ", ".join(s for s in map(_str, value) if s)
+    if isinstance(value, dict):
+        return ", ".join(s for s in map(_str, value.values()) if s)
+    return str(value)
+
+
+# Newlines and bullets always separate items; commas and semicolons only
+# when every piece is short ("Python, Go" yes, a sentence with a comma no)
+_LINES = re.compile(r"\s*(?:\n|•|·|▪)\s*")
+_ITEMS = re.compile(r"\s*[,;]\s*")
+_MAX_ITEM_WORDS = 3
+
+
+def _split(text: str) -> list[str]:
+    pieces = [p for p in _LINES.split(text.strip()) if p]
+    if len(pieces) == 1:
+        items = [p for p in _ITEMS.split(pieces[0]) if p]
+        if len(items) > 1 and all(item.count(" ") < _MAX_ITEM_WORDS for item in items):
+            return items
+    return pieces
+
+
+def _str_list(value: object) -> list[str]:
+    if value.__class__ is list:
+        for v in value:
+            if v.__class__ is not str or not v:
+                return [s for s in map(_str, value) if s]
+        return value    # already clean: taken over, like the rest of the input
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return _split(value)
+    if isinstance(value, (tuple, set)):
+        return _str_list(list(value))
+    if isinstance(value, dict):
+        return _str_list(list(value.values()))
+    return [_str(value)]
+
+
+def _int(value: object) -> int:
+    if value.__class__ is int:
+        return value
+    try:
+        return int(float(str(value).replace(",", "").strip()))
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
+def _bool(value: object) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "yes", "1")
+    return bool(value)
+
+
+def _records(value: object, decode: Callable) -> list:
+    if value.__class__ is list:
+        return [decode(v) for v in value if v.__class__ is dict]
+    if isinstance(value, dict):
+        return [decode(value)]
+    return []
+
+
+_SCALARS = {int: "_int", bool: "_bool"}
+
+
+# ─── Compiled converters ──────────────────────────────────────────────────────
+
+_encoders: dict[type, Callable[[object], dict]] = {}
+_decoders: dict[type, Callable[[object], object]] = {}
+
+
+def _field_types(cls: type) -> list[tuple[str, object]]:
+    hints = typing.get_type_hints(cls)
+    return [(f.name, hints[f.name]) for f in dataclasses.fields(cls)]
+
+
+def _unwrap_optional(tp: object) -> tuple[object, bool]:
+    args = typing.get_args(tp)
+    if type(None) in args and len(args) == 2:
+        return next(a for a in args if a is not type(None)), True
+    return tp, False
+
+
+def _compile(name: str, source: str, namespace: dict) -> Callable:
+    exec(compile(source, f"<codec {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+def _encoder(cls: type) -> Callable[[object], dict]:
+    encode = _encoders.get(cls)
+    if encode is not None:
+        return encode
+
+    namespace: dict = {}
+    items = []
+    for i, (name, tp) in enumerate(_field_types(cls)):
+        tp, optional = _unwrap_optional(tp)
+        value = f"o.{name}"
+        if dataclasses.is_dataclass(tp):
+            namespace[f"e{i}"] = _encoder(tp)
+            expr = f"e{i}({value})"
+            if optional:
+                expr = f"None if {value} is None else {expr}"
+        elif typing.get_origin(tp) is list:
+            (item,) = typing.get_args(tp)
+            if dataclasses.is_dataclass(item):
+                namespace[f"e{i}"] = _encoder(item)
+                expr = f"[e{i}(x) for x in {value}]"
+            else:
+                expr = f"list({value})"
+        else:
+            expr = value
+        items.append(f"{name!r}: {expr}")
+
+    source = f"def encode(o):\n    return {{{', '.join(items)}}}"
+    encode = _encoders[cls] = _compile("encode", source, namespace)
+    return encode
+
+
+def _decoder(cls: type) -> Callable[[object], object]:
+    decode = _decoders.get(cls)
+    if decode is not None:
+        return decode
+
+    namespace: dict = {"cls": cls, "_str": _str, "_int": _int, "_bool": _bool,
+                       "_str_list": _str_list, "_records": _records}
+    args = []
+    for i, (name, tp) in enumerate(_field_types(cls)):
+        tp, optional = _unwrap_optional(tp)
+        value = f"get({name!r})"
+        if dataclasses.is_dataclass(tp):
+            namespace[f"d{i}"] = _decoder(tp)
+            expr = f"None if (v := {value}) is None else d{i}(v)" if optional else f"d{i}({value})"
+        elif typing.get_origin(tp) is list:
+            (item,) = typing.get_args(tp)
+            if dataclasses.is_dataclass(item):
+                namespace[f"d{i}"] = _decoder(item)
+                expr = f"_records({value}, d{i})"
+            else:
+                expr = f"_str_list({value})"
+        elif tp is str:
+            # The common case — already a string — skips the function call
+            expr = f"v if (v := {value}).__class__ is str else _str(v)"
+        elif tp in _SCALARS:
+            expr = f"{_SCALARS[tp]}({value})"
+        else:
+            expr = value
+        args.append(expr)     # positional, in field order
+
+    source = (
+        "def decode(d):\n"
+        "    if d.__class__ is not dict:\n"
+        "        return cls()\n"
+        "    get = d.get\n"
+        f"    return cls({', '.join(args)})"
+    )
+    decode = _decoders[cls] = _compile("decode", source, namespace)
+    return decode
+
+
+# ─── Public API ───────────────────────────────────────────────────────────────
+
+def to_plain(obj: object) -> dict | None:
+    """A dataclass instance as plain dicts/lists (lists are copies, safe to mutate), or None."""
+    if obj is None:
+        return None
+    return _encoder(type(obj))(obj)
+
+
+T = typing.TypeVar("T")
+
+
+def from_plain(cls: type[T], data: object) -> T:
+    """
+    Build `cls` from JSON-shaped data, coercing field types; never raises on
+    bad shapes. Values that are already the right type are used as they are,
+    not copied — pass data you own (a fresh loads() or cache hit).
+    """
+    return _decoder(cls)(data)
+
+
+def dumps(value: object) -> bytes:
+    """Compact UTF-8 JSON. Dataclasses are encoded with to_plain()."""
+    if orjson is not None:
+        return orjson.dumps(value, default=to_plain)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=to_plain).encode("utf-8")
+
+
+def loads(raw: str | bytes) -> object:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
@@ -8,72 +8,33 @@ Extracts structured data from raw resume text using either:
 Switch via .env:
   LLM_PROVIDER=ollama   → uses Ollama (default)
   LLM_PROVIDER=groq     → uses Groq API (set GROQ_API_KEY too)
+  LLM_PROVIDER=none     → rule-based contact + skills only (see rules.py), no LLM
 """
 
+import asyncio
 import json
 import re
 import os
 import httpx
-from dataclasses import dataclass, field, asdict
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
 
-
-# ─── Data Models ─────────────────────────────────────────────────────────────
-
-@dataclass
-class ContactInfo:
-    name: str = ""
-    email: str = ""
-    phone: str = ""
-    location: str = ""
-    linkedin: str = ""
-    github: str = ""
-    website: str = ""
-
-
-@dataclass
-class Experience:
-    company: str = ""
-    role: str = ""
-    duration: str = ""
-    location: str = ""
-    highlights: list[str] = field(default_factory=list)
-
-
-@dataclass
-class Project:
-    name: str = ""
-    description: str = ""
-    tech_stack: list[str] = field(default_factory=list)
-    url: str = ""
-    github_url: str = ""
-
-
-@dataclass
-class Education:
-    institution: str = ""
-    degree: str = ""
-    field_of_study: str = ""
-    graduation_year: str = ""
-    gpa: str = ""
-
-
-@dataclass
-class ResumeData:
-    contact: ContactInfo = field(default_factory=ContactInfo)
-    summary: str = ""
-    skills: list[str] = field(default_factory=list)
-    experience: list[Experience] = field(default_factory=list)
-    projects: list[Project] = field(default_factory=list)
-    education: list[Education] = field(default_factory=list)
-    certifications: list[str] = field(default_factory=list)
-    languages: list[str] = field(default_factory=list)
-
-    def to_dict(self) -> dict:
-        return asdict(self)
+from cache import ExtractionCache, make_cache_key
+from codec import from_plain
+from json_stream import SectionParser
+from llm_router import LLMRouter
+from models import ResumeData
+from rules import extract_rule_based, extract_rule_based_full
+from sections import SECTION_GROUPS, Chunk, changed_sections, plan_chunks, section_texts
+from tokens import TokenMeter
 
 
 # ─── Prompts ──────────────────────────────────────────────────────────────────
 
+# Bump whenever the prompts or schema below change — it's part of the
+# extraction cache key, so old cached results are ignored automatically.
+PROMPT_VERSION = "4"
+
 EXTRACTION_SYSTEM_PROMPT = """You are an expert resume parser. Extract structured information from resume text and return it as valid JSON.
 
 Rules:
@@ -135,6 +96,180 @@ Resume text:
 {resume_text}
 ---"""
 
+# Per-section schemas for chunked extraction (see sections.py): each chunk
+# only asks for the sections its text can contain.
+SECTION_SCHEMAS: dict[str, object] = {
+    "contact": {
+        "name": "", "email": "", "phone": "", "location": "",
+        "linkedin": "", "github": "", "website": "",
+    },
+    "summary": "",
+    "skills": [],
+    "experience": [{"company": "", "role": "", "duration": "", "location": "", "highlights": []}],
+    "projects": [{"name": "", "description": "", "tech_stack": [], "url": "", "github_url": ""}],
+    "education": [{
+        "institution": "", "degree": "", "field_of_study": "", "graduation_year": "", "gpa": "",
+    }],
+    "certifications": [],
+    "languages": [],
+}
+
+# Used instead of EXTRACTION_USER_PROMPT whenever only some sections are
+# wanted — a chunk of a long resume, or what the rule-based pass couldn't fill
+SUBSET_USER_PROMPT = """Extract structured data from this resume text and return a JSON object matching EXACTLY this schema:
+
+{schema}
+
+Resume text:
+---
+{resume_text}
+---"""
+
+# Single-prompt mode keeps at most this much text
+MAX_SINGLE_PROMPT_CHARS = 12000
+
+
+# ─── Compact prompt style ─────────────────────────────────────────────────────
+# EXTRACTION_PROMPT_STYLE=compact sends a minified schema with short keys and
+# asks the model to omit empty fields, cutting both prompt and output tokens.
+# Short keys are unique across all nesting levels, so one map expands them.
+
+SHORT_KEYS: dict[str, str] = {
+    "contact": "c", "name": "n", "email": "e", "phone": "p", "location": "l",
+    "linkedin": "li", "github": "gh", "website": "w",
+    "summary": "s", "skills": "sk",
+    "experience": "x", "company": "co", "role": "r", "duration": "d", "highlights": "h",
+    "projects": "pr", "description": "de", "tech_stack": "ts", "url": "u", "github_url": "gu",
+    "education": "ed", "institution": "i", "degree": "dg", "field_of_study": "f",
+    "graduation_year": "y", "gpa": "g",
+    "certifications": "ce", "languages": "la",
+}
+LONG_KEYS: dict[str, str] = {short: long for long, short in SHORT_KEYS.items()}
+
+COMPACT_SYSTEM_PROMPT = """You are an expert resume parser. Return valid JSON only, no markdown.
+Rules: extract only what is explicitly present; never invent data. Use exactly the short keys in the schema. Omit any field or section that is empty. Skills: flat list of individual skills. Keep bullet wording. Dates as "Mon YYYY"."""
+
+COMPACT_USER_PROMPT = """Schema (keys: {legend}):
+{schema}
+Resume:
+{resume_text}"""
+
+
+def compact_text(text: str) -> str:
+    """Drop redundant whitespace: runs of spaces/tabs, trailing spaces, blank-line runs."""
+    text = re.sub(r"[ \t\f\v]+", " ", text)
+    text = re.sub(r" ?\n ?", "\n", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def _shorten(schema: object) -> object:
+    if isinstance(schema, dict):
+        return {SHORT_KEYS.get(k, k): _shorten(v) for k, v in schema.items()}
+    if isinstance(schema, list):
+        return [_shorten(v) for v in schema]
+    return schema
+
+
+def expand_keys(data: object) -> object:
+    """Map short keys in an LLM response back to the full field names."""
+    if isinstance(data, dict):
+        return {LONG_KEYS.get(k, k): expand_keys(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [expand_keys(v) for v in data]
+    return data
+
+
+def _legend(schema: object, keys: dict[str, str]) -> None:
+    if isinstance(schema, dict):
+        for k, v in schema.items():
+            keys[SHORT_KEYS.get(k, k)] = k
+            _legend(v, keys)
+    elif isinstance(schema, list):
+        for v in schema:
+            _legend(v, keys)
+
+
+def compact_prompt(resume_text: str, wanted: dict | None = None) -> str:
+    """User prompt in the compact style for the given (long-keyed) schema."""
+    wanted = wanted if wanted is not None else SECTION_SCHEMAS
+    keys: dict[str, str] = {}
+    _legend(wanted, keys)
+    return COMPACT_USER_PROMPT.format(
+        legend=",".join(f"{short}={long}" for short, long in keys.items() if short != long),
+        schema=json.dumps(_shorten(wanted), separators=(",", ":")),
+        resume_text=resume_text,
+    )
+
+
+# ─── Chunk merging ────────────────────────────────────────────────────────────
+
+# Fields that identify one record when chunk results are merged
+_RECORD_KEYS: dict[str, tuple[str, ...]] = {
+    "experience": ("company", "role"),
+    "projects": ("name",),
+    "education": ("institution", "degree"),
+}
+
+
+def _merge_records(records: list, identity: tuple[str, ...]) -> list:
+    """
+    Fold records with the same identity (case-insensitive) into the first
+    one: empty strings are filled in, lists are joined without duplicates.
+    Records with no identity at all are kept as they are.
+    """
+    merged: list = []
+    by_identity: dict[tuple[str, ...], dict] = {}
+    for record in records:
+        if not isinstance(record, dict):
+            merged.append(record)
+            continue
+        marker = tuple(str(record.get(f) or "").strip().lower() for f in identity)
+        target = by_identity.get(marker) if any(marker) else None
+        if target is None:
+            record = dict(record)
+            merged.append(record)
+            if any(marker):
+                by_identity[marker] = record
+            continue
+        for field_name, value in record.items():
+            current = target.get(field_name)
+            if isinstance(current, list) and isinstance(value, list):
+                target[field_name] = current + [v for v in value if v not in current]
+            elif value and not current:
+                target[field_name] = value
+    return merged
+
+
+# ─── Rule-based fallbacks ─────────────────────────────────────────────────────
+
+# Rule results that are guesses rather than exact patterns: the LLM is still
+# asked for them, and its answer wins
+_FALLBACK_CONTACT = ("name",)
+_FALLBACK_SECTIONS = ("skills",)
+
+
+def _around_prefill(prefilled: dict, parts: list[dict]) -> list[dict]:
+    """
+    Merge order for _merge_chunks: pattern-matched contact fields first (they
+    win), then the LLM's parts, then the rule-based name and dictionary
+    skills. A dictionary skill that is a word of one the LLM gave ("Phoenix"
+    in "Phoenix LiveView") is dropped rather than listed twice.
+    """
+    if not prefilled:
+        return parts
+    exact = {key: value for key, value in prefilled.items() if key not in _FALLBACK_SECTIONS}
+    contact = dict(prefilled.get("contact", {}))
+    fallback = {"contact": {f: contact.pop(f) for f in _FALLBACK_CONTACT if f in contact}}
+    exact["contact"] = contact
+
+    found = [str(s).lower() for part in parts for s in part.get("skills") or [] if s]
+    fallback["skills"] = [
+        skill for skill in prefilled.get("skills", [])
+        if not any(re.search(rf"(?<!\w){re.escape(skill.lower())}(?!\w)", s) for s in found)
+    ]
+    return [exact, *parts, fallback]
+
 
 # ─── Extractor ────────────────────────────────────────────────────────────────
 
@@ -145,88 +280,409 @@ class ResumeExtractor:
     Provider is selected via LLM_PROVIDER env var:
         LLM_PROVIDER=ollama  →  local Ollama (default)
         LLM_PROVIDER=groq    →  Groq cloud API (fast, free tier)
+        LLM_PROVIDER=none    →  rule-based extraction only (milliseconds)
+
+    LLM_BACKENDS lists several backends instead (Groq, Ollama hosts, any
+    OpenAI-compatible server); calls then go to the fastest healthy one.
+
+    Email, phone and profile links are pattern-matched first (rules.py) and
+    left out of the LLM schema when found; the rule-based name and dictionary
+    skills only fill in what the LLM leaves out. EXTRACTION_PREFILL=0 disables it.
 
     Usage:
         extractor = ResumeExtractor()
         data = extractor.extract(raw_text)
+
+    Pass a cache (see cache.py) to skip the LLM for text it has already seen,
+    and a pooled httpx.Client (see http_pool.py) to reuse connections.
     """
 
-    def __init__(self):
+    def __init__(self, cache: ExtractionCache | None = None, client: httpx.Client | None = None):
+        self.cache = cache
+        self.client = client
         self.provider = os.environ.get("LLM_PROVIDER", "ollama").lower()
+        self.prefill = os.environ.get("EXTRACTION_PREFILL", "1") not in ("0", "false", "no")
+        self.compact = os.environ.get("EXTRACTION_PROMPT_STYLE", "verbose").lower() == "compact"
+        self.tokens = TokenMeter()
 
-        if self.provider == "groq":
-            self.api_key = os.environ.get("GROQ_API_KEY", "")
-            self.model = os.environ.get("GROQ_MODEL", "llama-3.1-8b-instant")
-            if not self.api_key:
-                raise ValueError("GROQ_API_KEY is not set. Add it to your .env file.")
+        if self.provider == "none":
+            self.model = "rules"
+            self.router = LLMRouter([])
         else:
-            # Default: Ollama
-            self.provider = "ollama"
-            self.model = os.environ.get("OLLAMA_MODEL", "llama3.1")
-            self.base_url = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
+            # One or more backends, routed by latency with failover (see llm_router.py)
+            self.router = LLMRouter.from_env(self.tokens)
+            backends = self.router.backends
+            if len(backends) == 1:
+                self.provider, self.model = backends[0].kind, backends[0].model
+            else:
+                self.provider = "router"
+                self.model = ",".join(f"{b.name}:{b.model}" for b in backends)
 
         print(f"[LLM] Provider: {self.provider} | Model: {self.model}")
 
     def extract(self, resume_text: str) -> ResumeData:
         """Main entry point. Takes raw resume text, returns a ResumeData object."""
+        resume_text, cache_key, cached = self._prepare(resume_text)
+        if cached is not None:
+            return cached
+
+        prefilled, wanted = self._prefill(resume_text)
+        if not wanted:
+            return self._finish_chunks([], cache_key, prefilled)
+
+        chunks = self._plan(resume_text, wanted)
+        if chunks:
+            # One shorter generation per section, all in flight at once
+            prompts = [self._chunk_prompt(c, wanted) for c in chunks]
+            with ThreadPoolExecutor(max_workers=len(chunks), thread_name_prefix="llm") as pool:
+                raws = list(pool.map(self._complete, prompts))
+            return self._finish_chunks(raws, cache_key, prefilled)
+
+        raw_json = self._complete(self._single_prompt(resume_text, wanted))
+        return self._finish_chunks([raw_json], cache_key, prefilled)
+
+    async def extract_async(self, resume_text: str, client: httpx.AsyncClient) -> ResumeData:
+        """Same as extract(), but awaits the LLM on a shared httpx.AsyncClient."""
+        resume_text, cache_key, cached = self._prepare(resume_text)
+        if cached is not None:
+            return cached
+
+        prefilled, wanted = self._prefill(resume_text)
+        if not wanted:
+            return self._finish_chunks([], cache_key, prefilled)
+
+        chunks = self._plan(resume_text, wanted)
+        if chunks:
+            raws = await asyncio.gather(
+                *(self._complete_async(client, self._chunk_prompt(c, wanted)) for c in chunks)
+            )
+            return self._finish_chunks(list(raws), cache_key, prefilled)
+
+        raw_json = await self._complete_async(client, self._single_prompt(resume_text, wanted))
+        return self._finish_chunks([raw_json], cache_key, prefilled)
+
+    async def extract_stream(
+        self, resume_text: str, client: httpx.AsyncClient
+    ) -> AsyncIterator[tuple[str, object]]:
+        """
+        Streaming variant of extract_async. Yields (section, value) as soon as
+        each top-level section of the JSON ("contact", "skills", ...) has been
+        generated, then ("resume", ResumeData) once the document is complete.
+        Sections the rule-based pass filled completely are yielded first.
+        """
+        resume_text, cache_key, cached = self._prepare(resume_text)
+        if cached is not None:
+            for key, value in cached.to_dict().items():
+                yield key, value
+            yield "resume", cached
+            return
+
+        prefilled, wanted = self._prefill(resume_text)
+        for key, value in prefilled.items():
+            if key not in wanted:
+                yield key, self._normalize_section(key, value)
+        if not wanted:
+            yield "resume", self._finish_chunks([], cache_key, prefilled)
+            return
+
+        chunks = self._plan(resume_text, wanted)
+        if chunks:
+            async for item in self._stream_chunks(client, chunks, wanted, cache_key, prefilled):
+                yield item
+            return
+
+        parser = SectionParser()
+        pieces: list[str] = []
+        async for piece in self._stream(client, self._single_prompt(resume_text, wanted)):
+            pieces.append(piece)
+            for key, value in parser.feed(piece):
+                if self.compact:
+                    key, value = LONG_KEYS.get(key, key), expand_keys(value)
+                if key in prefilled:
+                    value = self._merge_chunks(_around_prefill(prefilled, [{key: value}])).get(key, value)
+                yield key, self._normalize_section(key, value)
+
+        yield "resume", self._finish_chunks(["".join(pieces)], cache_key, prefilled)
+
+    async def _stream_chunks(
+        self,
+        client: httpx.AsyncClient,
+        chunks: list[Chunk],
+        wanted: dict,
+        cache_key: str,
+        prefilled: dict,
+    ) -> AsyncIterator[tuple[str, object]]:
+        """Chunked streaming: emit a section once every chunk that covers it is done."""
+        async def run_chunk(i: int, chunk: Chunk) -> tuple[int, str]:
+            return i, await self._complete_async(client, self._chunk_prompt(chunk, wanted))
+
+        tasks = [asyncio.ensure_future(run_chunk(i, c)) for i, c in enumerate(chunks)]
+        pending = {key: sum(key in c.sections for c in chunks) for key in SECTION_SCHEMAS}
+        raws: list[str | None] = [None] * len(chunks)
+        try:
+            for done in asyncio.as_completed(tasks):
+                i, raws[i] = await done
+                for key in chunks[i].sections:
+                    pending[key] -= 1
+                    if pending[key] == 0:
+                        merged = self._merge_chunks(_around_prefill(prefilled, [
+                            self._decode(r)
+                            for r, c in zip(raws, chunks) if r is not None and key in c.sections
+                        ]))
+                        value = merged.get(key, ResumeData().to_dict()[key])
+                        yield key, self._normalize_section(key, value)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        yield "resume", self._finish_chunks(raws, cache_key, prefilled)
+
+    def _normalize_section(self, key: str, value: object) -> object:
+        """Run one section through the same mapping as the full document."""
+        try:
+            return self._dict_to_resume_data({key: value}).to_dict().get(key, value)
+        except (AttributeError, TypeError):
+            return value
+
+    def _prepare(self, resume_text: str) -> tuple[str, str, ResumeData | None]:
+        """Validate + compact the text and look it up in the cache."""
         if not resume_text.strip():
             raise ValueError("Resume text is empty — PDF extraction may have failed.")
 
-        # Truncate very long resumes
-        if len(resume_text) > 12000:
-            resume_text = resume_text[:12000] + "\n[truncated...]"
-
-        if self.provider == "groq":
-            raw_json = self._call_groq(resume_text)
-        else:
-            raw_json = self._call_ollama(resume_text)
-
-        parsed = self._parse_response(raw_json)
-        return self._dict_to_resume_data(parsed)
-
-    # ─── Provider: Ollama ─────────────────────────────────────────────────────
-
-    def _call_ollama(self, resume_text: str) -> str:
-        """Send resume text to local Ollama and get back a JSON string."""
-        prompt = EXTRACTION_SYSTEM_PROMPT + "\n\n" + EXTRACTION_USER_PROMPT.format(
-            resume_text=resume_text
+        # Whitespace runs cost tokens and carry no meaning for the model
+        resume_text = compact_text(resume_text)
+
+        cache_key = self._cache_key(resume_text)
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return resume_text, cache_key, self._dict_to_resume_data(cached)
+        return resume_text, cache_key, None
+
+    def _finish_chunks(self, raws: list[str], cache_key: str, prefilled: dict) -> ResumeData:
+        """Parse every LLM output, merge them with the rule-based prefill, and cache."""
+        merged = self._merge_chunks(_around_prefill(prefilled, [self._decode(raw) for raw in raws]))
+        return self._store(self._dict_to_resume_data(merged), cache_key)
+
+    def _store(self, resume_data: ResumeData, cache_key: str) -> ResumeData:
+        if self.cache is not None:
+            self.cache.set(cache_key, resume_data.to_dict())
+        return resume_data
+
+    def _cache_key(self, resume_text: str) -> str:
+        """Content address: cleaned text + provider + model + prompt version."""
+        return make_cache_key(
+            resume_text, self.provider, self.model, PROMPT_VERSION,
+            "prefill" if self.prefill else "", "compact" if self.compact else "",
         )
-        response = httpx.post(
-            f"{self.base_url}/api/generate",
-            json={
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "format": "json",   # forces Ollama to output valid JSON
-            },
-            timeout=300,            # local models can be slow
-        )
-        response.raise_for_status()
-        return response.json()["response"]
-
-    # ─── Provider: Groq ───────────────────────────────────────────────────────
-
-    def _call_groq(self, resume_text: str) -> str:
-        """Send resume text to Groq cloud API and get back a JSON string."""
-        response = httpx.post(
-            "https://api.groq.com/openai/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
-                    {"role": "user", "content": EXTRACTION_USER_PROMPT.format(resume_text=resume_text)},
-                ],
-                "response_format": {"type": "json_object"},  # forces valid JSON
-                "temperature": 0.1,   # low temp = more deterministic extraction
-            },
-            timeout=30,              # Groq is fast, 30s is plenty
+
+    # ─── Incremental re-extraction ────────────────────────────────────────────
+
+    def extract_incremental(self, resume_text: str, previous_text: str, previous: ResumeData) -> ResumeData:
+        """
+        Re-extract a new version of a resume we already parsed: only the
+        sections whose text changed go to the LLM, the rest are copied from
+        `previous`. Falls back to extract() when there are no headings to diff.
+        """
+        resume_text, cache_key, cached = self._prepare(resume_text)
+        if cached is not None:
+            return cached
+
+        plan = self._plan_incremental(resume_text, previous_text, previous)
+        if plan is None:
+            return self.extract(resume_text)
+
+        base, keys, chunks, prefilled, wanted = plan
+        prompts = [self._chunk_prompt(c, wanted) for c in chunks]
+        raws = []
+        if prompts:
+            with ThreadPoolExecutor(max_workers=len(prompts), thread_name_prefix="llm") as pool:
+                raws = list(pool.map(self._complete, prompts))
+        return self._finish_incremental(base, keys, raws, cache_key, prefilled)
+
+    async def extract_incremental_async(
+        self, resume_text: str, previous_text: str, previous: ResumeData, client: httpx.AsyncClient
+    ) -> ResumeData:
+        """Same as extract_incremental(), awaiting the LLM on a shared httpx.AsyncClient."""
+        resume_text, cache_key, cached = self._prepare(resume_text)
+        if cached is not None:
+            return cached
+
+        plan = self._plan_incremental(resume_text, previous_text, previous)
+        if plan is None:
+            return await self.extract_async(resume_text, client)
+
+        base, keys, chunks, prefilled, wanted = plan
+        raws = await asyncio.gather(
+            *(self._complete_async(client, self._chunk_prompt(c, wanted)) for c in chunks)
         )
-        response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"]
+        return self._finish_incremental(base, keys, list(raws), cache_key, prefilled)
+
+    def _plan_incremental(
+        self, resume_text: str, previous_text: str, previous: ResumeData
+    ) -> tuple[dict, set[str], list[Chunk], dict, dict] | None:
+        """
+        Work out what to re-extract. Returns (previous sections with the
+        changed ones blanked, changed schema keys, chunks for the LLM,
+        rule-based values for changed keys, wanted schema), or None when a
+        full extraction is needed.
+        """
+        changed = changed_sections(compact_text(previous_text), resume_text)
+        if changed is None or len(changed) == len(SECTION_GROUPS):
+            return None
+
+        keys = {key for group in changed for key in SECTION_GROUPS[group]}
+        base = previous.to_dict()
+        empty = ResumeData().to_dict()
+        for key in keys:
+            base[key] = empty[key]
+
+        prefilled, wanted = self._prefill(resume_text)
+        texts = section_texts(resume_text)
+        chunks = []
+        for group in changed:
+            sections = tuple(key for key in SECTION_GROUPS[group] if key in wanted)
+            if group in texts and sections:
+                chunks.append(Chunk(sections, texts[group]))
+
+        print(f"[LLM] Incremental: {len(changed)} changed section(s) {changed or ''} — "
+              f"{len(chunks)} LLM call(s), reusing the rest")
+        return base, keys, chunks, {k: v for k, v in prefilled.items() if k in keys}, wanted
+
+    def _finish_incremental(
+        self, base: dict, keys: set[str], raws: list[str], cache_key: str, prefilled: dict
+    ) -> ResumeData:
+        """Overlay the re-extracted sections on the reused ones, and cache."""
+        merged = self._merge_chunks(_around_prefill(prefilled, [self._decode(raw) for raw in raws]))
+        for key in keys:
+            if key in merged:
+                base[key] = merged[key]
+        return self._store(self._dict_to_resume_data(base), cache_key)
+
+    # ─── Rule-based prefill ───────────────────────────────────────────────────
+
+    def _prefill(self, resume_text: str) -> tuple[dict, dict]:
+        """
+        Run the pattern-based pass and work out what's left for the LLM.
+        Returns (prefilled sections, schema of the sections still wanted);
+        contact is narrowed to the fields the patterns couldn't find. The
+        name and skills are always asked for: a heuristic name or dictionary
+        skills are only a fallback (see _around_prefill).
+        """
+        if self.provider == "none":
+            return extract_rule_based_full(resume_text), {}
+        if not self.prefill:
+            return {}, dict(SECTION_SCHEMAS)
+
+        prefilled = extract_rule_based(resume_text)
+        wanted = {
+            key: schema for key, schema in SECTION_SCHEMAS.items()
+            if key not in prefilled or key in _FALLBACK_SECTIONS
+        }
+        missing = {
+            f: "" for f, value in prefilled["contact"].items()
+            if not value or f in _FALLBACK_CONTACT
+        }
+        if missing:
+            wanted = {"contact": missing, **wanted}
+        return prefilled, wanted
+
+    # ─── Chunking ─────────────────────────────────────────────────────────────
+
+    def _plan(self, resume_text: str, wanted: dict) -> list[Chunk]:
+        """
+        Chunks to extract concurrently, or [] for a single prompt.
+        EXTRACTION_CHUNKING: auto (chunk long resumes, default) | always | off
+        """
+        mode = os.environ.get("EXTRACTION_CHUNKING", "auto").lower()
+        threshold = int(os.environ.get("EXTRACTION_CHUNK_THRESHOLD", 6000))
+        if mode == "off" or (mode == "auto" and len(resume_text) <= threshold):
+            return []
+
+        chunks = []
+        for chunk in plan_chunks(resume_text, max_chars=threshold):
+            sections = tuple(key for key in chunk.sections if key in wanted)
+            if sections:
+                chunks.append(Chunk(sections, chunk.text))
+        return chunks
+
+    def _single_prompt(self, resume_text: str, wanted: dict) -> str:
+        # Only reached when chunking is off or found no headings
+        if len(resume_text) > MAX_SINGLE_PROMPT_CHARS:
+            resume_text = resume_text[:MAX_SINGLE_PROMPT_CHARS] + "\n[truncated...]"
+        if self.compact:
+            return compact_prompt(resume_text, wanted)
+        if wanted == SECTION_SCHEMAS:
+            return EXTRACTION_USER_PROMPT.format(resume_text=resume_text)
+        schema = json.dumps(wanted, indent=2)
+        return SUBSET_USER_PROMPT.format(schema=schema, resume_text=resume_text)
+
+    def _chunk_prompt(self, chunk: Chunk, wanted: dict) -> str:
+        if self.compact:
+            return compact_prompt(chunk.text, {key: wanted[key] for key in chunk.sections})
+        schema = json.dumps({key: wanted[key] for key in chunk.sections}, indent=2)
+        return SUBSET_USER_PROMPT.format(schema=schema, resume_text=chunk.text)
+
+    def _system_prompt(self) -> str:
+        return COMPACT_SYSTEM_PROMPT if self.compact else EXTRACTION_SYSTEM_PROMPT
+
+    def _decode(self, raw: str) -> dict:
+        """Parse an LLM response, expanding short keys in compact mode."""
+        parsed = self._parse_response(raw)
+        return expand_keys(parsed) if self.compact else parsed
+
+    def _merge_chunks(self, parts: list[dict]) -> dict:
+        """
+        Combine per-chunk results into one document: contact fields and the
+        summary take the first non-empty value, lists are concatenated, and
+        flat string lists (skills, languages, ...) are de-duplicated. Records
+        for the same job, project or degree from different chunks are merged
+        into one (see _merge_records).
+        """
+        merged: dict = {}
+        for part in parts:
+            for key, value in part.items():
+                if key == "contact" and isinstance(value, dict):
+                    contact = merged.setdefault("contact", {})
+                    for field_name, field_value in value.items():
+                        if field_value and not contact.get(field_name):
+                            contact[field_name] = field_value
+                elif isinstance(value, list):
+                    merged.setdefault(key, []).extend(value)
+                elif value and not merged.get(key):
+                    merged[key] = value
+
+        for key in ("skills", "certifications", "languages"):
+            if key in merged:
+                seen: set[str] = set()
+                unique = []
+                for item in merged[key]:
+                    marker = str(item).strip().lower()
+                    if marker and marker not in seen:
+                        seen.add(marker)
+                        unique.append(item)
+                merged[key] = unique
+        for key, identity in _RECORD_KEYS.items():
+            if isinstance(merged.get(key), list):
+                merged[key] = _merge_records(merged[key], identity)
+        return merged
+
+    # ─── Provider dispatch ────────────────────────────────────────────────────
+
+    def _complete(self, user_prompt: str) -> str:
+        return self.router.complete(self._post, self._system_prompt(), user_prompt, self._parse_response)
+
+    async def _complete_async(self, client: httpx.AsyncClient, user_prompt: str) -> str:
+        return await self.router.complete_async(client, self._system_prompt(), user_prompt, self._parse_response)
+
+    def _stream(self, client: httpx.AsyncClient, user_prompt: str) -> AsyncIterator[str]:
+        return self.router.stream(client, self._system_prompt(), user_prompt)
+
+    def _post(self, url: str, **kwargs) -> httpx.Response:
+        """POST on the shared client if we have one, else a one-off connection."""
+        if self.client is not None:
+            return self.client.post(url, **kwargs)
+        return httpx.post(url, **kwargs)
 
     # ─── Shared helpers ───────────────────────────────────────────────────────
 
@@ -243,58 +699,5 @@ class ResumeExtractor:
             raise ValueError(f"LLM returned invalid JSON: {e}\n\nRaw response:\n{raw}")
 
     def _dict_to_resume_data(self, data: dict) -> ResumeData:
-        """Map raw dict to typed ResumeData dataclass."""
-        contact_raw = data.get("contact", {})
-        contact = ContactInfo(
-            name=contact_raw.get("name", ""),
-            email=contact_raw.get("email", ""),
-            phone=contact_raw.get("phone", ""),
-            location=contact_raw.get("location", ""),
-            linkedin=contact_raw.get("linkedin", ""),
-            github=contact_raw.get("github", ""),
-            website=contact_raw.get("website", ""),
-        )
-
-        experience = [
-            Experience(
-                company=e.get("company", ""),
-                role=e.get("role", ""),
-                duration=e.get("duration", ""),
-                location=e.get("location", ""),
-                highlights=e.get("highlights", []),
-            )
-            for e in data.get("experience", [])
-        ]
-
-        projects = [
-            Project(
-                name=p.get("name", ""),
-                description=p.get("description", ""),
-                tech_stack=p.get("tech_stack", []),
-                url=p.get("url", ""),
-                github_url=p.get("github_url", ""),
-            )
-            for p in data.get("projects", [])
-        ]
-
-        education = [
-            Education(
-                institution=e.get("institution", ""),
-                degree=e.get("degree", ""),
-                field_of_study=e.get("field_of_study", ""),
-                graduation_year=e.get("graduation_year", ""),
-                gpa=e.get("gpa", ""),
-            )
-            for e in data.get("education", [])
-        ]
-
-        return ResumeData(
-            contact=contact,
-            summary=data.get("summary", ""),
-            skills=data.get("skills", []),
-            experience=experience,
-            projects=projects,
-            education=education,
-            certifications=data.get("certifications", []),
-            languages=data.get("languages", []),
-        )
+        """Map raw dict to typed ResumeData, coercing bad LLM types (see codec.py)."""
+        return from_plain(ResumeData, data)
@@ -0,0 +1,210 @@
+"""
+backend/fake_provider.py
+------------------------------
+A local stand-in for Groq (OpenAI-style chat completions), Ollama
+(/api/generate) and the GitHub REST API, for exercising rate limiting,
+retries and the circuit breaker — and for benchmarking the pipeline
+(bench_suite.py) — without a real provider or API key.
+
+Run:
+    uvicorn fake_provider:app --port 9000
+
+Then point the backend at it:
+    GROQ_BASE_URL=http://localhost:9000/openai/v1  GROQ_API_KEY=fake
+    OLLAMA_BASE_URL=http://localhost:9000
+    GITHUB_API_URL=http://localhost:9000   GITHUB_TOKEN=
+
+Failure injection (env vars, read per request):
+    FAKE_LATENCY=0.5        seconds before answering
+    FAKE_FAIL_RATE=0.2      share of requests answered with a 503
+    FAKE_RPM=30             requests per minute before 429 + retry-after
+    FAKE_DOWN=1             every request fails with 503
+
+GitHub routes are never throttled or failed. They answer like the real API
+for the enricher's cache paths: an ETag on every REST response, 304 for a
+matching If-None-Match, X-RateLimit-* headers, and POST /graphql:
+    FAKE_GITHUB_REMAINING=5000  X-RateLimit-Remaining on every response
+    FAKE_GITHUB_RESET=3600      seconds until X-RateLimit-Reset
+    FAKE_GITHUB_MISSING=ghost   logins that 404 / come back NOT_FOUND
+Requests are recorded in `github_requests` as (method, path, status).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+
+app = FastAPI(title="Fake LLM provider")
+
+SAMPLE_RESUME = {
+    "contact": {"name": "Jane Doe", "email": "jane@example.com", "phone": "", "location": "",
+                "linkedin": "", "github": "", "website": ""},
+    "summary": "Backend engineer.",
+    "skills": ["Python", "Go"],
+    "experience": [{"company": "Acme", "role": "Engineer", "duration": "2020 - Present",
+                    "location": "", "highlights": ["Built things"]}],
+    "projects": [],
+    "education": [],
+    "certifications": [],
+    "languages": [],
+}
+
+_window: list[float] = []
+
+
+async def _gate() -> JSONResponse | None:
+    """Apply the configured latency / failures / rate limit; None means answer normally."""
+    await asyncio.sleep(float(os.environ.get("FAKE_LATENCY", 0)))
+
+    if os.environ.get("FAKE_DOWN") == "1" or random.random() < float(os.environ.get("FAKE_FAIL_RATE", 0)):
+        return JSONResponse({"error": {"message": "Service unavailable"}}, status_code=503)
+
+    rpm = int(os.environ.get("FAKE_RPM", 0))
+    if rpm:
+        now = time.monotonic()
+        _window[:] = [t for t in _window if now - t < 60]
+        if len(_window) >= rpm:
+            wait = 60 - (now - _window[0])
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached"}},
+                status_code=429,
+                headers={"retry-after": f"{wait:.2f}", "x-ratelimit-remaining-requests": "0"},
+            )
+        _window.append(now)
+    return None
+
+
+@app.post("/openai/v1/chat/completions")
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    payload = await request.json()
+    if (error := await _gate()) is not None:
+        return error
+
+    content = json.dumps(SAMPLE_RESUME)
+    usage = {"prompt_tokens": len(json.dumps(payload["messages"])) // 4, "completion_tokens": len(content) // 4}
+
+    if payload.get("stream"):
+        async def events():
+            for i in range(0, len(content), 16):
+                delta = {"choices": [{"delta": {"content": content[i:i + 16]}}]}
+                yield f"data: {json.dumps(delta)}\n\n"
+            yield f"data: {json.dumps({'choices': [{'delta': {}}], 'x_groq': {'usage': usage}})}\n\n"
+            yield "data: [DONE]\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return {"choices": [{"message": {"role": "assistant", "content": content}}], "usage": usage}
+
+
+@app.post("/api/generate")
+async def generate(request: Request):
+    payload = await request.json()
+    if (error := await _gate()) is not None:
+        return error
+
+    content = json.dumps(SAMPLE_RESUME)
+    counts = {"prompt_eval_count": len(payload["prompt"]) // 4, "eval_count": len(content) // 4}
+
+    if payload.get("stream"):
+        async def lines():
+            for i in range(0, len(content), 16):
+                yield json.dumps({"response": content[i:i + 16], "done": False}) + "\n"
+            yield json.dumps({"response": "", "done": True, **counts}) + "\n"
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return {"response": content, "done": True, **counts}
+
+
+# ─── GitHub (/users/{login}, /users/{login}/repos, /graphql) ──────────────────
+
+github_requests: list[tuple[str, str, int]] = []
+
+
+def _github_headers() -> dict:
+    reset = time.time() + float(os.environ.get("FAKE_GITHUB_RESET", 3600))
+    return {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": os.environ.get("FAKE_GITHUB_REMAINING", "5000"),
+        "X-RateLimit-Reset": str(int(reset)),
+        "X-RateLimit-Resource": "core",
+    }
+
+
+def _missing(username: str) -> bool:
+    return username.lower() in os.environ.get("FAKE_GITHUB_MISSING", "ghost").lower().split(",")
+
+
+def _github_rest(request: Request, body: object) -> Response:
+    """A REST answer with an ETag, or 304 when the client already has it."""
+    headers = _github_headers()
+    if body is None:
+        status, content = 404, json.dumps({"message": "Not Found"}).encode()
+    else:
+        content = json.dumps(body).encode()
+        headers["ETag"] = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+        status = 304 if request.headers.get("if-none-match") == headers["ETag"] else 200
+    github_requests.append((request.method, request.url.path, status))
+    if status == 304:
+        return Response(status_code=304, headers=headers)
+    return Response(content, status_code=status, media_type="application/json", headers=headers)
+
+
+def _user(username: str) -> dict:
+    return {
+        "login": username, "avatar_url": f"https://avatars.example.com/{username}",
+        "bio": "Builds things.", "followers": 42, "public_repos": 3,
+    }
+
+
+def _repos(username: str) -> list[dict]:
+    languages = ["Python", "TypeScript", "Go"]
+    return [
+        {"name": f"{username}-project-{i}", "description": "A side project", "fork": False,
+         "html_url": f"https://github.com/{username}/{username}-project-{i}",
+         "stargazers_count": 10 * i, "forks_count": i, "language": languages[i % 3], "topics": []}
+        for i in range(3)
+    ]
+
+
+@app.get("/users/{username}")
+async def github_user(username: str, request: Request):
+    return _github_rest(request, None if _missing(username) else _user(username))
+
+
+@app.get("/users/{username}/repos")
+async def github_repos(username: str, request: Request):
+    return _github_rest(request, None if _missing(username) else _repos(username))
+
+
+@app.post("/graphql")
+async def github_graphql(request: Request):
+    """Profile and pinned-repos queries (GitHubEnricher.PROFILE_QUERY / PINNED_QUERY)."""
+    username = (await request.json()).get("variables", {}).get("login", "")
+    github_requests.append((request.method, request.url.path, 200))
+    if _missing(username):
+        return JSONResponse({
+            "data": {"user": None},
+            "errors": [{"type": "NOT_FOUND", "message": f"Could not resolve to a User with the login of '{username}'."}],
+        })
+
+    user, repos = _user(username), _repos(username)
+    nodes = [
+        {"name": r["name"], "description": r["description"], "url": r["html_url"],
+         "stargazerCount": r["stargazers_count"], "forkCount": r["forks_count"],
+         "primaryLanguage": {"name": r["language"]}, "repositoryTopics": {"nodes": []}}
+        for r in repos
+    ]
+    return JSONResponse({"data": {"user": {
+        "avatarUrl": user["avatar_url"],
+        "bio": user["bio"],
+        "followers": {"totalCount": user["followers"]},
+        "publicRepos": {"totalCount": user["public_repos"]},
+        "repositories": {"nodes": nodes},
+        "pinnedItems": {"nodes": nodes[:1]},
+    }}})
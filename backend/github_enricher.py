@@ -5,15 +5,50 @@ Enriches extracted resume data with live GitHub data.
 Pulls pinned repos, top languages, and contribution stats via GitHub REST API.
 No auth token required for public profiles (60 req/hr limit).
 Pass a token via env var GITHUB_TOKEN for 5000 req/hr.
+
+With a cache, profiles are kept between requests and REST calls are revalidated
+with If-None-Match — GitHub doesn't count 304s against the rate limit. When the
+remaining budget runs low, cached (possibly stale) profiles are served instead.
 """
 
+import asyncio
 import os
 import re
+import time
 import httpx
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 
+from cache import ExtractionCache
+from codec import from_plain, to_plain
+
+
+# github.com/<segment> paths that are site pages, not user profiles
+_RESERVED_PATHS = {
+    "about", "apps", "collections", "contact", "enterprise", "explore", "features",
+    "login", "marketplace", "orgs", "pricing", "settings", "sponsors", "topics",
+}
+_HANDLE_RE = re.compile(r"github\.com/([a-zA-Z0-9](?:[a-zA-Z0-9\-]{0,38}))", re.IGNORECASE)
+
+
+def find_github_handle(text: str) -> str:
+    """
+    Cheap pre-scan of raw resume text for a github.com/<user> link, so
+    enrichment can start before the LLM has extracted contact info.
+    Returns "" if nothing profile-like is found.
+    """
+    for match in _HANDLE_RE.finditer(text):
+        handle = match.group(1)
+        if handle.lower() not in _RESERVED_PATHS:
+            return handle
+    return ""
 
-@dataclass
+
+class _NoSuchUser(Exception):
+    """GraphQL answered that the login doesn't exist — REST would only 404 too."""
+
+
+@dataclass(slots=True)
 class GitHubRepo:
     name: str = ""
     description: str = ""
@@ -25,7 +60,7 @@ class GitHubRepo:
     is_pinned: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class GitHubProfile:
     username: str = ""
     avatar_url: str = ""
@@ -48,8 +83,22 @@ class GitHubEnricher:
 
     BASE_URL = "https://api.github.com"
 
-    def __init__(self, token: str | None = None):
+    def __init__(
+        self,
+        token: str | None = None,
+        call_timeout: float | None = None,
+        use_graphql: bool | None = None,
+        cache: ExtractionCache | None = None,
+        base_url: str | None = None,
+        client: httpx.Client | None = None,
+    ):
         self.token = token or os.environ.get("GITHUB_TOKEN")
+        # Overridable so a local fake GitHub can stand in for api.github.com
+        self.base_url = (base_url or os.environ.get("GITHUB_API_URL", self.BASE_URL)).rstrip("/")
+        self.graphql_url = f"{self.base_url}/graphql"
+        # Shared pooled client for the sync path (see http_pool.py); fetch()
+        # falls back to a short-lived client when none is given
+        self.client = client
         self.headers = {
             "Accept": "application/vnd.github+json",
             "X-GitHub-Api-Version": "2022-11-28",
@@ -57,6 +106,25 @@ class GitHubEnricher:
         if self.token:
             self.headers["Authorization"] = f"Bearer {self.token}"
 
+        # Per-call budget: user, repos and pinned run concurrently, so a slow
+        # call costs at most this much instead of stalling the others
+        self.call_timeout = call_timeout or float(os.environ.get("GITHUB_CALL_TIMEOUT", 5))
+
+        # GraphQL needs auth; with a token one query replaces all three calls
+        if use_graphql is None:
+            use_graphql = os.environ.get("GITHUB_GRAPHQL", "1") not in ("0", "false", "no")
+        self.use_graphql = bool(use_graphql and self.token)
+
+        # Profile + ETag cache; profiles younger than cache_fresh_seconds are
+        # served without touching the network at all
+        self.cache = cache
+        self.cache_fresh_seconds = float(os.environ.get("GITHUB_CACHE_FRESH", 600))
+
+        # Last rate-limit budget seen on a REST response (X-RateLimit-*)
+        self.rate_remaining: int | None = None
+        self.rate_reset: float = 0.0
+        self.rate_reserve = int(os.environ.get("GITHUB_RATE_LIMIT_RESERVE", 5))
+
     def fetch(self, username: str) -> GitHubProfile | None:
         """
         Main entry point. Returns None if the profile doesn't exist
@@ -66,35 +134,285 @@ class GitHubEnricher:
         if not username:
             return None
 
+        cached = self._cached_entry(username)
+        if self._should_serve_cached(cached):
+            return self._profile_from_dict(cached["profile"])
+
         try:
-            with httpx.Client(headers=self.headers, timeout=10) as client:
-                user_data = self._get_user(client, username)
-                if not user_data:
-                    return None
-
-                repos = self._get_repos(client, username)
-                pinned = self._get_pinned_repos(client, username)
-                top_languages = self._get_top_languages(repos)
-
-                # If no pinned repos detected, fall back to top 6 by stars
-                top_repos = pinned if pinned else sorted(
-                    repos, key=lambda r: r.stars, reverse=True
-                )[:6]
-
-                return GitHubProfile(
-                    username=username,
-                    avatar_url=user_data.get("avatar_url", ""),
-                    bio=user_data.get("bio", "") or "",
-                    followers=user_data.get("followers", 0),
-                    public_repos=user_data.get("public_repos", 0),
-                    top_languages=top_languages,
-                    pinned_repos=pinned,
-                    top_repos=top_repos,
-                )
+            if self.client is not None:
+                profile = self._fetch_with(self.client, username)
+            else:
+                with httpx.Client(timeout=self.call_timeout) as client:
+                    profile = self._fetch_with(client, username)
         except Exception:
             # GitHub enrichment is optional — never crash portfolio generation
+            profile = None
+        return self._remember(username, profile, cached)
+
+    def _fetch_with(self, client: httpx.Client, username: str) -> GitHubProfile | None:
+        if self.use_graphql:
+            try:
+                return self._fetch_graphql(client, username)
+            except _NoSuchUser:
+                return None
+            except Exception:
+                pass  # fall back to the REST fan-out below
+        return self._fetch_rest(client, username)
+
+    async def fetch_async(self, username: str, client: httpx.AsyncClient) -> GitHubProfile | None:
+        """Same as fetch(), but awaits GitHub on a shared httpx.AsyncClient."""
+        username = self._extract_username(username)
+        if not username:
             return None
 
+        cached = self._cached_entry(username)
+        if self._should_serve_cached(cached):
+            return self._profile_from_dict(cached["profile"])
+
+        try:
+            profile = None
+            if self.use_graphql:
+                try:
+                    profile = await self._fetch_graphql_async(client, username)
+                except _NoSuchUser:
+                    return self._remember(username, None, cached)
+                except Exception:
+                    pass
+            if profile is None:
+                profile = await self._fetch_rest_async(client, username)
+        except Exception:
+            profile = None
+        return self._remember(username, profile, cached)
+
+    # ─── Profile cache + rate-limit budget ────────────────────────────────────
+
+    def _cached_entry(self, username: str) -> dict | None:
+        if self.cache is None:
+            return None
+        return self.cache.get(f"profile:{username.lower()}")
+
+    def _should_serve_cached(self, cached: dict | None) -> bool:
+        """Skip the network when the cached profile is fresh, or the budget is low."""
+        if cached is None:
+            return False
+        if time.time() - cached["fetched_at"] < self.cache_fresh_seconds:
+            return True
+        return self._budget_low()
+
+    def _budget_low(self) -> bool:
+        if self.rate_remaining is None or time.time() >= self.rate_reset:
+            return False
+        return self.rate_remaining <= self.rate_reserve
+
+    def _remember(
+        self, username: str, profile: GitHubProfile | None, cached: dict | None
+    ) -> GitHubProfile | None:
+        """Store a fresh profile, or fall back to the stale one if the fetch failed."""
+        if profile is None:
+            return self._profile_from_dict(cached["profile"]) if cached else None
+        if self.cache is not None:
+            self.cache.set(
+                f"profile:{username.lower()}",
+                {"profile": to_plain(profile), "fetched_at": time.time()},
+            )
+        return profile
+
+    def _profile_from_dict(self, data: dict) -> GitHubProfile:
+        return from_plain(GitHubProfile, data)
+
+    def _track_rate_limit(self, resp: httpx.Response) -> None:
+        """Record the core REST budget from X-RateLimit-Remaining / -Reset."""
+        if resp.headers.get("X-RateLimit-Resource", "core") != "core":
+            return
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        reset = resp.headers.get("X-RateLimit-Reset")
+        if remaining is not None and remaining.isdigit():
+            self.rate_remaining = int(remaining)
+        if reset is not None and reset.isdigit():
+            self.rate_reset = float(reset)
+
+    # ─── Conditional GET (ETag / If-None-Match) ───────────────────────────────
+
+    def _conditional_headers(self, url: str, params: dict | None) -> tuple[str, dict | None, dict]:
+        """Cache key, cached ETag entry, and request headers for a REST GET."""
+        key = "etag:" + url + ("?" + "&".join(f"{k}={v}" for k, v in sorted(params.items())) if params else "")
+        headers = dict(self.headers)
+        entry = self.cache.get(key) if self.cache is not None else None
+        if entry:
+            headers["If-None-Match"] = entry["etag"]
+        return key, entry, headers
+
+    def _read_conditional(self, key: str, entry: dict | None, resp: httpx.Response):
+        """
+        JSON body of a REST response — the cached one on 304. None on 404;
+        any other failure raises so the fan-out can keep partial results.
+        """
+        self._track_rate_limit(resp)
+        if resp.status_code == 304 and entry:
+            return entry["body"]
+        if resp.status_code == 404:
+            return None
+        resp.raise_for_status()
+        body = resp.json()
+        etag = resp.headers.get("ETag")
+        if etag and self.cache is not None:
+            self.cache.set(key, {"etag": etag, "body": body})
+        return body
+
+    def _get_json(self, client: httpx.Client, url: str, params: dict | None = None):
+        key, entry, headers = self._conditional_headers(url, params)
+        resp = client.get(url, params=params, headers=headers, timeout=self.call_timeout)
+        return self._read_conditional(key, entry, resp)
+
+    async def _get_json_async(self, client: httpx.AsyncClient, url: str, params: dict | None = None):
+        key, entry, headers = self._conditional_headers(url, params)
+        resp = await client.get(url, params=params, headers=headers, timeout=self.call_timeout)
+        return self._read_conditional(key, entry, resp)
+
+    # ─── REST fan-out ─────────────────────────────────────────────────────────
+
+    def _fetch_rest(self, client: httpx.Client, username: str) -> GitHubProfile | None:
+        """Issue the user, repos and pinned calls concurrently on one client."""
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="github-rest") as pool:
+            futures = [
+                pool.submit(self._get_user, client, username),
+                pool.submit(self._get_repos, client, username),
+                pool.submit(self._get_pinned_repos, client, username),
+            ]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(e)
+        return self._combine(username, *results)
+
+    async def _fetch_rest_async(self, client: httpx.AsyncClient, username: str) -> GitHubProfile | None:
+        results = await asyncio.gather(
+            self._get_user_async(client, username),
+            self._get_repos_async(client, username),
+            self._get_pinned_repos_async(client, username),
+            return_exceptions=True,
+        )
+        return self._combine(username, *results)
+
+    def _combine(self, username: str, user_data, repos, pinned) -> GitHubProfile | None:
+        """
+        Join the three REST results, keeping whatever succeeded. A missing user
+        (404) means no profile; a failed call just leaves its part empty.
+        """
+        if user_data is None:
+            return None
+        if isinstance(repos, BaseException):
+            repos = []
+        if isinstance(pinned, BaseException):
+            pinned = []
+        if isinstance(user_data, BaseException):
+            if not repos and not pinned:
+                raise user_data
+            user_data = {}
+        return self._build_profile(username, user_data, repos, pinned)
+
+    # ─── GraphQL single round-trip ────────────────────────────────────────────
+
+    PROFILE_QUERY = """
+    query($login: String!) {
+      user(login: $login) {
+        avatarUrl
+        bio
+        followers { totalCount }
+        publicRepos: repositories(privacy: PUBLIC, ownerAffiliations: OWNER) { totalCount }
+        repositories(first: 100, privacy: PUBLIC, ownerAffiliations: OWNER,
+                     isFork: false, orderBy: {field: UPDATED_AT, direction: DESC}) {
+          nodes { ...repo }
+        }
+        pinnedItems(first: 6, types: REPOSITORY) {
+          nodes { ... on Repository { ...repo } }
+        }
+      }
+    }
+
+    fragment repo on Repository {
+      name
+      description
+      url
+      stargazerCount
+      forkCount
+      primaryLanguage { name }
+      repositoryTopics(first: 5) {
+        nodes { topic { name } }
+      }
+    }
+    """
+
+    def _fetch_graphql(self, client: httpx.Client, username: str) -> GitHubProfile:
+        resp = client.post(
+            self.graphql_url,
+            json={"query": self.PROFILE_QUERY, "variables": {"login": username}},
+            headers=self.headers,
+            timeout=self.call_timeout,
+        )
+        resp.raise_for_status()
+        return self._parse_profile_graphql(username, resp.json())
+
+    async def _fetch_graphql_async(self, client: httpx.AsyncClient, username: str) -> GitHubProfile:
+        resp = await client.post(
+            self.graphql_url,
+            json={"query": self.PROFILE_QUERY, "variables": {"login": username}},
+            headers=self.headers,
+            timeout=self.call_timeout,
+        )
+        resp.raise_for_status()
+        return self._parse_profile_graphql(username, resp.json())
+
+    def _parse_profile_graphql(self, username: str, data: dict) -> GitHubProfile:
+        """
+        Map the combined query result onto the same GitHubProfile as REST.
+        Raises _NoSuchUser for an unknown login, so the caller skips REST.
+        """
+        if not data.get("data"):
+            raise ValueError(f"GraphQL error: {data.get('errors') or data}")
+        user = data["data"].get("user")
+        if user is None:
+            errors = data.get("errors") or []
+            if all(e.get("type") == "NOT_FOUND" for e in errors):
+                raise _NoSuchUser(username)
+            raise ValueError(f"GraphQL error: {errors}")
+
+        repos = [self._parse_graphql_repo(n) for n in user["repositories"]["nodes"] if n]
+        pinned = [
+            self._parse_graphql_repo(n, is_pinned=True)
+            for n in user["pinnedItems"]["nodes"] if n
+        ]
+        user_data = {
+            "avatar_url": user.get("avatarUrl", ""),
+            "bio": user.get("bio"),
+            "followers": (user.get("followers") or {}).get("totalCount", 0),
+            "public_repos": (user.get("publicRepos") or {}).get("totalCount", 0),
+        }
+        return self._build_profile(username, user_data, repos, pinned)
+
+    def _build_profile(
+        self, username: str, user_data: dict, repos: list[GitHubRepo], pinned: list[GitHubRepo]
+    ) -> GitHubProfile:
+        top_languages = self._get_top_languages(repos)
+
+        # If no pinned repos detected, fall back to top 6 by stars
+        top_repos = pinned if pinned else sorted(
+            repos, key=lambda r: r.stars, reverse=True
+        )[:6]
+
+        return GitHubProfile(
+            username=username,
+            avatar_url=user_data.get("avatar_url", ""),
+            bio=user_data.get("bio", "") or "",
+            followers=user_data.get("followers", 0),
+            public_repos=user_data.get("public_repos", 0),
+            top_languages=top_languages,
+            pinned_repos=pinned,
+            top_repos=top_repos,
+        )
+
     def _extract_username(self, raw: str) -> str:
         """
         Handle various GitHub input formats:
@@ -110,23 +428,33 @@ class GitHubEnricher:
         # Assume it's already a plain username
         return raw.strip().lstrip("@")
 
+    # ─── REST: user ───────────────────────────────────────────────────────────
+
     def _get_user(self, client: httpx.Client, username: str) -> dict | None:
-        resp = client.get(f"{self.BASE_URL}/users/{username}")
-        if resp.status_code == 200:
-            return resp.json()
-        return None
+        """User JSON, or None if the login doesn't exist. Other failures raise."""
+        return self._get_json(client, f"{self.base_url}/users/{username}")
+
+    async def _get_user_async(self, client: httpx.AsyncClient, username: str) -> dict | None:
+        return await self._get_json_async(client, f"{self.base_url}/users/{username}")
+
+    # ─── REST: repos ──────────────────────────────────────────────────────────
+
+    REPOS_PARAMS = {"per_page": 100, "sort": "updated", "type": "owner"}
 
     def _get_repos(self, client: httpx.Client, username: str) -> list[GitHubRepo]:
         """Fetch all public repos (up to 100, sorted by updated)."""
-        resp = client.get(
-            f"{self.BASE_URL}/users/{username}/repos",
-            params={"per_page": 100, "sort": "updated", "type": "owner"}
+        data = self._get_json(client, f"{self.base_url}/users/{username}/repos", self.REPOS_PARAMS)
+        return self._parse_repos(data or [])
+
+    async def _get_repos_async(self, client: httpx.AsyncClient, username: str) -> list[GitHubRepo]:
+        data = await self._get_json_async(
+            client, f"{self.base_url}/users/{username}/repos", self.REPOS_PARAMS
         )
-        if resp.status_code != 200:
-            return []
+        return self._parse_repos(data or [])
 
+    def _parse_repos(self, data: list[dict]) -> list[GitHubRepo]:
         repos = []
-        for r in resp.json():
+        for r in data:
             if r.get("fork"):  # skip forks
                 continue
             repos.append(GitHubRepo(
@@ -140,6 +468,30 @@ class GitHubEnricher:
             ))
         return repos
 
+    # ─── GraphQL: pinned repos ────────────────────────────────────────────────
+
+    PINNED_QUERY = """
+    query($login: String!) {
+      user(login: $login) {
+        pinnedItems(first: 6, types: REPOSITORY) {
+          nodes {
+            ... on Repository {
+              name
+              description
+              url
+              stargazerCount
+              forkCount
+              primaryLanguage { name }
+              repositoryTopics(first: 5) {
+                nodes { topic { name } }
+              }
+            }
+          }
+        }
+      }
+    }
+    """
+
     def _get_pinned_repos(self, client: httpx.Client, username: str) -> list[GitHubRepo]:
         """
         GitHub REST API doesn't expose pinned repos — use the GraphQL API.
@@ -148,55 +500,52 @@ class GitHubEnricher:
         if not self.token:
             return []
 
-        query = """
-        query($login: String!) {
-          user(login: $login) {
-            pinnedItems(first: 6, types: REPOSITORY) {
-              nodes {
-                ... on Repository {
-                  name
-                  description
-                  url
-                  stargazerCount
-                  forkCount
-                  primaryLanguage { name }
-                  repositoryTopics(first: 5) {
-                    nodes { topic { name } }
-                  }
-                }
-              }
-            }
-          }
-        }
-        """
         resp = client.post(
-            "https://api.github.com/graphql",
-            json={"query": query, "variables": {"login": username}},
+            self.graphql_url,
+            json={"query": self.PINNED_QUERY, "variables": {"login": username}},
+            headers=self.headers,
+            timeout=self.call_timeout,
+        )
+        if resp.status_code != 200:
+            return []
+        return self._parse_pinned(resp.json())
+
+    async def _get_pinned_repos_async(self, client: httpx.AsyncClient, username: str) -> list[GitHubRepo]:
+        if not self.token:
+            return []
+
+        resp = await client.post(
+            self.graphql_url,
+            json={"query": self.PINNED_QUERY, "variables": {"login": username}},
+            headers=self.headers,
+            timeout=self.call_timeout,
         )
         if resp.status_code != 200:
             return []
+        return self._parse_pinned(resp.json())
 
+    def _parse_pinned(self, data: dict) -> list[GitHubRepo]:
         try:
-            nodes = resp.json()["data"]["user"]["pinnedItems"]["nodes"]
-            return [
-                GitHubRepo(
-                    name=n.get("name", ""),
-                    description=n.get("description", "") or "",
-                    url=n.get("url", ""),
-                    stars=n.get("stargazerCount", 0),
-                    forks=n.get("forkCount", 0),
-                    language=(n.get("primaryLanguage") or {}).get("name", ""),
-                    topics=[
-                        t["topic"]["name"]
-                        for t in n.get("repositoryTopics", {}).get("nodes", [])
-                    ],
-                    is_pinned=True,
-                )
-                for n in nodes
-            ]
+            nodes = data["data"]["user"]["pinnedItems"]["nodes"]
+            return [self._parse_graphql_repo(n, is_pinned=True) for n in nodes]
         except (KeyError, TypeError):
             return []
 
+    def _parse_graphql_repo(self, n: dict, is_pinned: bool = False) -> GitHubRepo:
+        return GitHubRepo(
+            name=n.get("name", ""),
+            description=n.get("description", "") or "",
+            url=n.get("url", ""),
+            stars=n.get("stargazerCount", 0),
+            forks=n.get("forkCount", 0),
+            language=(n.get("primaryLanguage") or {}).get("name", ""),
+            topics=[
+                t["topic"]["name"]
+                for t in n.get("repositoryTopics", {}).get("nodes", [])
+            ],
+            is_pinned=is_pinned,
+        )
+
     def _get_top_languages(self, repos: list[GitHubRepo], top_n: int = 5) -> list[str]:
         """Rank languages by how many repos use them."""
         lang_count: dict[str, int] = {}
@@ -0,0 +1,92 @@
+"""
+backend/http_cache.py
+---------------------------
+Conditional and compressed responses for the API's cacheable payloads
+(parse results, rendered portfolios).
+
+    return cached_response(request, body, "application/json", etag)
+
+  - If-None-Match on a GET/HEAD that matches the ETag → 304, no body
+  - Accept-Encoding: br (when the optional `brotli` package is installed)
+    or gzip, for bodies of COMPRESS_MIN_SIZE bytes or more
+  - an encoded body gets its own ETag ("<tag>-gzip", "<tag>-br"), as a
+    strong validator must; If-None-Match accepts any of them
+
+Compression is deterministic (gzip mtime=0), so the same body always
+encodes to the same bytes.
+"""
+
+import gzip
+import os
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:     # optional: pip install brotli
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 1024))
+_ENCODINGS = ("gzip", "br")
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """True when an If-None-Match header names `etag` or one of its encoded variants."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tag = etag.strip('"')
+    variants = {tag, *(f"{tag}-{encoding}" for encoding in _ENCODINGS)}
+    # Weak comparison, as RFC 9110 asks for If-None-Match
+    return any(c.strip().removeprefix("W/").strip('"') in variants for c in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"})
+
+
+def pick_encoding(accept_encoding: str) -> str | None:
+    """br if the client takes it and brotli is installed, else gzip, else None."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip()] = q
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def cached_response(
+    request: Request,
+    body: bytes,
+    media_type: str,
+    etag: str,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """`body` with its ETag — or a 304 for a matching conditional GET — compressed if worth it."""
+    if request.method in ("GET", "HEAD") and etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding", **(headers or {})}
+    encoding = pick_encoding(request.headers.get("accept-encoding", "")) if len(body) >= COMPRESS_MIN_SIZE else None
+    if encoding:
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+        tag = etag.strip('"')
+        headers["ETag"] = f'"{tag}-{encoding}"'
+    return Response(body, media_type=media_type, headers=headers)
@@ -0,0 +1,78 @@
+"""
+backend/http_pool.py
+--------------------------
+Long-lived, pooled HTTP clients shared by the LLM and GitHub calls.
+
+Every upload used to open fresh TCP+TLS connections to api.groq.com and
+api.github.com. The pipeline now owns one client per process, so connections
+are kept alive and reused across requests.
+
+Tune via .env:
+  HTTP_MAX_CONNECTIONS=50      → total connections per client
+  HTTP_MAX_KEEPALIVE=20        → idle connections kept open
+  HTTP_KEEPALIVE_EXPIRY=30     → seconds an idle connection is kept
+  HTTP_HTTP2=1                 → use HTTP/2 when the `h2` package is installed
+"""
+
+import importlib.util
+import os
+
+import httpx
+
+
+def pool_limits_from_env() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=int(os.environ.get("HTTP_MAX_CONNECTIONS", 50)),
+        max_keepalive_connections=int(os.environ.get("HTTP_MAX_KEEPALIVE", 20)),
+        keepalive_expiry=float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", 30)),
+    )
+
+
+def http2_enabled() -> bool:
+    """HTTP/2 only if requested and the optional `h2` package is importable."""
+    wanted = os.environ.get("HTTP_HTTP2", "1") not in ("0", "false", "no")
+    return wanted and importlib.util.find_spec("h2") is not None
+
+
+def make_client(timeout: float = 30) -> httpx.Client:
+    return httpx.Client(limits=pool_limits_from_env(), http2=http2_enabled(), timeout=timeout)
+
+
+def make_async_client(timeout: float = 30) -> httpx.AsyncClient:
+    return httpx.AsyncClient(limits=pool_limits_from_env(), http2=http2_enabled(), timeout=timeout)
+
+
+def pool_stats(client: httpx.Client | httpx.AsyncClient | None) -> dict:
+    """
+    Snapshot of a client's connection pool, for sizing the limits above.
+    httpx doesn't expose this publicly, so we read httpcore's pool.
+    """
+    if client is None or client.is_closed:
+        return {"open": False}
+
+    pool = getattr(client._transport, "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    by_origin: dict[str, int] = {}
+    idle = http2 = 0
+    for conn in connections:
+        origin = str(getattr(conn, "_origin", "unknown"))
+        by_origin[origin] = by_origin.get(origin, 0) + 1
+        if conn.is_idle():
+            idle += 1
+        if "HTTP/2" in conn.info():
+            http2 += 1
+
+    limits = pool_limits_from_env()
+    return {
+        "open": True,
+        "connections": len(connections),
+        "idle": idle,
+        "active": len(connections) - idle,
+        "http2": http2,
+        "by_origin": by_origin,
+        "limits": {
+            "max_connections": limits.max_connections,
+            "max_keepalive_connections": limits.max_keepalive_connections,
+            "keepalive_expiry": limits.keepalive_expiry,
+        },
+    }
@@ -0,0 +1,229 @@
+"""
+backend/jobs.py
+---------------------
+Bounded in-process job queue for parse requests.
+
+A burst of uploads would otherwise hit the LLM all at once and trip the
+provider's rate limits. Instead, each upload becomes a Job in a bounded
+asyncio queue, drained by a fixed number of workers; at most
+LLM_CONCURRENCY_<PROVIDER> of them talk to a given provider at a time. The
+cap covers the LLM step only, so PDF parsing and the GitHub fetch of other
+jobs go on meanwhile. When the queue is full, submit() raises QueueFull
+with a Retry-After estimate.
+
+Usage:
+    jobs = JobQueue(pipeline)
+    await jobs.start()
+    job = jobs.submit(pdf_bytes, github_username="octocat")
+    await jobs.wait(job)
+    job.to_dict()  # {"id": ..., "status": "done", "result": {...}}
+"""
+
+import asyncio
+import math
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from llm_client import CircuitOpenError
+from metrics import collect_timings
+from parser import PdfSource
+from pipeline import AsyncResumePipeline
+
+
+class QueueFull(Exception):
+    """The job queue is at capacity; retry after `retry_after` seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full. Retry in {retry_after}s.")
+        self.retry_after = retry_after
+
+
+@dataclass
+class Job:
+    id: str
+    pdf: PdfSource = field(repr=False)
+    github_username: str | None = None
+    document_id: str | None = None  # client id for incremental re-extraction
+    status: str = "queued"          # queued | running | done | failed
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: dict | None = field(default=None, repr=False)
+    error: str | None = None
+    error_status: int = 500         # HTTP status for a failed job (422 = bad resume, 503 = LLM down)
+    timings: list[tuple[str, float]] = field(default_factory=list, repr=False)  # stages, for Server-Timing
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def to_dict(self) -> dict:
+        data = {
+            "id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.status == "done":
+            data["result"] = self.result
+        elif self.status == "failed":
+            data["error"] = self.error
+        return data
+
+
+class JobQueue:
+    """Fixed pool of workers pulling parse jobs from a bounded queue."""
+
+    def __init__(
+        self,
+        pipeline: AsyncResumePipeline,
+        workers: int | None = None,
+        max_size: int | None = None,
+        result_ttl: float | None = None,
+    ):
+        self.pipeline = pipeline
+        self.workers = workers or int(os.environ.get("JOB_WORKERS", 4))
+        self.max_size = max_size or int(os.environ.get("JOB_QUEUE_SIZE", 100))
+        self.result_ttl = result_ttl if result_ttl is not None else float(os.environ.get("JOB_RESULT_TTL", 600))
+
+        self._queue: asyncio.Queue[Job] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._jobs: dict[str, Job] = {}
+        self._limits: dict[str, asyncio.Semaphore] = {}
+        self._avg_seconds = 10.0    # EWMA of job run time, seeds Retry-After
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    async def start(self) -> None:
+        """Create the queue and spawn the workers (call at app startup)."""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    # ─── Public API ───────────────────────────────────────────────────────────
+
+    def submit(
+        self, pdf: PdfSource, github_username: str | None = None, document_id: str | None = None
+    ) -> Job:
+        """Enqueue a parse; raises QueueFull instead of waiting for space."""
+        if self._queue is None:
+            raise RuntimeError("JobQueue.start() has not been called")
+        self._prune()
+
+        job = Job(id=uuid.uuid4().hex, pdf=pdf, github_username=github_username, document_id=document_id)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFull(self.retry_after()) from None
+        self._jobs[job.id] = job
+        return job
+
+    def check_capacity(self) -> None:
+        """Raise QueueFull when the queue is at capacity, for parses that don't go through it."""
+        if self._queue is not None and self._queue.full():
+            self.rejected += 1
+            raise QueueFull(self.retry_after())
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: Job, timeout: float | None = None) -> Job:
+        await asyncio.wait_for(job.done.wait(), timeout)
+        return job
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up (one job finishing)."""
+        return max(1, math.ceil(self._avg_seconds / self.workers))
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_size": self.max_size,
+            "running": sum(1 for job in self._jobs.values() if job.status == "running"),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_seconds": round(self._avg_seconds, 2),
+            "provider_limits": {name: provider_limit(name) for name in self._limits},
+        }
+
+    # ─── Workers ──────────────────────────────────────────────────────────────
+
+    async def _worker(self, number: int) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        job.timings = collect_timings()
+        job.timings.append(("queue", job.started_at - job.created_at))
+        try:
+            data = await self.pipeline.run(
+                job.pdf,
+                github_username=job.github_username,
+                document_id=job.document_id,
+                llm_limit=self.limit(self.pipeline.extractor.provider),
+            )
+            job.result = data.to_dict()
+            job.status = "done"
+            self.completed += 1
+        except asyncio.CancelledError:
+            job.status, job.error = "failed", "Server shutting down"
+            raise
+        except CircuitOpenError as e:
+            job.status, job.error, job.error_status = "failed", str(e), 503
+            self.failed += 1
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e) if isinstance(e, ValueError) else f"Parsing failed: {e}"
+            job.error_status = 422 if isinstance(e, ValueError) else 500
+            self.failed += 1
+        finally:
+            job.finished_at = time.time()
+            job.pdf = b""   # drop the upload as soon as it's parsed
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * (job.finished_at - job.started_at)
+            job.done.set()
+
+    def limit(self, provider: str) -> asyncio.Semaphore:
+        """
+        Per-provider concurrency cap; LLM_CONCURRENCY_<PROVIDER>=0 means
+        unlimited. Shared with parses that bypass the queue (SSE streaming),
+        so they count against the same provider budget.
+        """
+        if provider not in self._limits:
+            self._limits[provider] = asyncio.Semaphore(provider_limit(provider) or self.workers)
+        return self._limits[provider]
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than result_ttl."""
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+_DEFAULT_LIMITS = {"groq": 4, "ollama": 1, "none": 0}
+
+
+def provider_limit(provider: str) -> int:
+    """LLM_CONCURRENCY_<PROVIDER>: calls allowed to a provider at once (0 = no cap)."""
+    return int(os.environ.get(f"LLM_CONCURRENCY_{provider.upper()}", _DEFAULT_LIMITS.get(provider, 4)))
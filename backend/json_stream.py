@@ -0,0 +1,139 @@
+"""
+backend/json_stream.py
+----------------------------
+Incremental parser for a streamed JSON object.
+
+The LLM writes the resume JSON token by token. Instead of waiting for the
+closing brace, feed the chunks in as they arrive and get each top-level
+member ("contact", "skills", "experience", ...) back the moment its value
+is complete.
+
+Usage:
+    parser = SectionParser()
+    for chunk in chunks:
+        for key, value in parser.feed(chunk):
+            print(key, value)
+"""
+
+import json
+
+
+class SectionParser:
+    """
+    Character-level scanner that tracks string/escape state and nesting depth.
+    Only values directly under the root object are decoded (with json.loads),
+    so the cost is one pass over the text plus one decode per section.
+    """
+
+    def __init__(self):
+        self._buf: list[str] = []       # chars of the current top-level value
+        self._key: str | None = None    # key whose value we're collecting
+        self._key_buf: list[str] = []
+        self._depth = 0                 # 0 = before root, 1 = inside root object
+        self._in_string = False
+        self._escape = False
+        self._state = "start"           # start | key | colon | value | after_value | done
+        self.sections: dict = {}
+
+    def feed(self, chunk: str) -> list[tuple[str, object]]:
+        """Consume a chunk; return the (key, value) pairs it completed."""
+        done: list[tuple[str, object]] = []
+        for ch in chunk:
+            item = self._step(ch)
+            if item is not None:
+                done.append(item)
+        return done
+
+    def _step(self, ch: str) -> tuple[str, object] | None:
+        state = self._state
+
+        if state == "start":
+            if ch == "{":
+                self._depth = 1
+                self._state = "key"
+            return None
+
+        if state == "key":
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    self._key_buf.append(ch)
+                elif ch == "\\":
+                    self._escape = True
+                    self._key_buf.append(ch)
+                elif ch == '"':
+                    self._in_string = False
+                    self._key = json.loads('"' + "".join(self._key_buf) + '"')
+                    self._key_buf = []
+                    self._state = "colon"
+                else:
+                    self._key_buf.append(ch)
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "}":
+                self._state = "done"
+            return None
+
+        if state == "colon":
+            if ch == ":":
+                self._state = "value"
+            return None
+
+        if state == "value":
+            if not self._buf and ch.isspace():
+                return None
+            if self._in_string:
+                self._buf.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        return self._emit()
+                return None
+            if ch == '"':
+                self._in_string = True
+                self._buf.append(ch)
+                return None
+            if ch in "{[":
+                self._depth += 1
+                self._buf.append(ch)
+                return None
+            if ch in "}]":
+                if self._depth == 1:
+                    # end of root object right after a scalar (number/bool/null)
+                    item = self._emit() if self._buf else None
+                    self._state = "done"
+                    return item
+                self._depth -= 1
+                self._buf.append(ch)
+                return self._emit() if self._depth == 1 else None
+            if ch == "," and self._depth == 1:
+                item = self._emit() if self._buf else None
+                self._state = "key"
+                return item
+            self._buf.append(ch)
+            return None
+
+        if state == "after_value":
+            if ch == ",":
+                self._state = "key"
+            elif ch == "}":
+                self._state = "done"
+            return None
+
+        return None
+
+    def _emit(self) -> tuple[str, object] | None:
+        raw = "".join(self._buf).strip()
+        self._buf = []
+        self._state = "after_value"
+        key, self._key = self._key, None
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        self.sections[key] = value
+        return key, value
@@ -0,0 +1,164 @@
+"""
+backend/layout.py
+-----------------------
+Reading order for a page of word boxes, computed with NumPy.
+
+Words are clustered into lines by vertical position, then the page is checked
+for columns: an x-range that few lines cover, with enough lines of text on
+both sides, is a gutter — unless the text right of it is right-aligned and
+sits on the same lines as the text to its left (dates at the end of entry
+lines, not a column). Two-column resumes then come out column by column
+instead of interleaved line by line; lines that cross a gutter (a full-width
+name or heading) are kept whole and split the page into bands.
+
+    lines = page_lines(page.get_text("words"))   # (x0, y0, x1, y1, text, ...)
+"""
+
+import numpy as np
+
+
+Y_TOLERANCE = 5.0       # words whose tops differ by ≤ this share a line
+BIN_WIDTH = 2.0         # x-histogram resolution, in points
+MIN_GUTTER = 12.0       # narrowest empty x-range that counts as a column gap
+GUTTER_DENSITY = 0.35   # gutter coverage, relative to a typical text column
+MIN_COLUMN_SHARE = 0.15 # each column needs this share of the page's words
+MIN_COLUMN_LINES = 3    # ... and this many lines of two or more words
+SHARED_ROWS = 0.5       # right-side rows sharing a line with left text, above
+                        # which right-aligned text is read as fields (dates)
+
+
+def page_lines(words: list[tuple], y_tolerance: float = Y_TOLERANCE) -> list[str]:
+    """
+    Text lines of one page in reading order. `words` are (x0, top, x1, bottom,
+    text, ...) tuples — PyMuPDF's get_text("words") format. Columns are
+    separated by an empty string (a blank line once joined).
+    """
+    if not words:
+        return []
+
+    # Transpose once: a tuple per field converts to an array at C speed
+    fields = list(zip(*words))
+    x0 = np.array(fields[0], dtype=np.float64)
+    tops = np.array(fields[1], dtype=np.float64)
+    x1 = np.array(fields[2], dtype=np.float64)
+    texts = fields[4]
+
+    line_ids = cluster_lines(tops, y_tolerance)
+    n_lines = int(line_ids.max()) + 1
+    gutters = find_gutters(x0, x1, line_ids)
+
+    if len(gutters):
+        # A word overlapping any gutter makes its whole line full-width
+        straddles = ((x0[:, None] < gutters[:, 1]) & (x1[:, None] > gutters[:, 0])).any(axis=1)
+        spanning = np.bincount(line_ids, weights=straddles, minlength=n_lines) > 0
+        column = np.searchsorted(gutters[:, 0], (x0 + x1) / 2)
+        column[spanning[line_ids]] = 0
+
+        # Bands: runs of column lines between full-width lines
+        band_of_line = 2 * np.cumsum(spanning) - spanning
+        band = band_of_line[line_ids]
+    else:
+        column = np.zeros(len(words), dtype=np.int64)
+        band = column
+
+    order = np.lexsort((x0, line_ids, column, band))
+    keys = np.stack([band[order], column[order], line_ids[order]], axis=1)
+    new_line = np.ones(len(order), dtype=bool)
+    new_line[1:] = (keys[1:] != keys[:-1]).any(axis=1)
+    new_block = np.ones(len(order), dtype=bool)
+    new_block[1:] = (keys[1:, :2] != keys[:-1, :2]).any(axis=1)
+
+    ordered = [texts[i] for i in order.tolist()]
+    starts = np.flatnonzero(new_line).tolist()
+    ends = starts[1:] + [len(ordered)]
+    # Blank line between columns of the same band
+    column_break = (new_block[1:] & (keys[1:, 0] == keys[:-1, 0])).tolist()
+    lines: list[str] = []
+    for start, end in zip(starts, ends):
+        if start and column_break[start - 1]:
+            lines.append("")
+        lines.append(" ".join(ordered[start:end]))
+    return lines
+
+
+def cluster_lines(tops: np.ndarray, y_tolerance: float = Y_TOLERANCE) -> np.ndarray:
+    """
+    Line index per word (0 = topmost line). Sorted tops are split wherever
+    the gap to the previous word exceeds `y_tolerance`.
+    """
+    order = np.argsort(tops, kind="stable")
+    breaks = np.zeros(len(tops), dtype=np.int64)
+    breaks[1:] = np.diff(tops[order]) > y_tolerance
+    line_ids = np.empty(len(tops), dtype=np.int64)
+    line_ids[order] = np.cumsum(breaks)
+    return line_ids
+
+
+def find_gutters(x0: np.ndarray, x1: np.ndarray, line_ids: np.ndarray) -> np.ndarray:
+    """
+    Column gaps as an (n, 2) array of [start, end) x-ranges. Built from an
+    x-coverage histogram: each word adds 1 to the bins it spans, and runs of
+    sparsely covered bins — away from the page edges — are candidates. Full-
+    width lines cross every gutter, so "sparse" is relative to how densely
+    the text columns are covered, not zero. `line_ids` (from cluster_lines)
+    lets each candidate be checked line by line, see _is_column_gap.
+    """
+    left = x0.min()
+    n_bins = int(np.ceil((x1.max() - left) / BIN_WIDTH)) + 1
+    first = ((x0 - left) // BIN_WIDTH).astype(np.int64)
+    last = np.ceil((x1 - left) / BIN_WIDTH).astype(np.int64)
+
+    delta = np.zeros(n_bins + 1, dtype=np.int64)
+    np.add.at(delta, first, 1)
+    np.add.at(delta, last, -1)
+    coverage = np.cumsum(delta)[:n_bins]
+
+    empty = coverage <= GUTTER_DENSITY * np.percentile(coverage, 90)
+    edges = np.diff(np.concatenate(([0], empty.astype(np.int8), [0])))
+    run_starts, run_ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+    min_bins = MIN_GUTTER / BIN_WIDTH
+    keep = (run_ends - run_starts >= min_bins) & (run_starts > 0) & (run_ends < n_bins)
+
+    # Ragged line ends make a sparse run wider than the gap itself; narrow
+    # each run to its least-covered bins so edge words aren't seen as crossing
+    gutters = []
+    for start, end in zip(run_starts[keep].tolist(), run_ends[keep].tolist()):
+        run = coverage[start:end]
+        core = np.flatnonzero(run == run.min())
+        gutters.append((start + core[0], start + core[-1] + 1))
+    gutters = np.array(gutters, dtype=np.float64).reshape(-1, 2) * BIN_WIDTH + left
+
+    valid = [g for g in gutters if _is_column_gap(g, x0, x1, line_ids)]
+    return np.array(valid, dtype=np.float64).reshape(-1, 2)
+
+
+def _is_column_gap(gutter: np.ndarray, x0: np.ndarray, x1: np.ndarray, line_ids: np.ndarray) -> bool:
+    """
+    Whether a sparse x-range really separates two columns. Each side must
+    hold a real share of the words, on several multi-word lines. Right-
+    aligned fields at the end of entry lines ("Engineer, Acme … 2016 - 2019")
+    also leave a gap: text right of it that is right-aligned and mostly
+    shares its lines with text on the left is not a column.
+    """
+    left, right = x1 <= gutter[0], x0 >= gutter[1]
+    n_words, n_lines = len(x0), int(line_ids.max()) + 1
+    if left.sum() < MIN_COLUMN_SHARE * n_words or right.sum() < MIN_COLUMN_SHARE * n_words:
+        return False
+
+    left_words = np.bincount(line_ids, weights=left, minlength=n_lines)
+    right_words = np.bincount(line_ids, weights=right, minlength=n_lines)
+    if (left_words >= 2).sum() < MIN_COLUMN_LINES or (right_words >= 2).sum() < MIN_COLUMN_LINES:
+        return False
+
+    rows = right_words > 0
+    shared = (rows & (left_words > 0)).sum() / rows.sum()
+    if shared <= SHARED_ROWS:
+        return True
+    # Per right-side line: where its text starts and ends. A column has a
+    # common left edge; right-aligned fields have a common right edge.
+    starts = np.full(n_lines, np.inf)
+    ends = np.full(n_lines, -np.inf)
+    np.minimum.at(starts, line_ids[right], x0[right])
+    np.maximum.at(ends, line_ids[right], x1[right])
+    return bool(starts[rows].std() <= ends[rows].std())
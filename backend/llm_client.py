@@ -0,0 +1,420 @@
+"""
+backend/llm_client.py
+---------------------------
+Provider client layer for the LLM calls: rate limiting, retries and a
+circuit breaker around every Groq/Ollama request.
+
+    limiter  — token buckets for requests/minute and tokens/minute, kept in
+               line with the provider's x-ratelimit-* headers
+    retries  — jittered exponential backoff on 429/5xx/network errors, using
+               the provider's retry-after when it sends one
+    breaker  — after N consecutive failures, fail fast for a cool-down
+               instead of queueing more requests behind a dead provider
+
+Usage:
+    llm = ProviderClient.from_env("groq")
+    response = llm.send(client.post, request_kwargs, tokens=1200)
+    response = await llm.send_async(async_client.post, request_kwargs, tokens=1200)
+    async with llm.stream(async_client, request_kwargs, tokens=1200) as response:
+        ...
+
+Point GROQ_BASE_URL / OLLAMA_BASE_URL at fake_provider.py to exercise all of
+this locally.
+"""
+
+import asyncio
+import email.utils
+import os
+import random
+import re
+import threading
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
+import httpx
+
+from metrics import LLM_ERRORS
+
+
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+# Default quotas (Groq free tier for llama-3.1-8b-instant); 0 = unlimited
+_DEFAULT_QUOTAS = {"groq": (30, 6000), "ollama": (0, 0)}
+
+
+class CircuitOpenError(Exception):
+    """The provider failed repeatedly; calls are refused until the cool-down ends."""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(f"{provider} is unavailable (circuit open). Retry in {retry_in:.0f}s.")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+# ─── Rate limiting ────────────────────────────────────────────────────────────
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at `per_minute / 60` per second.
+    reserve() debits immediately (the level may go negative) and returns how
+    long the caller must wait, so concurrent callers queue up fairly.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._refill()
+            self.level -= min(amount, self.capacity)
+            return max(0.0, -self.level / self.rate)
+
+    def refund(self, amount: float) -> None:
+        """Give back (or, if negative, take more of) an earlier reservation."""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self.level = min(self.capacity, self.level + amount)
+
+    def clamp(self, remaining: float) -> None:
+        """The provider says only `remaining` is left — never believe we have more."""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self.level = min(self.level, remaining)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets for one provider."""
+
+    def __init__(self, rpm: float = 0, tpm: float = 0):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self._paused_until = 0.0
+
+    def reserve(self, tokens: int) -> float:
+        """Seconds to wait before sending a request of about `tokens` tokens."""
+        wait = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        return max(wait, self._paused_until - time.monotonic())
+
+    def acquire(self, tokens: int) -> None:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int) -> None:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Correct the token bucket once the provider reports real usage."""
+        self.tokens.refund(estimated - actual)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back (after a 429 with retry-after)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def observe(self, headers: httpx.Headers) -> None:
+        """Follow Groq's x-ratelimit-remaining-* headers."""
+        remaining = headers.get("x-ratelimit-remaining-requests")
+        if remaining is not None and remaining.isdigit():
+            self.requests.clamp(int(remaining))
+        remaining = headers.get("x-ratelimit-remaining-tokens")
+        if remaining is not None and remaining.isdigit():
+            self.tokens.clamp(int(remaining))
+
+
+# ─── Circuit breaker ──────────────────────────────────────────────────────────
+
+class CircuitBreaker:
+    """
+    closed → (threshold consecutive failures) → open → (reset_timeout) →
+    half-open: one trial call; success closes the circuit, failure re-opens it.
+    A trial that ends with neither (429, another exception, cancellation) is
+    released by its caller, and the next call becomes the trial.
+    """
+
+    def __init__(self, provider: str, threshold: int = 5, reset_timeout: float = 30.0):
+        self.provider = provider
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial = 0             # token of the call holding the half-open trial, 0 = none
+        self._trial_at = 0.0
+        self._trials = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    @property
+    def trial_stale(self) -> bool:
+        """A trial call has been out for longer than reset_timeout — likely hung."""
+        return bool(self._trial) and time.monotonic() - self._trial_at >= self.reset_timeout
+
+    def before(self) -> int:
+        """
+        Raise CircuitOpenError unless a call may go out now. Returns a trial
+        token (0 if the circuit is closed) to hand to release() when the call ends.
+        """
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return 0
+            if state == "half_open" and not self._trial:
+                self._trials += 1
+                self._trial = self._trials
+                self._trial_at = time.monotonic()
+                return self._trial
+            retry_in = self.reset_timeout - (time.monotonic() - self.opened_at)
+            raise CircuitOpenError(self.provider, max(retry_in, 1.0))
+
+    def release(self, token: int) -> None:
+        """End the caller's trial if success()/failure() didn't; the circuit stays half-open."""
+        with self._lock:
+            if token and self._trial == token:
+                self._trial = 0
+
+    def success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = 0
+
+    def failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                if self.opened_at is None or self._trial:
+                    print(f"[LLM] {self.provider}: circuit open after {self.failures} failures")
+                self.opened_at = time.monotonic()
+            self._trial = 0
+
+
+# ─── Retries ──────────────────────────────────────────────────────────────────
+
+class RetryPolicy:
+    """Full-jitter exponential backoff, overridden by the provider's retry-after."""
+
+    def __init__(self, max_retries: int = 4, base: float = 0.5, cap: float = 20.0):
+        self.max_retries = max_retries
+        self.base = base
+        self.cap = cap
+
+    def delay(self, attempt: int, response: httpx.Response | None = None) -> float:
+        hinted = retry_after_seconds(response) if response is not None else None
+        if hinted is not None:
+            return min(hinted, self.cap * 3)
+        return random.uniform(0, min(self.cap, self.base * 2 ** attempt))
+
+
+def retry_after_seconds(response: httpx.Response) -> float | None:
+    """retry-after as seconds or an HTTP date; Groq also sends x-ratelimit-reset-* durations."""
+    value = response.headers.get("retry-after")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            parsed = email.utils.parsedate_to_datetime(value)
+            if parsed is not None:
+                return max(0.0, parsed.timestamp() - time.time())
+    if response.status_code == 429:
+        resets = [
+            _duration(response.headers.get(name, ""))
+            for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+        ]
+        resets = [r for r in resets if r is not None]
+        if resets:
+            return min(resets)
+    return None
+
+
+_DURATION_RE = re.compile(r"(?:(\d+(?:\.\d+)?)h)?(?:(\d+(?:\.\d+)?)m(?!s))?(?:(\d+(?:\.\d+)?)s)?(?:(\d+(?:\.\d+)?)ms)?$")
+
+
+def _duration(value: str) -> float | None:
+    """Parse Groq's "1m2.5s" / "450ms" style durations."""
+    match = _DURATION_RE.match(value.strip()) if value else None
+    if not match or not any(match.groups()):
+        return None
+    h, m, s, ms = (float(g) if g else 0.0 for g in match.groups())
+    return h * 3600 + m * 60 + s + ms / 1000
+
+
+# ─── Provider client ──────────────────────────────────────────────────────────
+
+class ProviderClient:
+    """Limiter + retries + breaker for one provider. Thread-safe; works sync and async."""
+
+    def __init__(
+        self,
+        name: str,
+        limiter: RateLimiter | None = None,
+        breaker: CircuitBreaker | None = None,
+        retry: RetryPolicy | None = None,
+    ):
+        self.name = name
+        self.limiter = limiter or RateLimiter()
+        self.breaker = breaker or CircuitBreaker(name)
+        self.retry = retry or RetryPolicy()
+        self.retries = 0
+        self.throttled = 0
+
+    @classmethod
+    def from_env(cls, name: str, label: str | None = None) -> "ProviderClient":
+        """
+        <NAME>_RPM / <NAME>_TPM quotas; LLM_MAX_RETRIES, LLM_BREAKER_THRESHOLD, LLM_BREAKER_RESET.
+        `label` names this client in logs and errors when several hosts share a provider type.
+        """
+        prefix = name.upper()
+        rpm, tpm = _DEFAULT_QUOTAS.get(name, (0, 0))
+        label = label or name
+        return cls(
+            label,
+            limiter=RateLimiter(
+                rpm=float(os.environ.get(f"{prefix}_RPM", rpm)),
+                tpm=float(os.environ.get(f"{prefix}_TPM", tpm)),
+            ),
+            breaker=CircuitBreaker(
+                label,
+                threshold=int(os.environ.get("LLM_BREAKER_THRESHOLD", 5)),
+                reset_timeout=float(os.environ.get("LLM_BREAKER_RESET", 30)),
+            ),
+            retry=RetryPolicy(max_retries=int(os.environ.get("LLM_MAX_RETRIES", 4))),
+        )
+
+    def send(self, post: Callable[..., httpx.Response], request: dict, tokens: int) -> httpx.Response:
+        """POST with rate limiting and retries; raises for the final failed response."""
+        for attempt in range(self.retry.max_retries + 1):
+            trial = self.breaker.before()
+            try:
+                self.limiter.acquire(tokens)
+                try:
+                    response = post(**request)
+                except httpx.TransportError:
+                    if not self._failed(attempt):
+                        raise
+                    retry = True
+                    delay = self.retry.delay(attempt)
+                else:
+                    retry = self._should_retry(attempt, response)
+                    delay = self.retry.delay(attempt, response) if retry else 0.0
+            finally:
+                self.breaker.release(trial)
+            if not retry:
+                return response
+            time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def send_async(self, post: Callable, request: dict, tokens: int) -> httpx.Response:
+        for attempt in range(self.retry.max_retries + 1):
+            trial = self.breaker.before()
+            try:
+                await self.limiter.acquire_async(tokens)
+                try:
+                    response = await post(**request)
+                except httpx.TransportError:
+                    if not self._failed(attempt):
+                        raise
+                    retry = True
+                    delay = self.retry.delay(attempt)
+                else:
+                    retry = self._should_retry(attempt, response)
+                    delay = self.retry.delay(attempt, response) if retry else 0.0
+            finally:
+                # A 429, another exception or cancellation ends the trial too
+                self.breaker.release(trial)
+            if not retry:
+                return response
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    @asynccontextmanager
+    async def stream(self, client: httpx.AsyncClient, request: dict, tokens: int) -> AsyncIterator[httpx.Response]:
+        """
+        Streaming POST. Retries happen only before the body starts — once
+        tokens are flowing to the caller, a failure is final.
+        """
+        started = False
+        for attempt in range(self.retry.max_retries + 1):
+            trial = self.breaker.before()
+            try:
+                await self.limiter.acquire_async(tokens)
+                async with client.stream("POST", **request) as response:
+                    if self._should_retry(attempt, response):
+                        delay = self.retry.delay(attempt, response)
+                    else:
+                        response.raise_for_status()
+                        started = True
+                        yield response
+                        return
+            except httpx.TransportError:
+                if started or not self._failed(attempt):
+                    raise
+                delay = self.retry.delay(attempt)
+            finally:
+                self.breaker.release(trial)
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            "provider": self.name,
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "retries": self.retries,
+            "throttled": self.throttled,
+        }
+
+    def _should_retry(self, attempt: int, response: httpx.Response) -> bool:
+        """Record the outcome; True if the request should be sent again."""
+        self.limiter.observe(response.headers)
+        if response.status_code not in RETRY_STATUSES:
+            self.breaker.success()
+            return False
+        LLM_ERRORS.inc(backend=self.name, reason=str(response.status_code))
+
+        if response.status_code == 429:
+            # Throttled, not down: slow everyone down, don't trip the breaker
+            self.throttled += 1
+            hinted = retry_after_seconds(response)
+            if hinted:
+                self.limiter.pause(hinted)
+        else:
+            self.breaker.failure()
+
+        if attempt >= self.retry.max_retries:
+            return False
+        self.retries += 1
+        print(f"[LLM] {self.name}: HTTP {response.status_code}, retrying ({attempt + 1}/{self.retry.max_retries})")
+        return True
+
+    def _failed(self, attempt: int) -> bool:
+        """Network error: count it against the breaker; True if worth retrying."""
+        LLM_ERRORS.inc(backend=self.name, reason="connection")
+        self.breaker.failure()
+        if attempt >= self.retry.max_retries or self.breaker.state == "open":
+            return False
+        self.retries += 1
+        print(f"[LLM] {self.name}: connection error, retrying ({attempt + 1}/{self.retry.max_retries})")
+        return True
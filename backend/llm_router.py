@@ -0,0 +1,433 @@
+"""
+backend/llm_router.py
+---------------------------
+LLM backends and the router that spreads extraction calls across them.
+
+A backend is one endpoint speaking one protocol:
+    groq                         — Groq cloud (OpenAI-style chat completions)
+    ollama@http://gpu1:11434     — an Ollama host (/api/generate)
+    openai@https://host/v1#model — any OpenAI-compatible server (vLLM, LM Studio, ...)
+
+List them in LLM_BACKENDS (comma-separated); without it, LLM_PROVIDER picks
+a single backend as before. The router keeps an EWMA of each backend's
+latency and sends every call to the fastest healthy one (circuit closed).
+If no answer arrives by that backend's p95 latency, a hedged duplicate goes
+to the next backend; the first valid JSON wins and the other is cancelled.
+Failures fail over to the next backend.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from urllib.parse import urlparse
+
+import httpx
+
+from llm_client import ProviderClient
+from metrics import CHARS, LLM_FAILURES, LLM_TOKENS
+from tokens import TokenMeter, TokenUsage, estimate_tokens
+
+
+# Output tokens reserved against the TPM quota before the real count is known
+EXPECTED_COMPLETION_TOKENS = 1000
+
+# Hedge deadline until a backend has enough samples for a p95
+DEFAULT_HEDGE_AFTER = 15.0
+MIN_SAMPLES_FOR_P95 = 5
+
+
+# ─── Backends ─────────────────────────────────────────────────────────────────
+
+class Backend:
+    """One LLM endpoint: request format, rate limits/retries, latency stats."""
+
+    kind = ""
+
+    def __init__(self, name: str, base_url: str, model: str, meter: TokenMeter):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.meter = meter
+        self.client = ProviderClient.from_env(self.kind, label=name)
+        self.ewma: float | None = None
+        self.samples: deque[float] = deque(maxlen=100)
+
+    # Latency tracking
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.ewma = seconds if self.ewma is None else 0.8 * self.ewma + 0.2 * seconds
+
+    def p95(self) -> float | None:
+        if len(self.samples) < MIN_SAMPLES_FOR_P95:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def hedge_after(self) -> float:
+        p95 = self.p95()
+        if p95 is not None:
+            return p95
+        return 2 * self.ewma if self.ewma is not None else DEFAULT_HEDGE_AFTER
+
+    @property
+    def healthy(self) -> bool:
+        # A half-open circuit whose trial call hangs refuses everyone else too
+        breaker = self.client.breaker
+        return breaker.state != "open" and not breaker.trial_stale
+
+    # Calls
+
+    def complete(self, post: Callable[..., httpx.Response], system: str, user_prompt: str) -> str:
+        request = self.request(system, user_prompt)
+        response = self.client.send(post, request, self._budget(system, user_prompt))
+        response.raise_for_status()
+        return self._content(response.json(), system, user_prompt)
+
+    async def complete_async(self, client: httpx.AsyncClient, system: str, user_prompt: str) -> str:
+        request = self.request(system, user_prompt)
+        response = await self.client.send_async(client.post, request, self._budget(system, user_prompt))
+        response.raise_for_status()
+        return self._content(response.json(), system, user_prompt)
+
+    def stream(self, client: httpx.AsyncClient, system: str, user_prompt: str) -> AsyncIterator[str]:
+        raise NotImplementedError
+
+    def request(self, system: str, user_prompt: str) -> dict:
+        raise NotImplementedError
+
+    def _content(self, body: dict, system: str, user_prompt: str) -> str:
+        raise NotImplementedError
+
+    def _budget(self, system: str, user_prompt: str) -> int:
+        """Tokens to reserve against the provider's TPM quota for one call."""
+        return estimate_tokens(system + user_prompt) + EXPECTED_COMPLETION_TOKENS
+
+    def _record(self, usage: TokenUsage, system: str, user_prompt: str, content: str) -> None:
+        self.meter.record(usage)
+        LLM_TOKENS.inc(usage.prompt_tokens, backend=self.name, kind="prompt")
+        LLM_TOKENS.inc(usage.completion_tokens, backend=self.name, kind="completion")
+        CHARS.inc(len(system) + len(user_prompt), stage="llm", direction="in")
+        CHARS.inc(len(content), stage="llm", direction="out")
+        self.client.limiter.settle(
+            self._budget(system, user_prompt), usage.prompt_tokens + usage.completion_tokens
+        )
+
+    def stats(self) -> dict:
+        p95 = self.p95()
+        return {
+            "name": self.name,
+            "model": self.model,
+            "healthy": self.healthy,
+            "ewma_ms": round(self.ewma * 1000) if self.ewma is not None else None,
+            "p95_ms": round(p95 * 1000) if p95 is not None else None,
+            "samples": len(self.samples),
+            **self.client.stats(),
+        }
+
+
+class OllamaBackend(Backend):
+    kind = "ollama"
+
+    def request(self, system: str, user_prompt: str) -> dict:
+        """Request kwargs for Ollama's /api/generate (shared by sync + async)."""
+        return {
+            "url": f"{self.base_url}/api/generate",
+            "json": {
+                "model": self.model,
+                "prompt": system + "\n\n" + user_prompt,
+                "stream": False,
+                "format": "json",   # forces Ollama to output valid JSON
+            },
+            # Local models can be slow to generate, but a dead host should fail fast
+            "timeout": httpx.Timeout(float(os.environ.get("OLLAMA_TIMEOUT", 300)), connect=5.0),
+        }
+
+    def _content(self, body: dict, system: str, user_prompt: str) -> str:
+        content = body["response"]
+        self._record(TokenUsage.from_ollama(body, system + user_prompt, content), system, user_prompt, content)
+        return content
+
+    async def stream(self, client: httpx.AsyncClient, system: str, user_prompt: str) -> AsyncIterator[str]:
+        """Ollama streams NDJSON: one {"response": "...", "done": bool} per line."""
+        request = self.request(system, user_prompt)
+        request["json"] = {**request["json"], "stream": True}
+        pieces: list[str] = []
+        async with self.client.stream(client, request, self._budget(system, user_prompt)) as response:
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("response"):
+                    pieces.append(chunk["response"])
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    # The final NDJSON line carries the eval counts
+                    content = "".join(pieces)
+                    usage = TokenUsage.from_ollama(chunk, system + user_prompt, content)
+                    self._record(usage, system, user_prompt, content)
+                    break
+
+
+class OpenAIBackend(Backend):
+    """OpenAI-style /chat/completions — Groq and any compatible server."""
+
+    kind = "openai"
+
+    def __init__(self, name: str, base_url: str, model: str, meter: TokenMeter,
+                 api_key: str = "", timeout: float = 60.0):
+        super().__init__(name, base_url, model, meter)
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def request(self, system: str, user_prompt: str) -> dict:
+        """Request kwargs for chat completions (shared by sync + async)."""
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return {
+            "url": f"{self.base_url}/chat/completions",
+            "headers": headers,
+            "json": {
+                "model": self.model,
+                "messages": [
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": user_prompt},
+                ],
+                "response_format": {"type": "json_object"},  # forces valid JSON
+                "temperature": 0.1,   # low temp = more deterministic extraction
+            },
+            "timeout": self.timeout,
+        }
+
+    def _content(self, body: dict, system: str, user_prompt: str) -> str:
+        content = body["choices"][0]["message"]["content"]
+        self._record(TokenUsage.from_groq(body, system + user_prompt, content), system, user_prompt, content)
+        return content
+
+    async def stream(self, client: httpx.AsyncClient, system: str, user_prompt: str) -> AsyncIterator[str]:
+        """OpenAI-style SSE: "data: {...choices[0].delta...}" lines."""
+        request = self.request(system, user_prompt)
+        request["json"] = {**request["json"], "stream": True}
+        pieces: list[str] = []
+        last: dict = {}
+        async with self.client.stream(client, request, self._budget(system, user_prompt)) as response:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                # Groq's last event carries usage under "x_groq"
+                last = json.loads(data)
+                delta = last["choices"][0].get("delta", {}).get("content") if last.get("choices") else None
+                if delta:
+                    pieces.append(delta)
+                    yield delta
+        content = "".join(pieces)
+        self._record(TokenUsage.from_groq(last, system + user_prompt, content), system, user_prompt, content)
+
+
+class GroqBackend(OpenAIBackend):
+    kind = "groq"
+
+
+def backends_from_env(meter: TokenMeter) -> list[Backend]:
+    """
+    Build backends from LLM_BACKENDS ("kind[@base_url][#model]", comma-separated),
+    or the single LLM_PROVIDER backend when it isn't set.
+    """
+    spec = os.environ.get("LLM_BACKENDS", "").strip()
+    if not spec:
+        provider = os.environ.get("LLM_PROVIDER", "ollama").lower()
+        spec = provider if provider in ("groq", "openai") else "ollama"
+
+    backends: list[Backend] = []
+    for item in spec.split(","):
+        kind, _, rest = item.strip().partition("@")
+        url, _, model = rest.partition("#")
+        kind = kind.lower()
+        name = f"{kind}@{urlparse(url).netloc or url}" if url else kind
+
+        if kind == "groq":
+            api_key = os.environ.get("GROQ_API_KEY", "")
+            if not api_key:
+                raise ValueError("GROQ_API_KEY is not set. Add it to your .env file.")
+            backends.append(GroqBackend(
+                name,
+                url or os.environ.get("GROQ_BASE_URL", "https://api.groq.com/openai/v1"),
+                model or os.environ.get("GROQ_MODEL", "llama-3.1-8b-instant"),
+                meter,
+                api_key=api_key,
+                timeout=30,           # Groq is fast, 30s is plenty
+            ))
+        elif kind == "ollama":
+            backends.append(OllamaBackend(
+                name,
+                url or os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434"),
+                model or os.environ.get("OLLAMA_MODEL", "llama3.1"),
+                meter,
+            ))
+        elif kind == "openai":
+            backends.append(OpenAIBackend(
+                name,
+                url or os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1"),
+                model or os.environ.get("OPENAI_MODEL", "gpt-4o-mini"),
+                meter,
+                api_key=os.environ.get("OPENAI_API_KEY", ""),
+                timeout=float(os.environ.get("OPENAI_TIMEOUT", 60)),
+            ))
+        else:
+            raise ValueError(f"Unknown LLM backend '{item.strip()}' in LLM_BACKENDS.")
+
+    names = [b.name for b in backends]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate LLM backends in LLM_BACKENDS: {', '.join(names)}")
+    return backends
+
+
+# ─── Router ───────────────────────────────────────────────────────────────────
+
+class LLMRouter:
+    """Fastest-healthy-first routing with failover, and hedging for async calls."""
+
+    def __init__(self, backends: list[Backend], hedge: bool = True):
+        self.backends = backends
+        self.hedge = hedge and len(backends) > 1
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+    @classmethod
+    def from_env(cls, meter: TokenMeter) -> "LLMRouter":
+        hedge = os.environ.get("LLM_HEDGE", "1") not in ("0", "false", "no")
+        return cls(backends_from_env(meter), hedge=hedge)
+
+    def ranked(self, exclude: tuple[Backend, ...] = ()) -> list[Backend]:
+        """
+        Healthy backends, fastest first (untried ones first, so they get
+        measured), then the ones with an open circuit — those fail fast, which
+        keeps the error a caller sees meaningful when everything is down.
+        """
+        candidates = [b for b in self.backends if b not in exclude]
+        return sorted(candidates, key=lambda b: (not b.healthy, b.ewma if b.ewma is not None else 0.0))
+
+    def complete(
+        self,
+        post: Callable[..., httpx.Response],
+        system: str,
+        user_prompt: str,
+        validate: Callable[[str], object],
+    ) -> str:
+        """Blocking call: try backends in rank order until one returns valid JSON."""
+        last_error: Exception | None = None
+        for backend in self.ranked():
+            start = time.monotonic()
+            try:
+                raw = backend.complete(post, system, user_prompt)
+                validate(raw)
+            except Exception as e:
+                last_error = self._failed(backend, e)
+                continue
+            backend.observe(time.monotonic() - start)
+            return raw
+        raise last_error or RuntimeError("No LLM backends configured.")
+
+    async def complete_async(
+        self,
+        client: httpx.AsyncClient,
+        system: str,
+        user_prompt: str,
+        validate: Callable[[str], object],
+    ) -> str:
+        """
+        Start on the best backend; if it hasn't answered by its p95 latency,
+        hedge on the next one. First valid response wins, the rest are
+        cancelled. A failure starts the next untried backend right away.
+        """
+        untried = self.ranked()
+        if not untried:
+            raise RuntimeError("No LLM backends configured.")
+
+        async def attempt(backend: Backend) -> str:
+            start = time.monotonic()
+            raw = await backend.complete_async(client, system, user_prompt)
+            validate(raw)
+            backend.observe(time.monotonic() - start)
+            return raw
+
+        first = untried.pop(0)
+        running: dict[asyncio.Task, Backend] = {asyncio.ensure_future(attempt(first)): first}
+        hedge: Backend | None = None
+        hedge_at = first.hedge_after() if self.hedge else None
+        last_error: Exception | None = None
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, timeout=hedge_at, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Deadline passed with no answer: hedge once on the next backend
+                    hedge_at = None
+                    if untried:
+                        hedge = untried.pop(0)
+                        self.hedged += 1
+                        print(f"[LLM] {first.name} slower than {first.hedge_after():.1f}s — hedging on {hedge.name}")
+                        running[asyncio.ensure_future(attempt(hedge))] = hedge
+                    continue
+
+                for task in done:
+                    backend = running.pop(task)
+                    try:
+                        raw = task.result()
+                    except Exception as e:
+                        last_error = self._failed(backend, e)
+                        continue
+                    if backend is hedge:
+                        self.hedge_wins += 1
+                    return raw
+
+                if not running and untried:
+                    backend = untried.pop(0)
+                    running[asyncio.ensure_future(attempt(backend))] = backend
+            raise last_error or RuntimeError("No LLM backend returned a response.")
+        finally:
+            for task in running:
+                task.cancel()
+            # Let the losers unwind, so a cancelled half-open trial is released before we return
+            await asyncio.gather(*running, return_exceptions=True)
+
+    async def stream(self, client: httpx.AsyncClient, system: str, user_prompt: str) -> AsyncIterator[str]:
+        """Stream from the best backend; fail over only if nothing was sent yet."""
+        last_error: Exception | None = None
+        for backend in self.ranked():
+            started = False
+            start = time.monotonic()
+            try:
+                async for piece in backend.stream(client, system, user_prompt):
+                    started = True
+                    yield piece
+            except Exception as e:
+                if started:
+                    raise
+                last_error = self._failed(backend, e)
+                continue
+            backend.observe(time.monotonic() - start)
+            return
+        raise last_error or RuntimeError("No LLM backends configured.")
+
+    def stats(self) -> dict:
+        return {
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "failovers": self.failovers,
+            "backends": [b.stats() for b in self.backends],
+        }
+
+    def _failed(self, backend: Backend, error: Exception) -> Exception:
+        LLM_FAILURES.inc(backend=backend.name, error=type(error).__name__)
+        if len(self.backends) > 1:
+            self.failovers += 1
+            print(f"[LLM] {backend.name} failed ({type(error).__name__}: {str(error)[:120]}) — trying next backend")
+        return error
@@ -0,0 +1,245 @@
+"""
+backend/metrics.py
+------------------------
+Per-stage timing and Prometheus metrics, without extra dependencies.
+
+Wrap a pipeline stage in `stage()`:
+
+    with stage("llm"):
+        resume_data = extractor.extract(raw_text)
+
+Each stage lands in the resume_stage_seconds histogram, and — inside an HTTP
+request or a job — in that request's Server-Timing header:
+
+    Server-Timing: pdf;dur=41.2, llm;dur=2310.8, github;dur=380.1, merge;dur=0.1, total;dur=2752.4
+
+GET /metrics renders every metric below in the Prometheus text format.
+"""
+
+import bisect
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+# ─── Metric types ─────────────────────────────────────────────────────────────
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def _format_labels(self, key: tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labels, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return super().render() + [f"{self.name}{self._format_labels(k)} {_number(v)}" for k, v in values]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = ()):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket (non-cumulative) + overflow, sum]
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted((k, (list(c), t[0])) for k, (c, t) in self._values.items())
+        lines = super().render()
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{self._format_labels(key, le)} {cumulative}")
+            cumulative += counts[-1]
+            lines.append(f"{self.name}_bucket{self._format_labels(key, _INF)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {_number(total)}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {cumulative}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY: list[_Metric] = []
+_INF = 'le="+Inf"'
+
+
+def render() -> str:
+    """Every registered metric in the Prometheus text exposition format."""
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+# ─── Metrics ──────────────────────────────────────────────────────────────────
+
+_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+STAGE_SECONDS = Histogram(
+    "resume_stage_seconds", "Time spent in each pipeline stage (pdf, llm, github, merge).",
+    ("stage",), _SECONDS,
+)
+PDF_PAGES = Histogram("resume_pdf_pages", "Pages per parsed PDF.", (), (1, 2, 3, 4, 5, 10, 20, 50))
+CHARS = Counter(
+    "resume_chars_total", "Stage input/output size: PDF bytes in, text chars out; LLM prompt and response chars.",
+    ("stage", "direction"),
+)
+LLM_TOKENS = Counter("resume_llm_tokens_total", "LLM tokens by backend and kind (prompt/completion).",
+                     ("backend", "kind"))
+LLM_ERRORS = Counter(
+    "resume_llm_provider_errors_total",
+    "Failed LLM attempts by backend and reason (HTTP status or 'connection'), retried or not.",
+    ("backend", "reason"),
+)
+LLM_FAILURES = Counter("resume_llm_call_failures_total", "LLM calls that failed after retries, by error type.",
+                       ("backend", "error"))
+HTTP_SECONDS = Histogram("http_request_duration_seconds", "API request latency.",
+                         ("method", "route", "status"), _SECONDS)
+
+
+# ─── Stage timing ─────────────────────────────────────────────────────────────
+
+_timings: ContextVar[list[tuple[str, float]] | None] = ContextVar("timings", default=None)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block into resume_stage_seconds and the current Server-Timing."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - start)
+
+
+def record_stage(name: str, seconds: float) -> None:
+    """Record a stage timed elsewhere, e.g. in a worker process whose metrics we can't see."""
+    STAGE_SECONDS.observe(seconds, stage=name)
+    timings = _timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+def collect_timings() -> list[tuple[str, float]]:
+    """Start collecting stage timings in this context (and tasks created from it)."""
+    timings: list[tuple[str, float]] = []
+    _timings.set(timings)
+    return timings
+
+
+def add_timings(entries: list[tuple[str, float]]) -> None:
+    """Fold timings gathered elsewhere (e.g. by a job worker) into this request's."""
+    timings = _timings.get()
+    if timings is not None:
+        timings.extend(entries)
+
+
+def timing_totals(entries: list[tuple[str, float]]) -> dict[str, float]:
+    """Milliseconds per stage; repeated stages (early + late GitHub fetch) are summed."""
+    totals: dict[str, float] = {}
+    for name, seconds in entries:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return {name: round(seconds * 1000, 1) for name, seconds in totals.items()}
+
+
+def server_timing(entries: list[tuple[str, float]]) -> str:
+    """Server-Timing header value."""
+    return ", ".join(f"{name};dur={ms:.1f}" for name, ms in timing_totals(entries).items())
+
+
+class MetricsMiddleware:
+    """
+    Time every HTTP request into http_request_duration_seconds and attach a
+    Server-Timing header with the stages that ran while handling it. Event
+    streams are left out: their headers go out before any stage has run, so
+    they end with a `timing` event instead (api.py).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        timings = collect_timings()
+        status = 500
+
+        async def timed_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if _is_event_stream(message):
+                    return await send(message)
+                entries = timings + [("total", time.perf_counter() - start)]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(entries).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            # Route template, not the raw path, to keep label cardinality bounded
+            route = scope.get("route")
+            HTTP_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status),
+            )
+
+
+def _is_event_stream(message: dict) -> bool:
+    return any(
+        name.lower() == b"content-type" and value.startswith(b"text/event-stream")
+        for name, value in message.get("headers", [])
+    )
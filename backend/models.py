@@ -0,0 +1,67 @@
+"""
+backend/models.py
+-----------------------
+The resume data model: what extractor.py produces and render.py consumes.
+Kept apart from the extractor so code that only reads or writes results
+(rendering, the API's result store) doesn't load the LLM client stack.
+
+Slotted: no per-instance __dict__, which matters when a batch export holds
+thousands of these. Converting to/from dicts and JSON is codec.py's job.
+"""
+
+from dataclasses import dataclass, field
+
+from codec import to_plain
+
+
+@dataclass(slots=True)
+class ContactInfo:
+    name: str = ""
+    email: str = ""
+    phone: str = ""
+    location: str = ""
+    linkedin: str = ""
+    github: str = ""
+    website: str = ""
+
+
+@dataclass(slots=True)
+class Experience:
+    company: str = ""
+    role: str = ""
+    duration: str = ""
+    location: str = ""
+    highlights: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Project:
+    name: str = ""
+    description: str = ""
+    tech_stack: list[str] = field(default_factory=list)
+    url: str = ""
+    github_url: str = ""
+
+
+@dataclass(slots=True)
+class Education:
+    institution: str = ""
+    degree: str = ""
+    field_of_study: str = ""
+    graduation_year: str = ""
+    gpa: str = ""
+
+
+@dataclass(slots=True)
+class ResumeData:
+    contact: ContactInfo = field(default_factory=ContactInfo)
+    summary: str = ""
+    skills: list[str] = field(default_factory=list)
+    experience: list[Experience] = field(default_factory=list)
+    projects: list[Project] = field(default_factory=list)
+    education: list[Education] = field(default_factory=list)
+    certifications: list[str] = field(default_factory=list)
+    languages: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return to_plain(self)
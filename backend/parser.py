@@ -1,45 +1,298 @@
 """
 backend/parser.py
 -----------------------
-PDF text extraction using pdfplumber (primary) with PyMuPDF as fallback.
+PDF text extraction. PyMuPDF (C, one pass per page) does the work; pdfplumber
+is only brought in for pages that look like tables, where its layout analysis
+is worth the cost. The PDF is read once and both libraries share the bytes,
+which can come straight from memory (an upload) — no temp file needed.
 Handles messy layouts, multi-column resumes, and scanned PDFs gracefully.
 """
 
+import io
+import multiprocessing
+import os
 import re
-import pdfplumber
-import fitz  # PyMuPDF fallback
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Union
 
+import fitz  # PyMuPDF
 
-def extract_text_from_pdf(file_path: str) -> str:
+from layout import page_lines
+from metrics import CHARS, PDF_PAGES
+
+
+# A path, or the PDF itself as bytes / bytearray / memoryview / binary file object
+PdfSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+
+
+# Header/footer cropping — top 5% and bottom 5% of each page
+CROP_TOP = 0.05
+CROP_BOTTOM = 0.95
+
+# A page with at least this many horizontal AND vertical ruling lines is
+# treated as a table and handed to pdfplumber
+TABLE_MIN_RULES = 3
+
+# Page-parallel extraction (only when a process pool is passed in)
+PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", 8))
+PAGE_TIMEOUT = float(os.environ.get("PDF_PAGE_TIMEOUT", 10))
+
+
+def extract_text_from_pdf(
+    source: PdfSource, pool: ProcessPoolExecutor | None = None, workers: int = 0
+) -> str:
     """
-    Extract raw text from a PDF resume.
-    Tries pdfplumber first (better for structured/formatted PDFs),
-    falls back to PyMuPDF for edge cases.
+    Extract raw text from a PDF resume, given a file path or the PDF bytes.
+    PDF_ENGINE=pymupdf (default) uses the single-pass PyMuPDF engine;
+    PDF_ENGINE=pdfplumber forces pdfplumber for every page.
+
+    With a `pool` (see start_page_pool) and its process count as `workers`,
+    PDFs of PARALLEL_MIN_PAGES or more pages are split across the pool;
+    smaller ones stay in-process.
     """
-    text = _extract_with_pdfplumber(file_path)
+    if pool is not None and workers < 1:
+        raise TypeError("extract_text_from_pdf: pass the pool's process count as workers")
+    data = read_pdf_bytes(source)
 
-    # If pdfplumber returns too little text, try PyMuPDF
-    if len(text.strip()) < 100:
-        text = _extract_with_pymupdf(file_path)
+    doc = fitz.open(stream=data, filetype="pdf")
+    PDF_PAGES.observe(doc.page_count)
+    CHARS.inc(len(data), stage="pdf", direction="in")
+    try:
+        if pool is not None and doc.page_count >= PARALLEL_MIN_PAGES:
+            pages_text = _extract_pages_parallel(pool, workers, doc, data)
+        else:
+            pages_text = _extract_pages(doc, data, range(doc.page_count))
+        text = "\n\n".join(t for t in pages_text if t)
+
+        # Too little text inside the crop box — take everything PyMuPDF sees
+        if len(text.strip()) < 100:
+            text = _extract_with_pymupdf(doc)
+    finally:
+        doc.close()
 
-    return _clean_text(text)
+    text = _clean_text(text)
+    CHARS.inc(len(text), stage="pdf", direction="out")
+    return text
 
 
-def _extract_with_pdfplumber(file_path: str) -> str:
+def extract_text_timed(source: PdfSource) -> tuple[str, float]:
+    """
+    extract_text_from_pdf plus the seconds it took, for running on a process
+    pool: the pdf stage timing is recorded by the caller (metrics.record_stage),
+    since metrics observed in a worker process never reach /metrics.
+    """
+    start = time.perf_counter()
+    text = extract_text_from_pdf(source)
+    return text, time.perf_counter() - start
+
+
+def read_pdf_bytes(source: PdfSource) -> bytes | bytearray:
+    """
+    Normalize a PdfSource to something fitz.open(stream=...) accepts without
+    copying where possible (PyMuPDF rejects memoryview, so unwrap it).
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return source
+    if isinstance(source, memoryview):
+        obj = source.obj
+        if isinstance(obj, (bytes, bytearray)) and source.contiguous and source.nbytes == len(obj):
+            return obj
+        return source.tobytes()
+    if hasattr(source, "read"):
+        return source.read()
+    with open(source, "rb") as f:
+        return f.read()
+
+
+def describe_source(source: PdfSource) -> str:
+    """Short label for log lines: the path, or the size of an in-memory PDF."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return f"<{memoryview(source).nbytes} bytes in memory>"
+    if hasattr(source, "read"):
+        return f"<{type(source).__name__}>"
+    return str(source)
+
+
+def _extract_pages(doc: fitz.Document, data: bytes | bytearray, page_numbers: range) -> list[str]:
+    """Text of the given pages, in order, using the engine chosen by PDF_ENGINE."""
+    if os.environ.get("PDF_ENGINE", "pymupdf").lower() == "pdfplumber":
+        return _pdfplumber_pages(data, list(page_numbers))
+    return _extract_with_pymupdf_words(doc, data, page_numbers)
+
+
+# ─── Page-parallel extraction ─────────────────────────────────────────────────
+
+def start_page_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Start a process pool for page-parallel extraction and wait until every
+    worker has imported PyMuPDF, so the first request doesn't pay for it.
+    Uses "spawn": forking a process that runs an event loop and threads is unsafe.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    for future in [pool.submit(_warm_worker) for _ in range(workers)]:
+        future.result()
+    return pool
+
+
+def _warm_worker() -> int:
+    warm_up()
+    # Hold each task briefly so the warm-up spreads across all workers
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def warm_up() -> None:
+    """
+    Run a generated one-page PDF through the extraction path in this process,
+    so MuPDF's first-use setup (~50ms) isn't paid by the first upload. Not
+    counted in the metrics.
+    """
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Jane Doe\njane@example.com\n• Python, Go, SQL")
+    data = doc.tobytes()
+    doc.close()
+
+    doc = fitz.open(stream=data, filetype="pdf")
+    try:
+        _clean_text("\n\n".join(_extract_pages(doc, data, range(doc.page_count))))
+    finally:
+        doc.close()
+
+
+def _extract_pages_parallel(
+    pool: ProcessPoolExecutor, workers: int, doc: fitz.Document, data: bytes | bytearray
+) -> list[str]:
+    """
+    One contiguous page range per worker; results are stitched back in page
+    order. A range that overruns PAGE_TIMEOUT per page is logged and left empty
+    rather than holding up the request. Its worker can't be interrupted, so
+    it stays busy until the range finishes; a range still waiting in the
+    queue is cancelled.
+    """
+    page_count = doc.page_count
+    size = -(-page_count // workers)
+    ranges = [range(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+    started = time.monotonic()
+    try:
+        futures = [pool.submit(_extract_pages_worker, bytes(data), r.start, r.stop) for r in ranges]
+    except BrokenProcessPool:
+        print("[PDF] Process pool is broken — extracting in-process")
+        return _extract_pages(doc, data, range(page_count))
+
+    pages_text: list[str] = []
+    for r, future in zip(ranges, futures):
+        deadline = started + PAGE_TIMEOUT * len(r)
+        try:
+            pages_text.extend(future.result(timeout=max(0.0, deadline - time.monotonic())))
+        except FutureTimeout:
+            state = "dropped from the queue" if future.cancel() else "left to finish in the pool"
+            print(f"[PDF] Pages {r.start + 1}-{r.stop} timed out after {PAGE_TIMEOUT * len(r):.0f}s — {state}")
+            pages_text.extend([""] * len(r))
+    return pages_text
+
+
+def _extract_pages_worker(data: bytes, start: int, stop: int) -> list[str]:
+    """Runs in a pool worker: extract pages [start, stop) of the PDF."""
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return _extract_pages(doc, data, range(start, stop))
+
+
+# ─── Fast path: PyMuPDF words ─────────────────────────────────────────────────
+
+def _extract_with_pymupdf_words(doc: fitz.Document, data: bytes | bytearray, page_numbers: range) -> list[str]:
+    """
+    Same reading order as the pdfplumber path (crop, then group words into
+    lines by vertical position), built from page.get_text("words") tuples.
+    Pages flagged as table-heavy are re-read with pdfplumber.
+    """
+    pages_text: list[str] = []
+    table_pages: list[int] = []
+
+    for number in page_numbers:
+        page = doc[number]
+        if _is_table_heavy(page):
+            table_pages.append(number)
+            pages_text.append("")
+            continue
+        pages_text.append(_page_text_pymupdf(page))
+
+    if table_pages:
+        for number, text in zip(table_pages, _pdfplumber_pages(data, table_pages)):
+            pages_text[number - page_numbers.start] = text
+
+    return pages_text
+
+
+def _page_text_pymupdf(page: fitz.Page) -> str:
+    height = page.rect.height
+    top, bottom = height * CROP_TOP, height * CROP_BOTTOM
+
+    # (x0, y0, x1, y1, text, block_no, line_no, word_no)
+    words = [w for w in page.get_text("words") if w[1] >= top and w[3] <= bottom]
+    return _words_to_text(words)
+
+
+def _words_to_text(words: list[tuple]) -> str:
+    """
+    Page text from (x0, top, x1, bottom, text) word boxes. PDF_LAYOUT=columns
+    (default) reads multi-column pages column by column; PDF_LAYOUT=lines
+    keeps the plain top-to-bottom line grouping.
+    """
+    if not words:
+        return ""
+    if os.environ.get("PDF_LAYOUT", "columns").lower() == "lines":
+        lines = _group_words_into_lines([{"text": w[4], "x0": w[0], "top": w[1]} for w in words], y_tolerance=5)
+        return "\n".join(" ".join(w["text"] for w in line) for line in lines)
+    return "\n".join(page_lines(words))
+
+
+def _is_table_heavy(page: fitz.Page) -> bool:
+    """
+    Cheap table detector: count ruling lines in the page's vector drawings.
+    Section underlines are horizontal only, so it takes a grid (rules in both
+    directions, or several cell rectangles) to trip it.
+    """
+    horizontal = vertical = cells = 0
+    for path in page.get_cdrawings():
+        for item in path.get("items", ()):
+            if item[0] == "l":
+                p1, p2 = item[1], item[2]
+                if abs(p1[1] - p2[1]) < 1:
+                    horizontal += 1
+                elif abs(p1[0] - p2[0]) < 1:
+                    vertical += 1
+            elif item[0] == "re":
+                rect = fitz.Rect(item[1])
+                if rect.width > 10 and rect.height > 5:
+                    cells += 1
+        if (horizontal >= TABLE_MIN_RULES and vertical >= TABLE_MIN_RULES) or cells >= 2 * TABLE_MIN_RULES:
+            return True
+    return False
+
+
+# ─── Table pages: pdfplumber ──────────────────────────────────────────────────
+
+def _pdfplumber_pages(data: bytes | bytearray, page_numbers: list[int] | None = None) -> list[str]:
     """
     pdfplumber is best for resumes with tables, columns, and structured layouts.
     We sort words by their vertical (top) position to preserve reading order.
+    Imported here — most resumes never reach this path.
     """
-    full_text = []
+    import pdfplumber
 
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
+    texts = []
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        pages = pdf.pages if page_numbers is None else [pdf.pages[n] for n in page_numbers]
+        for page in pages:
             # Crop out headers/footers (top 5% and bottom 5% of page)
             cropped = page.within_bbox((
                 0,
-                page.height * 0.05,
+                page.height * CROP_TOP,
                 page.width,
-                page.height * 0.95
+                page.height * CROP_BOTTOM
             ))
 
             # Extract words with position data for smarter ordering
@@ -50,15 +303,10 @@ def _extract_with_pdfplumber(file_path: str) -> str:
                 use_text_flow=True,
             )
 
-            if not words:
-                continue
+            # Group words into lines (and columns) by position
+            texts.append(_words_to_text([(w["x0"], w["top"], w["x1"], w["bottom"], w["text"]) for w in words]))
 
-            # Group words into lines based on vertical proximity
-            lines = _group_words_into_lines(words, y_tolerance=5)
-            page_text = "\n".join(" ".join(w["text"] for w in line) for line in lines)
-            full_text.append(page_text)
-
-    return "\n\n".join(full_text)
+    return texts
 
 
 def _group_words_into_lines(words: list[dict], y_tolerance: int = 5) -> list[list[dict]]:
@@ -82,17 +330,9 @@ def _group_words_into_lines(words: list[dict], y_tolerance: int = 5) -> list[lis
     return lines
 
 
-def _extract_with_pymupdf(file_path: str) -> str:
-    """PyMuPDF fallback — faster, handles more PDF variants including some scanned ones."""
-    doc = fitz.open(file_path)
-    pages_text = []
-
-    for page in doc:
-        text = page.get_text("text")  # plain text, preserves layout
-        pages_text.append(text)
-
-    doc.close()
-    return "\n\n".join(pages_text)
+def _extract_with_pymupdf(doc: fitz.Document) -> str:
+    """Uncropped plain text — handles more PDF variants including some scanned ones."""
+    return "\n\n".join(page.get_text("text") for page in doc)
 
 
 def _clean_text(text: str) -> str:
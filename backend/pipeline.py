@@ -5,15 +5,38 @@ Top-level pipeline: PDF → raw text → structured data → GitHub enrichment.
 This is the single entry point your Next.js API route will call.
 """
 
-from dataclasses import dataclass, field, asdict
+import asyncio
+import os
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import AbstractAsyncContextManager, nullcontext
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from parser import extract_text_from_pdf
-from extractor import ResumeExtractor, ResumeData
-from github_enricher import GitHubEnricher, GitHubProfile
+import httpx
 
+from cache import ExtractionCache, cache_from_env, make_cache_key
+from codec import to_plain
+from http_pool import make_client, make_async_client, pool_stats
+from parser import PdfSource, describe_source, extract_text_from_pdf, start_page_pool, warm_up
+from extractor import ResumeExtractor
+from github_enricher import GitHubEnricher, GitHubProfile, find_github_handle
+from metrics import stage
+from models import Project, ResumeData
 
-@dataclass
+if TYPE_CHECKING:
+    from batch import BatchSummary
+
+
+def _check_exists(pdf_path: PdfSource) -> None:
+    """Paths must exist; in-memory PDFs are validated by the parser."""
+    if isinstance(pdf_path, (str, os.PathLike)) and not Path(pdf_path).exists():
+        raise FileNotFoundError(f"PDF not found: {pdf_path}")
+
+
+@dataclass(slots=True)
 class PortfolioData:
     """Final output — everything needed to render any portfolio template."""
     resume: ResumeData = field(default_factory=ResumeData)
@@ -21,11 +44,10 @@ class PortfolioData:
     raw_text: str = ""          # useful for debugging / re-extraction
 
     def to_dict(self) -> dict:
-        result = {
+        return {
             "resume": self.resume.to_dict(),
-            "github": asdict(self.github) if self.github else None,
+            "github": to_plain(self.github),
         }
-        return result
 
 
 class ResumePipeline:
@@ -42,9 +64,23 @@ class ResumePipeline:
     def __init__(
         self,
         github_token: str | None = None,
+        cache: ExtractionCache | None = None,
     ):
-        self.extractor = ResumeExtractor()
-        self.enricher = GitHubEnricher(token=github_token)
+        # One pooled keep-alive client for every LLM + GitHub call this pipeline makes
+        self.http_client = make_client()
+        self.extractor = ResumeExtractor(
+            cache=cache if cache is not None else cache_from_env(),
+            client=self.http_client,
+        )
+        self.enricher = GitHubEnricher(
+            token=github_token,
+            cache=cache_from_env("GITHUB_CACHE", default_ttl=7 * 24 * 3600, table="github_cache"),
+            client=self.http_client,
+        )
+        # Last parsed version of each client document id, for incremental re-extraction
+        self.documents = cache_from_env("DOCUMENT_STORE", default_ttl=30 * 24 * 3600, table="documents")
+        # GitHub fetches run here while the LLM call holds the main thread
+        self.github_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="github")
 
     # def __init__(
     #     self,
@@ -55,50 +91,190 @@ class ResumePipeline:
     #     self.extractor = ResumeExtractor(api_key=anthropic_api_key, model=model)
     #     self.enricher = GitHubEnricher(token=github_token)
 
-    def run(self, pdf_path: str, github_username: str | None = None) -> PortfolioData:
+    def run(
+        self,
+        pdf_path: PdfSource,
+        github_username: str | None = None,
+        document_id: str | None = None,
+    ) -> PortfolioData:
         """
         Full pipeline:
         1. Extract text from PDF
         2. Parse structured data via LLM
-        3. Optionally enrich with GitHub data
+        3. Optionally enrich with GitHub data (started during step 2 when
+           the handle is known before the LLM answers)
 
         Args:
-            pdf_path: Local path to the uploaded resume PDF.
+            pdf_path: Local path to the resume PDF, or the PDF itself as
+                      bytes / bytearray / memoryview / binary file object.
             github_username: Optional override. If not provided, uses whatever
                              GitHub handle was found in the resume itself.
+            document_id: Optional client id for this document. When a previous
+                         version was parsed under the same id, only the
+                         sections whose text changed are re-extracted.
 
         Returns:
             PortfolioData ready for template rendering.
         """
-        if not Path(pdf_path).exists():
-            raise FileNotFoundError(f"PDF not found: {pdf_path}")
+        _check_exists(pdf_path)
 
         # Step 1: Extract text
-        print(f"[1/3] Extracting text from {pdf_path}...")
-        raw_text = extract_text_from_pdf(pdf_path)
+        print(f"[1/3] Extracting text from {describe_source(pdf_path)}...")
+        with stage("pdf"):
+            raw_text = extract_text_from_pdf(pdf_path)
+
+        return self.run_text(raw_text, github_username, document_id)
+
+    def run_text(
+        self,
+        raw_text: str,
+        github_username: str | None = None,
+        document_id: str | None = None,
+        github_fetch: Callable[[str], Future[GitHubProfile | None]] | None = None,
+    ) -> PortfolioData:
+        """
+        Steps 2 and 3 of run() for text that has already been extracted.
+
+        Args:
+            raw_text: Resume text, as returned by extract_text_from_pdf.
+            github_username: As for run().
+            document_id: As for run().
+            github_fetch: Starts a GitHub fetch for a bare username and
+                          returns its future (default: fetch_github). The
+                          batch runner passes one that shares a fetch between
+                          resumes naming the same user.
+        """
+        fetch = github_fetch or self.fetch_github
+
+        # Step 2: LLM extraction — GitHub fetch starts alongside it when the
+        # handle is already known (form field or github.com/<user> in the text)
+        early_handle = self._early_github_handle(raw_text, github_username)
+        github_future = None
+        if early_handle:
+            print(f"[2/3] Fetching GitHub data for '{early_handle}' in parallel...")
+            github_future = fetch(early_handle)
 
-        # Step 2: LLM extraction
         print("[2/3] Running LLM extraction...")
-        resume_data = self.extractor.extract(raw_text)
+        try:
+            with stage("llm"):
+                resume_data = self._extract_resume(raw_text, document_id)
+        except BaseException:
+            if github_future:
+                github_future.cancel()
+            raise
 
         # Step 3: GitHub enrichment
-        handle = github_username or resume_data.contact.github
-        github_data = None
-        if handle:
-            print(f"[3/3] Fetching GitHub data for '{handle}'...")
-            github_data = self.enricher.fetch(handle)
-            if github_data:
-                # Merge GitHub projects into resume projects if not already there
-                resume_data = self._merge_github_projects(resume_data, github_data)
-        else:
+        github_data = github_future.result() if github_future else None
+        late_handle = self._late_github_handle(early_handle, resume_data, github_username)
+        if late_handle:
+            print(f"[3/3] Fetching GitHub data for '{late_handle}'...")
+            github_data = fetch(late_handle).result()
+        elif not early_handle:
             print("[3/3] No GitHub handle found — skipping enrichment.")
 
+        return self._assemble(raw_text, resume_data, github_data)
+
+    def run_many(
+        self,
+        source: str | os.PathLike,
+        output: str | os.PathLike,
+        workers: int | None = None,
+        llm_concurrency: int | None = None,
+    ) -> "BatchSummary":
+        """
+        Parse every PDF in a directory, glob or zip archive into a JSONL file
+        (one line per document, written as each finishes). See batch.py.
+
+        Args:
+            source: Directory, glob pattern or .zip archive of PDFs.
+            output: JSONL path; ids already written as done are skipped, so
+                    re-running after a crash resumes the batch.
+            workers: PDF parse processes (default: CPU count).
+            llm_concurrency: Documents in LLM extraction at once
+                             (default: LLM_CONCURRENCY_<PROVIDER>).
+        """
+        from batch import BatchRunner   # batch.py imports this module
+
+        return BatchRunner(self, workers=workers, llm_concurrency=llm_concurrency).run(source, output)
+
+    def _extract_resume(self, raw_text: str, document_id: str | None) -> ResumeData:
+        previous = self._previous_version(document_id)
+        if previous is not None:
+            resume_data = self.extractor.extract_incremental(raw_text, *previous)
+        else:
+            resume_data = self.extractor.extract(raw_text)
+        self._remember_version(document_id, raw_text, resume_data)
+        return resume_data
+
+    def _previous_version(self, document_id: str | None) -> tuple[str, ResumeData] | None:
+        """(raw_text, ResumeData) last parsed under this document id, if any."""
+        if not document_id or self.documents is None:
+            return None
+        stored = self.documents.get(make_cache_key("document", document_id))
+        if stored is None:
+            return None
+        return stored["raw_text"], self.extractor._dict_to_resume_data(stored["resume"])
+
+    def _remember_version(self, document_id: str | None, raw_text: str, resume_data: ResumeData) -> None:
+        # Stored before GitHub projects are merged in, so reuse stays resume-only
+        if document_id and self.documents is not None:
+            self.documents.set(
+                make_cache_key("document", document_id),
+                {"raw_text": raw_text, "resume": resume_data.to_dict()},
+            )
+
+    def fetch_github(self, username: str) -> Future[GitHubProfile | None]:
+        """Fetch a GitHub profile on the pipeline's GitHub threads (timed as the github stage)."""
+        return self.github_executor.submit(self._fetch_github, username)
+
+    def _fetch_github(self, handle: str) -> GitHubProfile | None:
+        with stage("github"):
+            return self.enricher.fetch(handle)
+
+    def _early_github_handle(self, raw_text: str, github_username: str | None) -> str:
+        """Handle we can fetch before the LLM returns: the form field, else a regex hit."""
+        if github_username:
+            return self.enricher._extract_username(github_username)
+        return find_github_handle(raw_text)
+
+    def _late_github_handle(
+        self, early_handle: str, resume: ResumeData, github_username: str | None
+    ) -> str:
+        """
+        Handle that still needs fetching once the LLM result is in — only when
+        nothing was fetched early, or the LLM found a different profile than the
+        pre-scan guessed. An explicit github_username always wins.
+        """
+        if github_username or not resume.contact.github:
+            return ""
+        handle = self.enricher._extract_username(resume.contact.github)
+        if handle.lower() == early_handle.lower():
+            return ""
+        return handle
+
+    def _assemble(
+        self, raw_text: str, resume_data: ResumeData, github_data: GitHubProfile | None
+    ) -> PortfolioData:
+        if github_data:
+            # Merge GitHub projects into resume projects if not already there
+            with stage("merge"):
+                resume_data = self._merge_github_projects(resume_data, github_data)
+
         return PortfolioData(
             resume=resume_data,
             github=github_data,
             raw_text=raw_text,
         )
 
+    def pool_stats(self) -> dict:
+        """Connection pool snapshot(s) for sizing HTTP_MAX_* settings."""
+        return {"sync": pool_stats(self.http_client)}
+
+    def close(self) -> None:
+        """Close the pooled HTTP client and the GitHub worker pool."""
+        self.http_client.close()
+        self.github_executor.shutdown(wait=False)
+
     def _merge_github_projects(
         self, resume: ResumeData, github: GitHubProfile
     ) -> ResumeData:
@@ -106,8 +282,6 @@ class ResumePipeline:
         If GitHub has repos that aren't mentioned in resume projects,
         add them. Avoids duplicates by checking repo name against existing project names.
         """
-        from .extractor import Project
-
         existing_names = {p.name.lower() for p in resume.projects}
 
         for repo in github.top_repos:
@@ -121,3 +295,215 @@ class ResumePipeline:
                 existing_names.add(repo.name.lower())
 
         return resume
+
+
+class AsyncResumePipeline(ResumePipeline):
+    """
+    Non-blocking variant of ResumePipeline for the FastAPI server.
+
+    PDF parsing is CPU-bound, so it runs on a bounded thread pool; the LLM and
+    GitHub calls are awaited on a shared, pooled httpx.AsyncClient. One event
+    loop can keep many uploads in flight instead of one at a time.
+
+    With PDF_PROCESSES > 0, long PDFs are additionally split page-wise across
+    a process pool that start() spins up once and keeps warm. Until it is
+    ready, PDFs are parsed in-process, so requests never wait for it.
+
+    Usage:
+        pipeline = AsyncResumePipeline()
+        await pipeline.start()           # opens the connection pool, warms the PDF engine
+        data = await pipeline.run("path/to/resume.pdf")
+        await pipeline.aclose()
+    """
+
+    def __init__(
+        self,
+        github_token: str | None = None,
+        cache: ExtractionCache | None = None,
+        pdf_workers: int | None = None,
+        pdf_processes: int | None = None,
+    ):
+        super().__init__(github_token=github_token, cache=cache)
+        self.pdf_executor = ThreadPoolExecutor(
+            max_workers=pdf_workers or int(os.environ.get("PDF_WORKERS", 4)),
+            thread_name_prefix="pdf",
+        )
+        self.pdf_processes = (
+            pdf_processes if pdf_processes is not None else int(os.environ.get("PDF_PROCESSES", 0))
+        )
+        self.page_pool: ProcessPoolExecutor | None = None
+        self.async_client: httpx.AsyncClient | None = None
+        self._warming: asyncio.Task | None = None
+
+    async def start(self, wait: bool = True) -> None:
+        """
+        Open the async connection pool and warm the PDF engine: MuPDF in this
+        process, then the page pool (call at app startup). With wait=False
+        the warm-up carries on in the background.
+        """
+        if self.async_client is None or self.async_client.is_closed:
+            self.async_client = make_async_client()
+        if self._warming is None:
+            self._warming = asyncio.create_task(self._warm_up())
+        if wait:
+            await asyncio.shield(self._warming)
+
+    async def _warm_up(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self.pdf_executor, warm_up)
+            if self.page_pool is None and self.pdf_processes > 0:
+                self.page_pool = await loop.run_in_executor(None, start_page_pool, self.pdf_processes)
+                print(f"[PDF] Page pool ready: {self.pdf_processes} processes")
+        except Exception as e:
+            # Not fatal: PDFs are still parsed, just in-process and cold
+            print(f"[PDF] Warm-up failed: {e}")
+
+    async def run(
+        self,
+        pdf_path: PdfSource,
+        github_username: str | None = None,
+        document_id: str | None = None,
+        llm_limit: AbstractAsyncContextManager | None = None,
+    ) -> PortfolioData:
+        """
+        Async version of ResumePipeline.run — same steps, same output.
+        `llm_limit` (e.g. an asyncio.Semaphore) is held for the LLM step
+        only, so PDF parsing and the GitHub fetch don't take up a slot.
+        """
+        raw_text = await self._extract_text(pdf_path)
+
+        # Step 2: LLM extraction, with the GitHub fetch running concurrently
+        early_handle, github_task = self._start_github(raw_text, github_username)
+
+        print("[2/3] Running LLM extraction...")
+        try:
+            async with llm_limit or nullcontext():
+                with stage("llm"):
+                    resume_data = await self._extract_resume_async(raw_text, document_id)
+        except BaseException:
+            if github_task:
+                github_task.cancel()
+            raise
+
+        # Step 3: GitHub enrichment
+        github_data = await self._finish_github(early_handle, github_task, resume_data, github_username)
+        return self._assemble(raw_text, resume_data, github_data)
+
+    async def run_stream(
+        self,
+        pdf_path: PdfSource,
+        github_username: str | None = None,
+        document_id: str | None = None,
+        llm_limit: AbstractAsyncContextManager | None = None,
+    ) -> AsyncIterator[tuple[str, object]]:
+        """
+        Streaming version of run(). Yields events as they become available:
+            ("section", {"name": "contact", "data": {...}})   — one per resume section
+            ("github", {...} | None)                           — enrichment result
+            ("portfolio", PortfolioData.to_dict())             — final merged output
+
+        A re-upload under a known document_id is extracted incrementally and
+        its sections are yielded together once the changed ones are done.
+        `llm_limit` is held for the LLM step only, as in run().
+        """
+        raw_text = await self._extract_text(pdf_path)
+        early_handle, github_task = self._start_github(raw_text, github_username)
+        previous = self._previous_version(document_id)
+
+        print("[2/3] Streaming LLM extraction...")
+        resume_data = None
+        try:
+            async with llm_limit or nullcontext():
+                with stage("llm"):
+                    if previous is not None:
+                        resume_data = await self.extractor.extract_incremental_async(
+                            raw_text, *previous, self.async_client
+                        )
+                        for name, value in resume_data.to_dict().items():
+                            yield "section", {"name": name, "data": value}
+                    else:
+                        async for name, value in self.extractor.extract_stream(raw_text, self.async_client):
+                            if name == "resume":
+                                resume_data = value
+                            else:
+                                yield "section", {"name": name, "data": value}
+            self._remember_version(document_id, raw_text, resume_data)
+        except BaseException:
+            if github_task:
+                github_task.cancel()
+            raise
+
+        github_data = await self._finish_github(early_handle, github_task, resume_data, github_username)
+        yield "github", to_plain(github_data)
+
+        data = self._assemble(raw_text, resume_data, github_data)
+        yield "portfolio", data.to_dict()
+
+    async def _extract_text(self, pdf_path: PdfSource) -> str:
+        _check_exists(pdf_path)
+
+        await self.start(wait=False)
+
+        # Step 1: Extract text (off the event loop)
+        print(f"[1/3] Extracting text from {describe_source(pdf_path)}...")
+        loop = asyncio.get_running_loop()
+        with stage("pdf"):
+            return await loop.run_in_executor(
+                self.pdf_executor,
+                partial(extract_text_from_pdf, pdf_path, pool=self.page_pool, workers=self.pdf_processes),
+            )
+
+    async def _extract_resume_async(self, raw_text: str, document_id: str | None) -> ResumeData:
+        previous = self._previous_version(document_id)
+        if previous is not None:
+            resume_data = await self.extractor.extract_incremental_async(raw_text, *previous, self.async_client)
+        else:
+            resume_data = await self.extractor.extract_async(raw_text, self.async_client)
+        self._remember_version(document_id, raw_text, resume_data)
+        return resume_data
+
+    def _start_github(
+        self, raw_text: str, github_username: str | None
+    ) -> tuple[str, asyncio.Task | None]:
+        early_handle = self._early_github_handle(raw_text, github_username)
+        if not early_handle:
+            return early_handle, None
+        print(f"[2/3] Fetching GitHub data for '{early_handle}' in parallel...")
+        return early_handle, asyncio.create_task(self._fetch_github_async(early_handle))
+
+    async def _finish_github(
+        self,
+        early_handle: str,
+        github_task: asyncio.Task | None,
+        resume_data: ResumeData,
+        github_username: str | None,
+    ) -> GitHubProfile | None:
+        github_data = await github_task if github_task else None
+        late_handle = self._late_github_handle(early_handle, resume_data, github_username)
+        if late_handle:
+            print(f"[3/3] Fetching GitHub data for '{late_handle}'...")
+            github_data = await self._fetch_github_async(late_handle)
+        elif not early_handle:
+            print("[3/3] No GitHub handle found — skipping enrichment.")
+        return github_data
+
+    async def _fetch_github_async(self, handle: str) -> GitHubProfile | None:
+        with stage("github"):
+            return await self.enricher.fetch_async(handle, self.async_client)
+
+    def pool_stats(self) -> dict:
+        return {**super().pool_stats(), "async": pool_stats(self.async_client)}
+
+    async def aclose(self) -> None:
+        """Close the HTTP clients and worker pools."""
+        if self._warming is not None:
+            await self._warming     # a page pool still starting would otherwise be left running
+            self._warming = None
+        if self.async_client is not None:
+            await self.async_client.aclose()
+        self.pdf_executor.shutdown(wait=False)
+        if self.page_pool is not None:
+            self.page_pool.shutdown(wait=False, cancel_futures=True)
+            self.page_pool = None
+        self.close()
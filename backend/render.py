@@ -0,0 +1,345 @@
+"""
+backend/render.py
+-----------------------
+Server-side HTML export: PortfolioData.to_dict() → one self-contained HTML
+page per template (minimal, classic, bold), the same designs as the
+frontend's React templates.
+
+    renderer = PortfolioRenderer()
+    html = renderer.render(data, "minimal")          # bytes
+
+    python render.py results.jsonl out/ [--template minimal|classic|bold|all] [--workers 4]
+
+The CLI renders every finished document of a batch.py JSONL file, spread
+over a process pool (see render_many).
+
+Templates live in templates/<name>.html and are compiled to Python code
+once, when the renderer is created. Their CSS (templates/base.css plus
+templates/<name>.css) is minified once and inlined into every page. The
+output depends only on the template files and the normalized input, so
+identical input always renders byte-identical HTML — etag() hashes the
+input and can answer If-None-Match without rendering at all.
+
+Template syntax:
+    {{ expr }}                       escaped output
+    {% raw expr %}                   unescaped output
+    {% if expr %} … {% elif expr %} … {% else %} … {% end %}
+    {% for x in expr %} … {% end %}
+    {% set name = expr %}
+    {# comment #}
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from codec import to_plain
+from models import Education, Experience, Project, ResumeData
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+TEMPLATES = ("minimal", "classic", "bold")
+
+
+class TemplateError(ValueError):
+    pass
+
+
+# ─── Template compiler ────────────────────────────────────────────────────────
+
+_TOKEN = re.compile(r"\{\{(.*?)\}\}|\{%(.*?)%\}|\{#.*?#\}", re.S)
+_BLOCKS = ("if", "for")
+
+
+def _squeeze(text: str, after_tag: bool) -> str:
+    # Indentation and blank lines in the template never reach the page,
+    # nor does the line break after a {% %} tag
+    text = re.sub(r"\s*\n\s*", "\n", text)
+    return text.removeprefix("\n") if after_tag else text
+
+
+class Template:
+    """A template compiled to a Python function; render() fills it in."""
+
+    def __init__(self, source: str, name: str = "<string>"):
+        self.name = name
+        self.code = compile(self._generate(source), f"<template {name}>", "exec")
+
+    def render(self, **context) -> str:
+        namespace = {**_HELPERS, **context}
+        exec(self.code, namespace)
+        return namespace["_render"]()
+
+    def _generate(self, source: str) -> str:
+        lines = ["def _render():", "    _out = []", "    _w = _out.append"]
+        stack: list[str] = []
+        pos = 0
+        after_tag = False
+
+        def emit(code: str, depth: int = 0) -> None:
+            lines.append("    " * (len(stack) + 1 + depth) + code)
+
+        for match in _TOKEN.finditer(source):
+            text = _squeeze(source[pos:match.start()], after_tag)
+            if text:
+                emit(f"_w({text!r})")
+            pos = match.end()
+
+            expr, statement = match.group(1), match.group(2)
+            after_tag = expr is None
+            if expr is not None:
+                emit(f"_w(_e({expr.strip()}))")
+            elif statement is not None:
+                statement = statement.strip()
+                keyword, _, rest = statement.partition(" ")
+                if keyword in _BLOCKS:
+                    emit(f"{statement}:")
+                    stack.append(keyword)
+                    emit("pass")
+                elif keyword in ("elif", "else"):
+                    if not stack or stack[-1] != "if":
+                        raise TemplateError(f"{self.name}: {{% {keyword} %}} outside {{% if %}}")
+                    emit(f"{statement}:", depth=-1)
+                    emit("pass")
+                elif keyword == "end":
+                    if not stack:
+                        raise TemplateError(f"{self.name}: {{% end %}} without an open block")
+                    stack.pop()
+                elif keyword == "set":
+                    emit(rest)
+                elif keyword == "raw":
+                    emit(f"_w(_str({rest}))")
+                else:
+                    raise TemplateError(f"{self.name}: unknown tag {{% {keyword} %}}")
+
+        text = _squeeze(source[pos:], after_tag)
+        if text:
+            emit(f"_w({text!r})")
+        if stack:
+            raise TemplateError(f"{self.name}: unclosed {{% {stack[-1]} %}}")
+        lines.append("    return ''.join(_out)")
+        return "\n".join(lines)
+
+
+def _str(value: object) -> str:
+    return "" if value is None else str(value)
+
+
+def _escape(value: object) -> str:
+    return html.escape(_str(value), quote=True)
+
+
+# A bare host, optionally with a port and path: "janedoe.dev", "github.com/jane/p"
+_HOST_RE = re.compile(r"(?i)^[a-z0-9](?:[a-z0-9-]*[a-z0-9])?(?:\.[a-z0-9](?:[a-z0-9-]*[a-z0-9])?)*\.[a-z]{2,}(?::\d+)?(?:[/?#]\S*)?$")
+
+
+def _url(value: object) -> str:
+    """
+    An href for a link from the resume. http(s) and mailto links pass as-is,
+    scheme-less hosts ("janedoe.dev", "github.com/jane/p") get https://, and
+    anything else (javascript:, data:, ...) becomes '#'.
+    """
+    value = _str(value).strip()
+    if re.match(r"(?i)^(https?:|mailto:)", value):
+        return value
+    if value.startswith("//"):
+        value = value[2:]
+    if _HOST_RE.match(value):
+        return f"https://{value}"
+    return "#"
+
+
+def _profile_url(value: object, base: str) -> str:
+    """A handle or URL from the resume → full profile URL (github.com/<handle>, ...)."""
+    value = _str(value).strip()
+    if value.startswith("http"):
+        return value
+    value = value.removeprefix("www.").removeprefix(base.removeprefix("https://"))
+    return f"{base}{value.lstrip('/')}"
+
+
+_HELPERS = {"_e": _escape, "_str": _str, "url": _url, "profile_url": _profile_url}
+
+
+# ─── CSS ──────────────────────────────────────────────────────────────────────
+
+def minify_css(css: str) -> str:
+    """Comments and optional whitespace out; enough for our own stylesheets."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+# ─── Input ────────────────────────────────────────────────────────────────────
+
+_RESUME_DEFAULTS = ResumeData().to_dict()
+_ITEM_DEFAULTS = {
+    "experience": to_plain(Experience()),
+    "projects": to_plain(Project()),
+    "education": to_plain(Education()),
+}
+
+
+def normalize(data: dict) -> dict:
+    """
+    Fill in every field the templates read, so a partial or hand-written
+    portfolio renders instead of raising. Unknown keys are dropped.
+    """
+    resume = data.get("resume") or {}
+    normalized = {}
+    for key, default in _RESUME_DEFAULTS.items():
+        value = resume.get(key)
+        if isinstance(default, dict):
+            value = value if isinstance(value, dict) else {}
+            normalized[key] = {f: _str(value.get(f)) for f in default}
+        elif isinstance(default, list):
+            items = value if isinstance(value, list) else []
+            if key in _ITEM_DEFAULTS:
+                normalized[key] = [_with_defaults(item, _ITEM_DEFAULTS[key]) for item in items if isinstance(item, dict)]
+            else:
+                normalized[key] = [_str(item) for item in items if item]
+        else:
+            normalized[key] = _str(value)
+    github = data.get("github")
+    return {"resume": normalized, "github": github if isinstance(github, dict) else None}
+
+
+def _with_defaults(item: dict, defaults: dict) -> dict:
+    result = {}
+    for key, default in defaults.items():
+        value = item.get(key)
+        if isinstance(default, list):
+            result[key] = [_str(v) for v in value if v] if isinstance(value, list) else []
+        else:
+            result[key] = _str(value)
+    return result
+
+
+# ─── Renderer ─────────────────────────────────────────────────────────────────
+
+class PortfolioRenderer:
+    """
+    Every template compiled and its CSS bundled up front; after that a
+    render is a single pass over the data.
+    """
+
+    def __init__(self, template_dir: str | os.PathLike = TEMPLATE_DIR):
+        template_dir = Path(template_dir)
+        base_css = (template_dir / "base.css").read_text(encoding="utf-8")
+        self.templates: dict[str, Template] = {}
+        self.css: dict[str, str] = {}
+        fingerprint = hashlib.sha256()
+        for name in TEMPLATES:
+            source = (template_dir / f"{name}.html").read_text(encoding="utf-8")
+            css = base_css + (template_dir / f"{name}.css").read_text(encoding="utf-8")
+            self.templates[name] = Template(source, name)
+            self.css[name] = minify_css(css)
+            fingerprint.update(f"{name}\x00{source}\x00{css}\x00".encode())
+        # Changes with any template or stylesheet, so old ETags stop matching
+        self.version = fingerprint.hexdigest()[:12]
+
+    def render(self, data: dict, template: str) -> bytes:
+        """HTML for PortfolioData.to_dict()-shaped `data`; raises KeyError for an unknown template."""
+        portfolio = normalize(data)
+        page = self.templates[template].render(
+            **portfolio["resume"], github=portfolio["github"], css=self.css[template]
+        )
+        return page.encode("utf-8")
+
+    def etag(self, data: dict, template: str) -> str:
+        """Strong ETag for render(data, template), computed from the input alone."""
+        canonical = json.dumps(normalize(data), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        digest = hashlib.sha256(f"{self.version}\x00{template}\x00{canonical}".encode()).hexdigest()
+        return f'"{digest[:32]}"'
+
+
+# ─── Bulk rendering ───────────────────────────────────────────────────────────
+
+_worker_renderer: PortfolioRenderer | None = None
+
+
+def _init_worker() -> None:
+    global _worker_renderer
+    _worker_renderer = PortfolioRenderer()
+
+
+def _render_in_worker(data: dict, template: str) -> bytes:
+    return _worker_renderer.render(data, template)
+
+
+def render_many(
+    items: Iterable[tuple[dict, str]],
+    workers: int | None = None,
+    renderer: PortfolioRenderer | None = None,
+) -> list[bytes]:
+    """
+    Render (portfolio, template) pairs, returning pages in input order.
+    With workers > 0 they're spread over a process pool (each worker
+    compiles the templates once); workers=0 renders in this process.
+    """
+    items = list(items)
+    for _, template in items:
+        if template not in TEMPLATES:
+            raise KeyError(template)
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers <= 0 or len(items) < 2:
+        renderer = renderer or PortfolioRenderer()
+        return [renderer.render(data, template) for data, template in items]
+
+    # "spawn", like the PDF pool: forking a process with threads is unsafe
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker
+    ) as pool:
+        chunksize = max(1, len(items) // (workers * 4))
+        return list(pool.map(_render_in_worker, *zip(*items), chunksize=chunksize))
+
+
+def _file_name(record: dict, template: str) -> str:
+    name = record["result"]["resume"].get("contact", {}).get("name") or "portfolio"
+    slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "portfolio"
+    return f"{slug}-{record['id'][:12]}-{template}.html"
+
+
+# ─── CLI ──────────────────────────────────────────────────────────────────────
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Render batch.py results to portfolio HTML files.")
+    parser.add_argument("results", help="JSONL written by batch.py")
+    parser.add_argument("output", help="directory for the HTML files")
+    parser.add_argument("--template", choices=[*TEMPLATES, "all"], default="minimal")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    records = []
+    with open(args.results, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "done":
+                records.append(record)
+
+    out = Path(args.output)
+    out.mkdir(parents=True, exist_ok=True)
+    start = time.monotonic()
+    templates = TEMPLATES if args.template == "all" else (args.template,)
+    items = [(record, template) for record in records for template in templates]
+    pages = render_many(((record["result"], template) for record, template in items), args.workers)
+    for (record, template), page in zip(items, pages):
+        (out / _file_name(record, template)).write_bytes(page)
+    print(f"[RENDER] {len(pages)} pages → {out} in {time.monotonic() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
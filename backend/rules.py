@@ -0,0 +1,254 @@
+"""
+backend/rules.py
+----------------------
+Deterministic fast-path extraction — no LLM involved.
+
+Email, phone, LinkedIn, GitHub and website links follow fixed patterns, and
+skills can be matched against a bundled dictionary (data/skills.txt) with a
+single Aho-Corasick pass. Pattern matches are dropped from the LLM prompt,
+so the model generates fewer tokens; the name and skills are heuristics, so
+the LLM is still asked for them and these only fill gaps. With
+LLM_PROVIDER=none, these results are the whole answer.
+
+Usage:
+    prefill = extract_rule_based(raw_text)
+    prefill["contact"]["email"], prefill.get("skills")
+"""
+
+import re
+from pathlib import Path
+
+from github_enricher import find_github_handle
+from sections import split_sections
+
+
+SKILLS_PATH = Path(__file__).parent / "data" / "skills.txt"
+
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_PHONE_RE = re.compile(r"(?<![\w/])\+?\(?\d[\d\s().-]{7,18}\d(?![\w/])")
+_LINKEDIN_RE = re.compile(
+    r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/[A-Za-z0-9_%-]+/?", re.IGNORECASE
+)
+_GITHUB_RE = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[A-Za-z0-9-]+", re.IGNORECASE)
+_URL_RE = re.compile(
+    r"(?:https?://|www\.)[^\s|,;()<>]+"
+    r"|\b[a-z0-9][a-z0-9-]*(?:\.[a-z0-9-]+)*\.(?:dev|io|me|app|tech|site|xyz|page|com|net|org)"
+    r"(?:/[^\s|,;()<>]*)?(?![\w@])"
+)
+_NAME_RE = re.compile(r"^[A-Z][A-Za-z'’.-]+(?: [A-Z][A-Za-z'’.-]*){1,3}$")
+# A Title Case line with one of these is a headline ("Senior Software
+# Engineer"), not a name
+_TITLE_WORDS = {
+    "analyst", "architect", "consultant", "curriculum", "data", "designer", "developer",
+    "director", "engineer", "engineering", "intern", "junior", "lead", "manager", "principal",
+    "product", "profile", "resume", "scientist", "senior", "software", "specialist", "staff",
+    "student", "summary", "vitae",
+}
+
+# Skills are only scanned in the skills section, unless there isn't one
+_MIN_SKILLS_FOR_PREFILL = 3
+
+
+# ─── Aho-Corasick skills matcher ──────────────────────────────────────────────
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over lower-cased skill names. One pass over the text
+    finds every dictionary hit; hits are then filtered to whole words and
+    resolved leftmost-longest ("React Native" beats "React").
+    """
+
+    def __init__(self, entries: list[tuple[str, str, bool]]):
+        # entries: (alias, canonical, exact_case)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        self._entries = entries
+
+        for index, (alias, _, _) in enumerate(entries):
+            state = 0
+            for ch in alias.lower():
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(index)
+
+        # Breadth-first failure links
+        queue = list(self._goto[0].values())
+        while queue:
+            state = queue.pop(0)
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    @classmethod
+    def from_file(cls, path: Path = SKILLS_PATH) -> "SkillMatcher":
+        entries = []
+        for line in path.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            exact = line.startswith("!")
+            line = line.lstrip("!")
+            alias, _, canonical = line.partition("=>")
+            alias, canonical = alias.strip(), (canonical.strip() or alias.strip())
+            entries.append((alias, canonical, exact or len(alias) <= 2))
+        return cls(entries)
+
+    def find(self, text: str) -> list[str]:
+        """Canonical skill names found in `text`, in order of first appearance."""
+        lowered = text.lower()
+        hits: list[tuple[int, int, str]] = []   # (start, end, canonical)
+        state = 0
+        for pos, ch in enumerate(lowered):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for index in self._out[state]:
+                alias, canonical, exact = self._entries[index]
+                start, end = pos - len(alias) + 1, pos + 1
+                if exact and text[start:end] != alias:
+                    continue
+                if _is_word(text, start, end):
+                    hits.append((start, end, canonical))
+
+        # Leftmost-longest, non-overlapping
+        hits.sort(key=lambda h: (h[0], -(h[1] - h[0])))
+        found: list[str] = []
+        last_end = -1
+        for start, end, canonical in hits:
+            if start < last_end:
+                continue
+            last_end = end
+            if canonical not in found:
+                found.append(canonical)
+        return found
+
+
+def _is_word(text: str, start: int, end: int) -> bool:
+    """Reject hits glued to letters/digits ("Java" in "JavaScript", "Go" in "Google")."""
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    if before.isalnum() or after.isalnum():
+        return False
+    # "C" in "C++" / "C#" is handled by the longer match; a bare "C" followed
+    # by "+" or "#" that didn't match anything longer is not the C language
+    return not (after in "+#" and text[start:end] in ("C", "F"))
+
+
+_matcher: SkillMatcher | None = None
+
+
+def skill_matcher() -> SkillMatcher:
+    """Process-wide matcher, built on first use."""
+    global _matcher
+    if _matcher is None:
+        _matcher = SkillMatcher.from_file()
+    return _matcher
+
+
+# ─── Contact info ─────────────────────────────────────────────────────────────
+
+def extract_contact(text: str, header: str = "") -> dict:
+    """
+    Pattern-match contact fields. `header` (the text above the first section
+    heading) is searched first, then the whole document. Location is left to
+    the LLM — there's no reliable pattern for it.
+    """
+    header = header or text
+    contact = {
+        "name": _find_name(header),
+        "email": _first(_EMAIL_RE, header, text),
+        "phone": _find_phone(header) or _find_phone(text),
+        "location": "",
+        "linkedin": _first(_LINKEDIN_RE, header, text),
+        "github": _find_github(header) or _find_github(text),
+        "website": _find_website(header),
+    }
+    return contact
+
+
+def _first(pattern: re.Pattern, *texts: str) -> str:
+    for text in texts:
+        match = pattern.search(text)
+        if match:
+            return match.group(0).rstrip("/.")
+    return ""
+
+
+def _find_name(header: str) -> str:
+    """The first short Title Case line that isn't a link/email/phone or a job title."""
+    for line in header.split("\n")[:5]:
+        line = line.strip()
+        if not _NAME_RE.match(line) or "@" in line or any(c.isdigit() for c in line):
+            continue
+        if not _TITLE_WORDS.intersection(line.lower().split()):
+            return line
+    return ""
+
+
+def _find_phone(text: str) -> str:
+    for match in _PHONE_RE.finditer(text):
+        digits = re.sub(r"\D", "", match.group(0))
+        # 9-15 digits, and not a year range like "2019 - 2021 2022"
+        if 9 <= len(digits) <= 15 and not re.fullmatch(r"(?:(?:19|20)\d\d[\s-]*)+", match.group(0)):
+            return match.group(0).strip()
+    return ""
+
+
+def _find_github(text: str) -> str:
+    for match in _GITHUB_RE.finditer(text):
+        if find_github_handle(match.group(0)):
+            return match.group(0).rstrip("/")
+    return ""
+
+
+def _find_website(text: str) -> str:
+    for match in _URL_RE.finditer(text):
+        url = match.group(0).rstrip("/.")
+        lowered = url.lower()
+        if any(host in lowered for host in ("linkedin.com", "github.com")):
+            continue
+        # Skip the domain half of an email address
+        if text[max(0, match.start() - 1)] == "@":
+            continue
+        return url
+    return ""
+
+
+# ─── Entry point ──────────────────────────────────────────────────────────────
+
+def extract_rule_based(text: str) -> dict:
+    """
+    Partial resume dict ({"contact": {...}, "skills": [...]}) from patterns
+    alone. "skills" is only present when a skills section yielded enough
+    dictionary hits to trust — otherwise the LLM should extract them.
+    """
+    parts = split_sections(text)
+    header = next((body for kind, body in parts if kind == "header"), "")
+    result: dict = {"contact": extract_contact(text, header)}
+
+    skills_text = "\n".join(body for kind, body in parts if kind == "skills")
+    if skills_text:
+        skills = skill_matcher().find(skills_text)
+        if len(skills) >= _MIN_SKILLS_FOR_PREFILL:
+            result["skills"] = skills
+    return result
+
+
+def extract_rule_based_full(text: str) -> dict:
+    """Rules-only mode (LLM_PROVIDER=none): also scan the whole text for skills."""
+    result = extract_rule_based(text)
+    if "skills" not in result:
+        result["skills"] = skill_matcher().find(text)
+    return result
@@ -0,0 +1,229 @@
+"""
+backend/sections.py
+-------------------------
+Splits raw resume text on section headings so long resumes can be extracted
+in smaller, concurrent LLM calls instead of one truncated mega-prompt.
+
+    "Jane Doe / jane@x.com ..."      → header     → contact + summary
+    "EXPERIENCE ..."                 → experience
+    "PROJECTS ..."                   → projects
+    "EDUCATION ..."                  → education
+    "SKILLS / CERTIFICATIONS / ..."  → one small chunk for the short list sections
+"""
+
+import re
+from dataclasses import dataclass
+
+
+# Heading text (lower-cased, punctuation stripped) → schema section it holds
+SECTION_HEADINGS: dict[str, str] = {
+    # summary
+    "summary": "summary", "professional summary": "summary", "profile": "summary",
+    "professional profile": "summary", "about": "summary", "about me": "summary",
+    "objective": "summary", "career objective": "summary",
+    # experience
+    "experience": "experience", "work experience": "experience",
+    "professional experience": "experience", "relevant experience": "experience",
+    "employment": "experience", "employment history": "experience",
+    "work history": "experience", "career history": "experience",
+    "where i've worked": "experience", "internships": "experience",
+    # projects
+    "projects": "projects", "personal projects": "projects", "selected projects": "projects",
+    "side projects": "projects", "academic projects": "projects", "key projects": "projects",
+    # education
+    "education": "education", "academic background": "education",
+    "education and training": "education", "academics": "education",
+    # skills
+    "skills": "skills", "technical skills": "skills", "core competencies": "skills",
+    "technologies": "skills", "tech stack": "skills", "tools": "skills",
+    "skills and tools": "skills", "key skills": "skills",
+    # certifications
+    "certifications": "certifications", "certificates": "certifications",
+    "licenses and certifications": "certifications", "licenses & certifications": "certifications",
+    "courses and certifications": "certifications",
+    # languages
+    "languages": "languages", "spoken languages": "languages",
+}
+
+# Short list-like sections are batched into a single chunk to save calls
+_LIST_SECTIONS = ("skills", "certifications", "languages")
+
+_HEADING_CLEAN_RE = re.compile(r"[^a-z&' ]+")
+
+
+@dataclass
+class Chunk:
+    """A slice of resume text plus the schema sections to extract from it."""
+    sections: tuple[str, ...]
+    text: str
+
+
+def detect_heading(line: str) -> str | None:
+    """Return the section a heading line introduces, or None for body text."""
+    stripped = line.strip()
+    if not stripped or len(stripped) > 40:
+        return None
+    key = _HEADING_CLEAN_RE.sub(" ", stripped.lower()).strip()
+    key = re.sub(r"\s+", " ", key)
+    return SECTION_HEADINGS.get(key)
+
+
+def split_sections(text: str) -> list[tuple[str, str]]:
+    """
+    Split text into (section, body) pairs in document order. Text before the
+    first recognised heading is the "header" (name, contact details). Lines
+    under unrecognised headings stay with the section above them.
+    """
+    sections: list[tuple[str, list[str]]] = [("header", [])]
+    for line in text.split("\n"):
+        kind = detect_heading(line)
+        if kind is not None:
+            sections.append((kind, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(kind, "\n".join(lines).strip()) for kind, lines in sections if "\n".join(lines).strip()]
+
+
+# Section groups compared by incremental re-extraction → schema keys each
+# feeds. As in plan_chunks, the summary travels with the contact header.
+SECTION_GROUPS: dict[str, tuple[str, ...]] = {
+    "header": ("contact", "summary"),
+    "experience": ("experience",),
+    "projects": ("projects",),
+    "education": ("education",),
+    "skills": ("skills",),
+    "certifications": ("certifications",),
+    "languages": ("languages",),
+}
+
+
+def section_texts(text: str) -> dict[str, str]:
+    """Text of each section group in `text` (see SECTION_GROUPS)."""
+    groups: dict[str, str] = {}
+    for kind, body in split_sections(text):
+        group = "header" if kind == "summary" else kind
+        groups[group] = f"{groups[group]}\n\n{body}" if group in groups else body
+    return groups
+
+
+def changed_sections(old_text: str, new_text: str) -> list[str] | None:
+    """
+    Section groups whose text differs between two versions of a resume
+    (whitespace-insensitive), including ones added or removed. None when
+    either version has no recognised headings, so there is nothing to diff on.
+    """
+    old, new = section_texts(old_text), section_texts(new_text)
+    if len(old.keys() - {"header"}) < 1 or len(new.keys() - {"header"}) < 1:
+        return None
+    return [
+        group for group in SECTION_GROUPS
+        if " ".join(old.get(group, "").split()) != " ".join(new.get(group, "").split())
+    ]
+
+
+def plan_chunks(text: str, max_chars: int = 6000) -> list[Chunk]:
+    """
+    Group the sections of `text` into extraction chunks. Returns [] when no
+    section headings are found — callers should fall back to one prompt.
+    """
+    parts = split_sections(text)
+    if len({kind for kind, _ in parts} - {"header"}) < 2:
+        return []
+
+    merged: dict[str, list[str]] = {}
+    for kind, body in parts:
+        # The summary is short and sits next to the contact block
+        bucket = "header" if kind == "summary" else kind
+        merged.setdefault(bucket, []).append(body)
+
+    chunks: list[Chunk] = []
+    if "header" in merged:
+        chunks.append(Chunk(("contact", "summary"), "\n\n".join(merged.pop("header"))))
+
+    list_text = [t for kind in _LIST_SECTIONS for t in merged.pop(kind, [])]
+    list_keys = tuple(kind for kind, _ in parts if kind in _LIST_SECTIONS)
+    if list_text:
+        chunks.append(Chunk(tuple(dict.fromkeys(list_keys)), "\n\n".join(list_text)))
+
+    for kind, bodies in merged.items():
+        for piece in _split_long("\n\n".join(bodies), max_chars):
+            chunks.append(Chunk((kind,), piece))
+
+    return chunks
+
+
+# A line that dates an entry: "Jan 2020 – Present", "2017 - 2019", "Acme, May 2021"
+_DATE_RE = re.compile(
+    r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+(?:19|20)\d{2}\b"
+    r"|\b(?:19|20)\d{2}\s*(?:-|–|—|to)\s*(?:(?:19|20)\d{2}\b|present|current|now)"
+    r"|\b(?:19|20)\d{2}\s*$",
+    re.IGNORECASE,
+)
+_BULLET_RE = re.compile(r"^(?:[-•·▪*◦‣]|\d+[.)])\s")
+_MAX_DATE_LINE = 100
+_MAX_TITLE_LINES = 2
+
+
+def _is_date_line(line: str) -> bool:
+    return len(line) <= _MAX_DATE_LINE and not _BULLET_RE.match(line) and bool(_DATE_RE.search(line))
+
+
+def _is_title_line(line: str) -> bool:
+    # Not a bullet, a date line, or a wrapped bullet's lower-case continuation
+    return not (_BULLET_RE.match(line) or _is_date_line(line) or line[0].islower())
+
+
+def split_entries(text: str) -> list[str]:
+    """
+    Split a section into its entries (one job, project or degree each). An
+    entry ends at a blank line, or where the next entry's date line appears —
+    together with the title lines right above it, so "Engineer — Acme" stays
+    with its dates and bullets.
+    """
+    lines = text.split("\n")
+    starts = [0]
+    dated = False           # the current entry already has its date line
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped:
+            if i + 1 < len(lines):
+                starts.append(i + 1)
+            dated = False
+            continue
+        if not _is_date_line(stripped):
+            continue
+        if dated:
+            start = i
+            while (
+                start > starts[-1] + 1 and i - start < _MAX_TITLE_LINES
+                and lines[start - 1].strip()
+                and _is_title_line(lines[start - 1].strip())
+            ):
+                start -= 1
+            starts.append(start)
+        dated = True
+
+    bounds = sorted(set(starts)) + [len(lines)]
+    entries = ["\n".join(lines[a:b]).strip() for a, b in zip(bounds, bounds[1:])]
+    return [e for e in entries if e]
+
+
+def _split_long(text: str, max_chars: int) -> list[str]:
+    """
+    Split an oversized section under max_chars, cutting only between entries
+    (see split_entries) — an entry larger than max_chars stays whole rather
+    than sending a job's title and its bullets to different LLM calls.
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    pieces: list[str] = []
+    current = ""
+    for entry in split_entries(text):
+        if current and len(current) + len(entry) + 2 > max_chars:
+            pieces.append(current)
+            current = ""
+        current = f"{current}\n\n{entry}" if current else entry
+    if current:
+        pieces.append(current)
+    return pieces
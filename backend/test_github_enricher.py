@@ -0,0 +1,96 @@
+"""
+backend/test_github_enricher.py
+-------------------------------------
+GitHubEnricher's cache paths against the fake GitHub in fake_provider.py,
+in-process (no server, no network):
+
+    cd backend && python -m pytest test_github_enricher.py
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import fake_provider
+from cache import MemoryCache
+from github_enricher import GitHubEnricher
+
+
+@pytest.fixture(autouse=True)
+def fresh_fake(monkeypatch):
+    fake_provider.github_requests.clear()
+    monkeypatch.delenv("FAKE_GITHUB_REMAINING", raising=False)
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.setenv("GITHUB_RATE_LIMIT_RESERVE", "5")
+    yield
+
+
+def _enricher(cache_fresh: float = 600, token: str | None = None) -> GitHubEnricher:
+    enricher = GitHubEnricher(
+        token=token or "", cache=MemoryCache(), base_url="http://testserver",
+        client=TestClient(fake_provider.app),
+    )
+    enricher.cache_fresh_seconds = cache_fresh
+    return enricher
+
+
+def test_fresh_entry_skips_the_network():
+    enricher = _enricher()
+    first = enricher.fetch("janedoe")
+    calls = len(fake_provider.github_requests)
+    assert first is not None and calls == 2     # user + repos
+
+    assert enricher.fetch("janedoe") == first
+    assert len(fake_provider.github_requests) == calls
+
+
+def test_revalidation_304_is_served_from_cache():
+    enricher = _enricher(cache_fresh=0)
+    first = enricher.fetch("janedoe")
+
+    second = enricher.fetch("janedoe")
+    assert second == first
+    assert [status for _, _, status in fake_provider.github_requests] == [200, 200, 304, 304]
+
+
+def test_low_budget_serves_stale_without_a_request(monkeypatch):
+    enricher = _enricher(cache_fresh=0)
+    monkeypatch.setenv("FAKE_GITHUB_REMAINING", "2")
+    first = enricher.fetch("janedoe")
+    assert enricher.rate_remaining == 2
+    calls = len(fake_provider.github_requests)
+
+    assert enricher.fetch("janedoe") == first
+    assert len(fake_provider.github_requests) == calls
+
+
+def test_budget_reset_allows_requests_again(monkeypatch):
+    enricher = _enricher(cache_fresh=0)
+    monkeypatch.setenv("FAKE_GITHUB_REMAINING", "2")
+    monkeypatch.setenv("FAKE_GITHUB_RESET", "-1")    # window already over
+    enricher.fetch("janedoe")
+    calls = len(fake_provider.github_requests)
+
+    enricher.fetch("janedoe")
+    assert len(fake_provider.github_requests) > calls
+
+
+def test_graphql_not_found_skips_rest():
+    enricher = _enricher(token="fake")
+    assert enricher.fetch("ghost") is None
+    assert fake_provider.github_requests == [("POST", "/graphql", 200)]
+
+
+def test_async_fetch_uses_the_same_cache():
+    enricher = _enricher(cache_fresh=0)
+
+    async def run():
+        transport = httpx.ASGITransport(app=fake_provider.app)
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await enricher.fetch_async("janedoe", client), await enricher.fetch_async("janedoe", client)
+
+    first, second = asyncio.run(run())
+    assert first is not None and second == first
+    assert [status for _, _, status in fake_provider.github_requests] == [200, 200, 304, 304]
@@ -0,0 +1,88 @@
+"""
+backend/tokens.py
+-----------------------
+Token accounting for LLM calls. Groq latency and quota both scale with
+tokens, so every request logs prompt/completion counts — the provider's own
+numbers when it reports them, otherwise a ~4 chars/token estimate.
+
+Compare prompt styles on your own resumes:
+    python tokens.py resume1.txt resume2.txt ...
+"""
+
+import sys
+import threading
+from dataclasses import dataclass
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English + JSON)."""
+    return max(1, round(len(text) / 4)) if text else 0
+
+
+@dataclass
+class TokenUsage:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    estimated: bool = True
+
+    @classmethod
+    def from_groq(cls, body: dict, prompt: str, completion: str) -> "TokenUsage":
+        usage = body.get("usage") or (body.get("x_groq") or {}).get("usage")
+        if usage:
+            return cls(usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0), False)
+        return cls(estimate_tokens(prompt), estimate_tokens(completion))
+
+    @classmethod
+    def from_ollama(cls, body: dict, prompt: str, completion: str) -> "TokenUsage":
+        if "prompt_eval_count" in body or "eval_count" in body:
+            return cls(body.get("prompt_eval_count", 0), body.get("eval_count", 0), False)
+        return cls(estimate_tokens(prompt), estimate_tokens(completion))
+
+
+class TokenMeter:
+    """Running totals across requests. Thread-safe."""
+
+    def __init__(self):
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, usage: TokenUsage) -> None:
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += usage.prompt_tokens
+            self.completion_tokens += usage.completion_tokens
+        print(
+            f"[LLM] tokens: prompt={usage.prompt_tokens} completion={usage.completion_tokens}"
+            + (" (est.)" if usage.estimated else "")
+        )
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "avg_prompt_tokens": round(self.prompt_tokens / self.requests, 1) if self.requests else 0,
+            "avg_completion_tokens": round(self.completion_tokens / self.requests, 1) if self.requests else 0,
+        }
+
+
+if __name__ == "__main__":
+    # Prompt-side comparison of the two prompt styles on a fixed corpus
+    from extractor import (
+        COMPACT_SYSTEM_PROMPT, EXTRACTION_SYSTEM_PROMPT, EXTRACTION_USER_PROMPT, compact_prompt,
+        compact_text,
+    )
+
+    total_verbose = total_compact = 0
+    for path in sys.argv[1:]:
+        text = open(path, encoding="utf-8").read()
+        verbose = estimate_tokens(EXTRACTION_SYSTEM_PROMPT + EXTRACTION_USER_PROMPT.format(resume_text=text))
+        compact = estimate_tokens(COMPACT_SYSTEM_PROMPT + compact_prompt(compact_text(text)))
+        total_verbose += verbose
+        total_compact += compact
+        print(f"{path}: verbose={verbose} compact={compact} ({100 - 100 * compact / verbose:.1f}% fewer)")
+    if total_verbose:
+        print(f"TOTAL: verbose={total_verbose} compact={total_compact} "
+              f"({100 - 100 * total_compact / total_verbose:.1f}% fewer prompt tokens)")
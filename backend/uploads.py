@@ -0,0 +1,126 @@
+"""
+backend/uploads.py
+------------------------
+Reads a PDF upload (multipart/form-data) straight off the request stream:
+
+    upload = await read_pdf_upload(request, max_bytes=10 * 1024 * 1024)
+    upload.contents                     # memoryview over the PDF bytes
+    upload.fields["github_username"]    # the small text fields, decoded
+
+Starlette's form parser writes each file into a SpooledTemporaryFile (on
+disk past 1MB) that the endpoint then copies out again. Here the file part
+is appended to one bytearray as the chunks arrive, with the size limit and
+the .pdf check applied while the body is still being received — the PDF is
+held once, never touches disk, and an oversized upload is cut off early.
+"""
+
+from dataclasses import dataclass, field
+
+import python_multipart
+from fastapi import HTTPException, Request
+from python_multipart.multipart import parse_options_header
+
+FIELD_MAX_BYTES = 1024      # per text field (usernames, ids)
+MAX_FIELDS = 16
+
+
+@dataclass(slots=True)
+class PdfUpload:
+    contents: memoryview
+    filename: str = ""
+    fields: dict[str, str] = field(default_factory=dict)
+
+
+class _FormReader:
+    """python-multipart callbacks: the file part into one bytearray, text parts into `fields`."""
+
+    def __init__(self, file_field: str, max_bytes: int):
+        self.file_field = file_field
+        self.max_bytes = max_bytes
+        self.pdf: bytearray | None = None
+        self.filename = ""
+        self.fields: dict[str, str] = {}
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._name = ""
+        self._data = bytearray()
+        self._is_file = False
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self) -> None:
+        self._disposition, self._name, self._data, self._is_file = b"", "", bytearray(), False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name, self._header_value = b"", b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        self._name = options.get(b"name", b"").decode("utf-8", "replace")
+        if self._name != self.file_field:
+            if len(self.fields) >= MAX_FIELDS:
+                raise HTTPException(status_code=400, detail="Too many form fields.")
+            return
+        self._is_file = True
+        self.filename = options.get(b"filename", b"").decode("utf-8", "replace")
+        if not self.filename.lower().endswith(".pdf"):
+            raise HTTPException(status_code=400, detail="Only PDF files are supported.")
+        if self.pdf is not None:
+            raise HTTPException(status_code=400, detail="Upload one PDF at a time.")
+        self.pdf = bytearray()
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._is_file:
+            if len(self.pdf) + (end - start) > self.max_bytes:
+                raise HTTPException(status_code=400, detail="File too large. Max 10MB.")
+            self.pdf += data[start:end]
+        else:
+            if len(self._data) + (end - start) > FIELD_MAX_BYTES:
+                raise HTTPException(status_code=400, detail=f"Form field '{self._name}' is too long.")
+            self._data += data[start:end]
+
+    def on_part_end(self) -> None:
+        if not self._is_file and self._name:
+            self.fields[self._name] = self._data.decode("utf-8", "replace")
+
+
+async def read_pdf_upload(request: Request, max_bytes: int, file_field: str = "file") -> PdfUpload:
+    """
+    Parse the multipart body as it streams in. Raises HTTPException: 400 for
+    a non-PDF, an oversized file or a malformed form, 422 when there's no file.
+    """
+    _, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload.")
+
+    reader = _FormReader(file_field, max_bytes)
+    parser = python_multipart.MultipartParser(boundary, reader.callbacks())
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+    except python_multipart.exceptions.MultipartParseError as e:
+        raise HTTPException(status_code=400, detail=f"Malformed upload: {e}")
+
+    if reader.pdf is None:
+        raise HTTPException(status_code=422, detail=f"No PDF in the '{file_field}' form field.")
+    return PdfUpload(memoryview(reader.pdf), reader.filename, reader.fields)